@@ -0,0 +1,62 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: To benchmark the conversion of array-heavy schemas.
+
+Usage: python -m benchmarks.arrays [--columns N] [--fields N] [--repeat N]
+"""
+import argparse
+import timeit
+from google.cloud.bigquery import SchemaField
+from gbqschema_converter import gbqschema_to_jsonschema, jsonschema_to_gbqschema
+
+
+def get_args() -> argparse.Namespace:
+    """Input parameters parser."""
+    parser = argparse.ArgumentParser(description="Array-heavy schemas conversion benchmark.")
+    parser.add_argument("--columns", type=int, default=200,
+                        help="Number of REPEATED RECORD columns.")
+    parser.add_argument("--fields", type=int, default=20,
+                        help="Number of REPEATED fields per RECORD.")
+    parser.add_argument("--repeat", type=int, default=20,
+                        help="Number of conversions per measurement.")
+    return parser.parse_args()
+
+
+def gbq_schema(columns: int, fields: int) -> list:
+    """Function to generate Google BigQuery schema of REPEATED RECORDs with REPEATED fields."""
+    return [
+        {"name": f"event_{i}", "type": "RECORD", "mode": "REPEATED", "fields": [
+            {"name": f"att_{j}", "type": ("INT64", "STRING", "TIMESTAMP")[j % 3], "mode": "REPEATED"}
+            for j in range(fields)
+        ]}
+        for i in range(columns)
+    ]
+
+
+def measure(label: str, function, schema: object, repeat: int) -> None:
+    """Function to print the best time of a single conversion."""
+    elapsed = min(timeit.repeat(lambda: function(schema), number=repeat, repeat=3)) / repeat
+    print(f"{label:<40}{round(elapsed * 1000, 3):>10} ms")
+
+
+if __name__ == "__main__":
+    args = get_args()
+
+    schema_gbq = gbq_schema(args.columns, args.fields)
+    schema_sdk = [SchemaField.from_api_repr(element) for element in schema_gbq]
+    schema_json = gbqschema_to_jsonschema.json_representation(schema_gbq)
+
+    print(f"{args.columns} REPEATED RECORD columns x {args.fields} REPEATED fields")
+    measure("gbqschema_to_jsonschema.json", gbqschema_to_jsonschema.json_representation,
+            schema_gbq, args.repeat)
+    measure("gbqschema_to_jsonschema.sdk", gbqschema_to_jsonschema.sdk_representation,
+            schema_sdk, args.repeat)
+    measure("gbqschema_to_jsonschema.lazy", lambda schema:
+            gbqschema_to_jsonschema.lazy_representation(schema).materialize(),
+            schema_gbq, args.repeat)
+    measure("jsonschema_to_gbqschema.json", jsonschema_to_gbqschema.json_representation,
+            schema_json, args.repeat)
+    measure("jsonschema_to_gbqschema.sdk", jsonschema_to_gbqschema.sdk_representation,
+            schema_json, args.repeat)
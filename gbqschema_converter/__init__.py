@@ -10,4 +10,6 @@ References:
 - https://json-schema.org/
 """
 __version__ = "1.2.1"
-__all__ = ['__version__', 'gbqschema_to_jsonschema', 'jsonschema_to_gbqschema']
+__all__ = ['__version__', 'gbqschema_to_jsonschema', 'jsonschema_to_gbqschema',
+           'bundle', 'canonical', 'columnar', 'compression', 'converter', 'diff', 'fetch', 'field_paths',
+           'index', 'inference', 'merge', 'projection', 'row_class', 'row_encoder', 'serializer', 'shared_cache', 'stream', 'validation', 'watch', 'warmup']
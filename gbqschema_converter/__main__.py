@@ -1,13 +1,15 @@
 # Dmitry Kisler © 2020
 # www.dkisler.com
 
+import os
 import sys
 import time
 import argparse
 import logging
-import json
+from typing import Callable, Optional
 from gbqschema_converter.jsonschema_to_gbqschema import json_representation as to_gbq
 from gbqschema_converter.gbqschema_to_jsonschema import json_representation as to_json
+from gbqschema_converter import canonical, compression, serializer, stream, watch
 
 
 help_string = "Google BigQuery Table Schema Converter"
@@ -27,26 +29,62 @@ def get_args() -> argparse.Namespace:
                                  type=str, 
                                  default=None)
     required_either.add_argument('-f', '--file',
-                                 help="Input object as file path.",
+                                 help="Input object as file path, or directory path with --watch.",
                                  type=str,
                                  default=None)
+    parser.add_argument('-o', '--output',
+                        help="Output file path (stdout by default), or directory path if --watch input is directory.",
+                        type=str,
+                        default=None)
+    parser.add_argument('--compress',
+                        help="Output compression, defined by the output file extension by default.",
+                        choices=compression.COMPRESSIONS,
+                        default=None)
+    parser.add_argument('--compact',
+                        help="Output without indentation.",
+                        action='store_true')
+    parser.add_argument('--canonical',
+                        help="Output in canonical form: sorted keys, standard type names, no whitespaces.",
+                        action='store_true')
+    parser.add_argument('--stream',
+                        help="Convert input file column by column without reading it into memory.",
+                        action='store_true')
+    parser.add_argument('--watch',
+                        help="Reconvert input file, or json files in input directory, on every change.",
+                        action='store_true')
     args = parser.parse_args()
+    if args.stream and not args.file:
+        parser.error("--stream requires -f/--file")
+    if args.watch:
+        if not args.file:
+            parser.error("--watch requires -f/--file")
+        if args.stream:
+            parser.error("--watch cannot be used with --stream")
+        if os.path.isdir(args.file) and not (args.output and os.path.isdir(args.output)):
+            parser.error("--watch with input directory requires -o/--output directory")
+        # the outputs written to the watched path would be converted again in a loop
+        if args.output and os.path.realpath(args.output) == os.path.realpath(args.file):
+            parser.error("--watch requires -o/--output other than -f/--file")
+    if args.stream and args.canonical:
+        parser.error("--stream cannot be used with --canonical")
     return args
 
 
-def _input() -> dict:
+def _input(args: argparse.Namespace) -> dict:
     """Input parter.
+
+    Args:
+
+      args: CL input parameters.
     
     Returns:
       
       Input schema.
     """
-    args = get_args()
-
     if args.file:
         try:
-            with open(args.file, 'r') as f:
-                schema_in = json.load(f)
+            with compression.open_file(args.file) as f:
+                schema_in = serializer.loads(f.read())
         except IOError as ex:
             logs.error(f"File reading error: {ex}")
             sys.exit(1)
@@ -55,30 +93,144 @@ def _input() -> dict:
             sys.exit(1)
     else:
         try:
-            schema_in = json.loads(args.input)
+            schema_in = serializer.loads(args.input)
         except Exception as ex:
             logs.error(f"Input parsing error: {ex}")
             sys.exit(1)
     return schema_in
 
 
-def json_to_gbq():
+def _serialize(args: argparse.Namespace, schema_out: object) -> bytes:
+    """Output serializer.
+
+    Args:
+
+      args: CL input parameters.
+
+      schema_out: Output schema.
+
+    Returns:
+
+      Output data.
+    """
+    if args.canonical:
+        return canonical.dumps(schema_out).data + b"\n"
+    return serializer.dumps(schema_out, compact=args.compact) + b"\n"
+
+
+def _write(args: argparse.Namespace, path: Optional[str], data: bytes) -> None:
+    """Function to write the data to the file, or to stdout if path is not set.
+
+    Args:
+
+      args: CL input parameters.
+
+      path: Output file path.
+
+      data: Output data.
+    """
+    if path:
+        with compression.open_file(path, 'wb', compression=args.compress) as f:
+            f.write(data)
+    else:
+        sys.stdout.buffer.write(compression.compress(data, args.compress))
+        sys.stdout.flush()
+
+
+def _output(args: argparse.Namespace, schema_out: object) -> None:
+    """Output writer.
+
+    Args:
+
+      args: CL input parameters.
+
+      schema_out: Output schema.
+    """
+    data = _serialize(args, schema_out)
     try:
-        t0 = time.time()
-        schema_out = to_gbq(_input())
-        logs.info(f"""Output ({round((time.time() - t0) * 1000, 2)} ms elapsed):
-{json.dumps(schema_out, indent=2)}""")
-    except Exception as ex:
-        logs.error(f"Schema converion error: {ex}")
-        sys.exit(1)    
+        _write(args, args.output, data)
+    except IOError as ex:
+        logs.error(f"Output writing error: {ex}")
+        sys.exit(1)
 
 
-def gbq_to_json():
+def _watch(args: argparse.Namespace, converter: Callable) -> None:
+    """Watch mode runner.
+
+    Args:
+
+      args: CL input parameters.
+
+      converter: Conversion function.
+    """
+    def _convert(path: str, data: bytes) -> None:
+        try:
+            t0 = time.time()
+            schema_out = converter(serializer.loads(compression.decompress(data)))
+            logs.info(f"Conversion of {path}: {round((time.time() - t0) * 1000, 3)} ms elapsed")
+        except Exception as ex:
+            logs.error(f"Schema converion error of {path}: {ex}")
+            return
+        output = os.path.join(args.output, compression.with_extension(os.path.basename(path), args.compress))\
+            if os.path.isdir(args.file) else args.output
+        data = _serialize(args, schema_out)
+        try:
+            _write(args, output, data)
+        except IOError as ex:
+            logs.error(f"Output writing error: {ex}")
+
+    try:
+        watch.watch([args.file], _convert)
+    except KeyboardInterrupt:
+        pass
+
+
+def _run(converter: Callable, streamer: Callable) -> None:
+    """Conversion runner.
+
+    Args:
+
+      converter: Conversion function.
+
+      streamer: Incremental file conversion function.
+    """
+    args = get_args()
+    if args.watch:
+        _watch(args, converter)
+        return
+
+    if args.stream:
+        try:
+            t0 = time.time()
+            if args.output:
+                with compression.open_file(args.output, 'wb', compression=args.compress) as f:
+                    streamer(args.file, f, compact=args.compact)
+            else:
+                with compression.open_stream(sys.stdout.buffer, args.compress) as f:
+                    streamer(args.file, f, compact=args.compact)
+            logs.info(f"Conversion: {round((time.time() - t0) * 1000, 2)} ms elapsed")
+        except IOError as ex:
+            logs.error(f"File reading error: {ex}")
+            sys.exit(1)
+        except Exception as ex:
+            logs.error(f"Schema converion error: {ex}")
+            sys.exit(1)
+        return
+
+    schema_in = _input(args)
     try:
         t0 = time.time()
-        schema_out = to_json(_input())
-        logs.info(f"""Output ({round((time.time() - t0) * 1000, 2)} ms elapsed):
-{json.dumps(schema_out, indent=2)}""")
+        schema_out = converter(schema_in)
+        logs.info(f"Conversion: {round((time.time() - t0) * 1000, 2)} ms elapsed")
     except Exception as ex:
         logs.error(f"Schema converion error: {ex}")
         sys.exit(1)
+    _output(args, schema_out)
+
+
+def json_to_gbq():
+    _run(to_gbq, stream.jsonschema_to_gbqschema)
+
+
+def gbq_to_json():
+    _run(to_json, stream.gbqschema_to_jsonschema)
@@ -0,0 +1,108 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: Helpers shared by the modules working with Google BigQuery schema.
+"""
+import json
+import hashlib
+from typing import List, Optional, Union
+from google.cloud.bigquery import SchemaField
+import fastjsonschema
+
+
+STANDARD_TYPES = {
+    "INT": "INT64",
+    "INTEGER": "INT64",
+    "INT64": "INT64",
+    "FLOAT": "FLOAT64",
+    "FLOAT64": "FLOAT64",
+    "NUMERIC": "NUMERIC",
+    "BOOL": "BOOLEAN",
+    "BOOLEAN": "BOOLEAN",
+    "STRING": "STRING",
+    "BYTES": "BYTES",
+    "DATE": "DATE",
+    "DATETIME": "DATETIME",
+    "TIME": "TIME",
+    "TIMESTAMP": "TIMESTAMP",
+    "RECORD": "RECORD",
+    "STRUCT": "RECORD",
+}
+
+
+def as_json_representation(gbq_schema: Union[list, List[SchemaField]]) -> list:
+    """Function to convert Google BigQuery schema to JSON representation.
+
+    Args:
+
+      gbq_schema: BigQuery schema, JSON or SDK representation.
+
+    Returns:
+
+      Google BigQuery table json schema as list of dict.
+    """
+    return [element.to_api_repr() if isinstance(element, SchemaField) else element
+            for element in gbq_schema]
+
+
+def fingerprint(obj: object) -> str:
+    """Function to hash JSON-serializable object independently of the keys order.
+
+    Args:
+
+      obj: JSON-serializable object.
+
+    Returns:
+
+      Hex digest.
+    """
+    return hashlib.blake2b(json.dumps(obj, sort_keys=True, separators=(',', ':')).encode("utf-8"),
+                           digest_size=16).hexdigest()
+
+
+class CompiledValidator:
+    """Json schema validator which can be pickled as its generated source.
+
+    Args:
+
+      source: Python source generated by fastjsonschema.compile_to_code.
+
+      key: Fingerprint of the compiled json schema, the validator cache key.
+    """
+    def __init__(self, source: str, key: Optional[str] = None):
+        namespace = {}
+        exec(compile(source, "<validator>", "exec"), namespace)
+        self.source = source
+        self.key = key
+        self.validate = namespace['validate']
+
+    @classmethod
+    def from_definition(cls, definition: Union[dict, bool]) -> 'CompiledValidator':
+        """Function to compile json schema.
+
+        Args:
+
+          definition: Json schema.
+
+        Returns:
+
+          CompiledValidator object.
+
+        Raises:
+
+          fastjsonschema.JsonSchemaDefinitionException: Error occured if json schema is invalid.
+        """
+        return cls(fastjsonschema.compile_to_code(definition), fingerprint(definition))
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (self.source, self.key)
+
+    def __call__(self, data: object) -> object:
+        """Function to validate the data.
+
+        Raises:
+
+          fastjsonschema.JsonSchemaException: Error occured if data is invalid.
+        """
+        return self.validate(data)
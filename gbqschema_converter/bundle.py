@@ -0,0 +1,160 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: To convert many Google BigQuery tables into a single json schema with shared definitions.
+
+RECORD definitions are hashed bottom-up, the nested RECORDs are replaced with "$ref" before
+the parent is hashed, so every struct is hashed once. Structs used at least min_occurrences times
+are moved to the global "definitions" section keyed by their hash.
+References:
+- https://json-schema.org/understanding-json-schema/structuring.html
+"""
+from typing import Dict, List, Mapping, Union
+from google.cloud.bigquery import SchemaField
+from gbqschema_converter.gbqschema_to_jsonschema import json_representation
+from gbqschema_converter._schema import as_json_representation, fingerprint
+
+
+REF_PREFIX = "#/definitions/"
+
+
+def _is_record(definition: dict) -> bool:
+    return isinstance(definition, dict) and definition.get('type') == "object" and 'properties' in definition
+
+
+def _hoist(definition: dict, registry: Dict[str, dict], counts: Dict[str, int]) -> dict:
+    """Function to replace the nested RECORDs with references.
+
+    Args:
+
+      definition: Json schema object definition.
+
+      registry: Dict of struct hash to its definition to fill in.
+
+      counts: Dict of struct hash to number of its occurrences to fill in.
+
+    Returns:
+
+      Object definition with references.
+    """
+    properties = {}
+    for key, value in definition['properties'].items():
+        if _is_record(value):
+            value = _reference(value, registry, counts)
+        elif value.get('type') == "array" and _is_record(value['items']):
+            value = dict(value, items=_reference(value['items'], registry, counts))
+        properties[key] = value
+    return dict(definition, properties=properties)
+
+
+def _reference(definition: dict, registry: Dict[str, dict], counts: Dict[str, int]) -> dict:
+    definition = _hoist(definition, registry, counts)
+    key = fingerprint(definition)
+    registry.setdefault(key, definition)
+    counts[key] = counts.get(key, 0) + 1
+    return {"$ref": f"{REF_PREFIX}{key}"}
+
+
+def _inline(definition: dict, registry: Dict[str, dict], shared: set) -> dict:
+    """Function to inline the references to not shared structs.
+
+    Args:
+
+      definition: Json schema definition.
+
+      registry: Dict of struct hash to its definition.
+
+      shared: Hashes of the shared structs.
+
+    Returns:
+
+      Json schema definition.
+    """
+    if '$ref' in definition:
+        key = definition['$ref'][len(REF_PREFIX):]
+        if key in shared:
+            return definition
+        definition = registry[key]
+    if 'items' in definition:
+        return dict(definition, items=_inline(definition['items'], registry, shared))
+    if 'properties' in definition:
+        return dict(definition, properties={key: _inline(value, registry, shared)
+                                            for key, value in definition['properties'].items()})
+    return definition
+
+
+def bundle(tables: Mapping[str, Union[list, List[SchemaField]]],
+           additional_properties: bool = False,
+           min_occurrences: int = 2) -> dict:
+    """Function to convert Google BigQuery tables schemas to json schema bundle.
+
+    Bundle format:
+    {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "object",
+        "properties": {
+            "table_name": {"type": "array", "items": {table row definition}},
+        },
+        "definitions": {
+            "struct hash": {shared struct definition},
+        },
+    }
+
+    Args:
+
+      tables: Dict of table name to BigQuery schema, JSON or SDK representation.
+
+      additional_properties: Json schema of the table rows should contain "additionalProperties".
+
+      min_occurrences: Number of occurrences of the struct to share it.
+
+    Returns:
+
+      Json schema bundle as dict.
+
+    Raises:
+
+      fastjsonschema.JsonSchemaException: Error occured if input Google BigQuery schema is invalid.
+    """
+    registry = {}
+    counts = {}
+    roots = {}
+    for name, gbq_schema in tables.items():
+        element = json_representation(as_json_representation(gbq_schema),
+                                      additional_properties)['definitions']['element']
+        roots[name] = _hoist(element, registry, counts)
+
+    shared = {key for key, count in counts.items() if count >= min_occurrences}
+
+    return {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "object",
+        "properties": {
+            name: {"type": "array", "items": _inline(root, registry, shared)}
+            for name, root in roots.items()
+        },
+        "definitions": {
+            key: _inline(registry[key], registry, shared) for key in sorted(shared)
+        },
+    }
+
+
+def table_schema(bundle: dict, table: str) -> dict:
+    """Function to get json schema of the table from the bundle.
+
+    Args:
+
+      bundle: Json schema bundle.
+
+      table: Table name.
+
+    Returns:
+
+      Json schema of the table rows array, it shares the definitions with the bundle.
+    """
+    return {
+        "$schema": bundle['$schema'],
+        **bundle['properties'][table],
+        "definitions": bundle['definitions'],
+    }
@@ -0,0 +1,140 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: Canonical serialization of the converted schemas with content ETag.
+
+Equal schemas produce equal bytes regardless of the keys order, the type aliases,
+the JSON backend and the platform: keys are sorted, whitespaces are dropped,
+floats are written in the shortest round-trip form of the standard library json module.
+References:
+- https://tools.ietf.org/html/rfc7232#section-2.3
+"""
+import json
+import hashlib
+from collections import namedtuple
+from collections.abc import Mapping
+from typing import List, Union
+from google.cloud.bigquery import SchemaField
+from gbqschema_converter._schema import STANDARD_TYPES
+
+
+Canonical = namedtuple("Canonical", ['data', 'etag'])
+Canonical.__doc__ = """Canonical serialization result.
+
+Attributes:
+
+  data: UTF-8 encoded JSON document.
+
+  etag: Strong entity tag of the document, quoted.
+"""
+
+_encoder = json.JSONEncoder(sort_keys=True,
+                            separators=(',', ':'),
+                            ensure_ascii=False,
+                            allow_nan=False)
+
+
+def _gbq_column(element: Union[dict, SchemaField]) -> dict:
+    """Function to normalize Google BigQuery column definition."""
+    if isinstance(element, SchemaField):
+        element = element.to_api_repr()
+    output = {key: value for key, value in element.items() if value is not None}
+    output['type'] = STANDARD_TYPES.get(output['type'], output['type'])
+    output['mode'] = output.get('mode') or "NULLABLE"
+    if output['type'] == "RECORD":
+        output['fields'] = [_gbq_column(field) for field in output['fields']]
+    else:
+        _ = output.pop('fields', None)
+    return output
+
+
+def _json_definition(definition: object) -> object:
+    """Function to normalize json schema, required properties are sorted."""
+    if isinstance(definition, list):
+        return [_json_definition(value) for value in definition]
+    if not isinstance(definition, Mapping):
+        return definition
+    output = {key: _json_definition(value) for key, value in definition.items()}
+    if isinstance(output.get('required'), list):
+        output['required'] = sorted(output['required'])
+    return output
+
+
+def normalize(schema: Union[dict, list, List[SchemaField]]) -> Union[dict, list]:
+    """Function to normalize the schema.
+
+    Google BigQuery schema types are replaced with the standard names, e.g. INTEGER with INT64,
+    missing modes are set to NULLABLE, null descriptions are dropped.
+    Json schema "required" arrays are sorted.
+
+    Args:
+
+      schema: Json schema, including lazy representation,
+            or Google BigQuery schema in JSON or SDK representation.
+
+    Returns:
+
+      Normalized schema.
+    """
+    if isinstance(schema, Mapping):
+        return _json_definition(schema)
+    return [_gbq_column(element) for element in schema]
+
+
+def etag(data: bytes) -> str:
+    """Function to compute strong entity tag of the document.
+
+    Args:
+
+      data: Document.
+
+    Returns:
+
+      Quoted entity tag.
+    """
+    return f'"{hashlib.blake2b(data, digest_size=16).hexdigest()}"'
+
+
+def dumps(schema: Union[dict, list, List[SchemaField]]) -> Canonical:
+    """Function to serialize the schema in canonical form.
+
+    Args:
+
+      schema: Json schema, or Google BigQuery schema in JSON or SDK representation.
+
+    Returns:
+
+      Canonical tuple of (document, entity tag).
+
+    Raises:
+
+      ValueError: Error occured if the schema contains NaN or infinite float.
+    """
+    data = _encoder.encode(normalize(schema)).encode("utf-8")
+    return Canonical(data, etag(data))
+
+
+def if_none_match(header: str, tag: str) -> bool:
+    """Function to check If-None-Match request header against the entity tag.
+
+    Args:
+
+      header: If-None-Match header value.
+
+      tag: Current entity tag, quoted.
+
+    Returns:
+
+      True if the client copy is up to date, i.e. 304 Not Modified can be sent.
+    """
+    if header.strip() == "*":
+        return True
+    # weak comparison, as required for If-None-Match
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == tag:
+            return True
+    return False
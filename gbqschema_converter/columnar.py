@@ -0,0 +1,397 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: To validate columnar batches against Google BigQuery table schema.
+
+Every column is checked at once with pyarrow compute kernels, the type rules
+are taken from gbqschema_to_jsonschema.map_types, DATE, DATETIME and TIMESTAMP strings
+are checked as BigQuery accepts them. The result is a boolean mask
+of invalid rows per column, so no row is materialized as Python object.
+Requires numpy and pyarrow: pip install gbqschema_converter[columnar]
+References:
+- https://cloud.google.com/bigquery/docs/reference/standard-sql/data-types
+"""
+from collections import namedtuple
+from collections.abc import Mapping
+from typing import Callable, Dict, List, Optional, Union
+from google.cloud.bigquery import SchemaField
+from gbqschema_converter.gbqschema_to_jsonschema import map_types
+from gbqschema_converter._schema import as_json_representation
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = pc = None
+
+
+INT64_MAX = "9223372036854775807"
+INT64_MIN = "9223372036854775808"
+
+PATTERN_INTEGER = r"^[+-]?[0-9]+$"
+PATTERN_NUMBER = r"^[+-]?([0-9]+(\.[0-9]*)?|\.[0-9]+)([eE][+-]?[0-9]+)?$"
+PATTERN_FLOAT = r"^[+-]?(?i:inf|infinity|nan)$"
+PATTERN_BOOLEAN = r"^(?i:true|false|t|f|yes|no|y|n|1|0)$"
+PATTERN_DATE = r"^(?P<year>[0-9]{4})-(?P<month>[0-9]{1,2})-(?P<day>[0-9]{1,2})$"
+PATTERN_BASE64 = r"^([A-Za-z0-9+/]{4})*([A-Za-z0-9+/]{2}==|[A-Za-z0-9+/]{3}=)?$"
+PATTERN_DATETIME = r"^[0-9]{4}-(0?[1-9]|1[0-2])-(0?[1-9]|[12][0-9]|3[01])[T ]"\
+    r"([01]?[0-9]|2[0-3]):[0-5]?[0-9]:[0-5]?[0-9](\.[0-9]{1,6})?$"
+PATTERN_TIMESTAMP = r"^[0-9]{4}-[0-9]{1,2}-[0-9]{1,2}[T ][0-9]{1,2}:[0-9]{2}(:[0-9]{2}(\.[0-9]{1,6})?)?"\
+    r"( ?(Z|UTC|[+-][0-9]{1,2}(:?[0-9]{2})?))?$"
+
+# largest absolute value of NUMERIC: 29 digits before the decimal point
+NUMERIC_LIMIT = 1e29
+
+
+class BatchReport(namedtuple("BatchReport", ['masks', 'rows'])):
+    """Batch validation report.
+
+    Attributes:
+
+      masks: Dict of dotted column path to numpy boolean array, True for the invalid rows.
+
+      rows: Numpy boolean array, True for the rows with any invalid column.
+    """
+    __slots__ = ()
+
+    @property
+    def valid(self) -> bool:
+        """All rows are valid."""
+        return not self.rows.any()
+
+
+Column = Union["pa.Array", "pa.ChunkedArray"]
+
+
+def _is_string(data_type: "pa.DataType") -> bool:
+    return pa.types.is_string(data_type) or pa.types.is_large_string(data_type)
+
+
+def _to_numpy(mask: Column) -> "np.ndarray":
+    """Function to convert pyarrow boolean array to numpy, nulls are False."""
+    mask = pc.fill_null(mask, False)
+    if isinstance(mask, pa.ChunkedArray):
+        return np.asarray(mask.to_numpy(), dtype=bool)
+    return mask.to_numpy(zero_copy_only=False)
+
+
+def _not_matching(values: Column, pattern: str) -> "np.ndarray":
+    return ~_to_numpy(pc.match_substring_regex(values, pattern)) & _to_numpy(pc.is_valid(values))
+
+
+def _invalid_type(values: Column) -> "np.ndarray":
+    """Every not null value is invalid."""
+    return _to_numpy(pc.is_valid(values))
+
+
+def _integer(values: Column, field_type: str) -> "np.ndarray":
+    data_type = values.type
+    if pa.types.is_integer(data_type):
+        if data_type == pa.uint64():
+            return _to_numpy(pc.greater(values, pa.scalar(int(INT64_MAX), type=data_type)))
+        return np.zeros(len(values), dtype=bool)
+
+    if pa.types.is_floating(data_type) or pa.types.is_decimal(data_type):
+        values = pc.cast(values, pa.float64())
+        return _to_numpy(pc.or_(pc.not_equal(pc.floor(values), values),
+                                pc.or_(pc.less(values, -2.0 ** 63),
+                                       pc.greater_equal(values, 2.0 ** 63))))
+
+    if _is_string(data_type):
+        negative = pc.starts_with(values, "-")
+        digits = pc.utf8_ltrim(pc.utf8_ltrim(values, "+-"), "0")
+        length = pc.utf8_length(digits)
+        out_of_range = pc.or_(pc.greater(length, len(INT64_MAX)),
+                              pc.and_(pc.equal(length, len(INT64_MAX)),
+                                      pc.greater(digits, pc.if_else(negative, INT64_MIN, INT64_MAX))))
+        return _not_matching(values, PATTERN_INTEGER) | _to_numpy(out_of_range)
+
+    return _invalid_type(values)
+
+
+def _number(values: Column, field_type: str) -> "np.ndarray":
+    data_type = values.type
+    if pa.types.is_integer(data_type) or pa.types.is_decimal(data_type):
+        return np.zeros(len(values), dtype=bool)
+
+    if pa.types.is_floating(data_type):
+        if field_type != "NUMERIC":
+            return np.zeros(len(values), dtype=bool)
+        # NaN is not less than the limit, hence invalid
+        return _to_numpy(pc.invert(pc.less(pc.abs(values), NUMERIC_LIMIT)))
+
+    if _is_string(data_type):
+        invalid = _not_matching(values, PATTERN_NUMBER)
+        if field_type != "NUMERIC":
+            invalid &= _not_matching(values, PATTERN_FLOAT)
+        return invalid
+
+    return _invalid_type(values)
+
+
+def _boolean(values: Column, field_type: str) -> "np.ndarray":
+    data_type = values.type
+    if pa.types.is_boolean(data_type):
+        return np.zeros(len(values), dtype=bool)
+
+    if pa.types.is_integer(data_type):
+        return _to_numpy(pc.invert(pc.is_in(values, value_set=pa.array([0, 1], type=data_type))))
+
+    if _is_string(data_type):
+        return _not_matching(values, PATTERN_BOOLEAN)
+
+    return _invalid_type(values)
+
+
+def _string(values: Column, field_type: str) -> "np.ndarray":
+    data_type = values.type
+    if _is_string(data_type):
+        if field_type == "BYTES":
+            return _not_matching(values, PATTERN_BASE64)
+        return np.zeros(len(values), dtype=bool)
+
+    if field_type == "BYTES" and (pa.types.is_binary(data_type)
+                                  or pa.types.is_large_binary(data_type)
+                                  or pa.types.is_fixed_size_binary(data_type)):
+        return np.zeros(len(values), dtype=bool)
+
+    return _invalid_type(values)
+
+
+def _temporal(native: Callable[["pa.DataType"], bool],
+              check: Callable[[Column], "np.ndarray"]) -> Callable[[Column, str], "np.ndarray"]:
+    """Function to build the check of temporal column.
+
+    Args:
+
+      native: Function to check if pyarrow type is the native type of the column.
+
+      check: Function to check the string values.
+    """
+    def _check(values: Column, field_type: str) -> "np.ndarray":
+        if native(values.type):
+            return np.zeros(len(values), dtype=bool)
+        if _is_string(values.type):
+            return check(values)
+        return _invalid_type(values)
+    return _check
+
+
+def _date(values: Column) -> "np.ndarray":
+    parsed = pc.strptime(values, format="%Y-%m-%d", unit="s", error_is_null=True)
+    # strptime rolls the days over the month end, e.g. 2020-02-30 is parsed as 2020-03-01
+    day = pc.cast(pc.struct_field(pc.extract_regex(values, PATTERN_DATE), [2]), pa.int64())
+    mismatch = pc.fill_null(pc.not_equal(day, pc.day(parsed)), True)
+    return _to_numpy(pc.and_(mismatch, pc.is_valid(values)))
+
+
+def _pattern(definition: dict) -> Callable[[Column], "np.ndarray"]:
+    def _check(values: Column) -> "np.ndarray":
+        return _not_matching(values, definition['pattern'])
+    return _check
+
+
+CHECKS = {
+    "DATE": _temporal(pa.types.is_date, _date) if pa else None,
+    "TIME": _temporal(pa.types.is_time, _pattern(map_types.TIME)) if pa else None,
+    "DATETIME": _temporal(lambda data_type: pa.types.is_timestamp(data_type) and data_type.tz is None,
+                          _pattern({"pattern": PATTERN_DATETIME})) if pa else None,
+    "TIMESTAMP": _temporal(pa.types.is_timestamp,
+                           _pattern({"pattern": PATTERN_TIMESTAMP})) if pa else None,
+}
+
+CHECKS_JSON_TYPES = {
+    "integer": _integer,
+    "number": _number,
+    "boolean": _boolean,
+    "string": _string,
+}
+
+
+def _check(field_type: str) -> Callable[[Column, str], "np.ndarray"]:
+    """Function to pick the check of the column values by its json schema definition."""
+    definition = getattr(map_types, field_type)
+    if definition.get('format') == "date":
+        return CHECKS['DATE']
+    if definition.get('format') == "date-time":
+        return CHECKS['TIMESTAMP']
+    if 'pattern' in definition:
+        return CHECKS['TIME'] if field_type == "TIME" else CHECKS['DATETIME']
+    return CHECKS_JSON_TYPES[definition['type']]
+
+
+def _combine(values: Column) -> Column:
+    if isinstance(values, pa.ChunkedArray):
+        return values.combine_chunks()
+    return values
+
+
+def _child(values: Column, name: str) -> Optional[Column]:
+    try:
+        return values.field(name)
+    except KeyError:
+        return None
+
+
+class ColumnValidator:
+    """Validator of columnar batches.
+
+    Args:
+
+      gbq_schema: BigQuery schema, JSON or SDK representation.
+
+    Raises:
+
+      ImportError: Error occured if numpy or pyarrow is not installed.
+    """
+    def __init__(self, gbq_schema: Union[list, List[SchemaField]]):
+        if np is None or pa is None:
+            raise ImportError("numpy and pyarrow are required: pip install gbqschema_converter[columnar]")
+        self.gbq_schema = as_json_representation(gbq_schema)
+
+    def _level(self,
+               fields: list,
+               column: Callable[[str], Optional[Column]],
+               length: int,
+               valid: Optional["np.ndarray"],
+               rows: Optional["np.ndarray"],
+               num_rows: int,
+               parent: Optional[str],
+               masks: Dict[str, "np.ndarray"]) -> None:
+        """Function to validate the schema level.
+
+        Args:
+
+          fields: BigQuery schema level, JSON representation.
+
+          column: Function to get the column of the level by name.
+
+          length: Number of the level rows.
+
+          valid: Mask of the level rows with not null parent RECORD.
+
+          rows: Batch row of every level row, None for the top level.
+
+          num_rows: Number of the batch rows.
+
+          parent: Dotted path of the level.
+
+          masks: Dict of masks to fill in.
+        """
+        for field in fields:
+            path = field['name'] if parent is None else f"{parent}.{field['name']}"
+            mode = field.get('mode') or "NULLABLE"
+            values = column(field['name'])
+
+            if values is None:
+                invalid = np.full(length, mode == "REQUIRED")
+            elif mode == "REPEATED":
+                invalid = self._repeated(field, values, rows, num_rows, path, masks)
+            else:
+                invalid = self._values(field, values, rows, num_rows, path, masks)
+                if mode == "REQUIRED":
+                    invalid |= _to_numpy(pc.is_null(values))
+
+            if valid is not None:
+                invalid &= valid
+
+            if rows is not None:
+                mask = np.zeros(num_rows, dtype=bool)
+                mask[rows[invalid]] = True
+                invalid = mask
+
+            if path in masks:
+                masks[path] |= invalid
+            else:
+                masks[path] = invalid
+
+    def _repeated(self,
+                  field: dict,
+                  values: Column,
+                  rows: Optional["np.ndarray"],
+                  num_rows: int,
+                  path: str,
+                  masks: Dict[str, "np.ndarray"]) -> "np.ndarray":
+        """Function to validate REPEATED column, null elements are invalid."""
+        if not (pa.types.is_list(values.type) or pa.types.is_large_list(values.type)):
+            return _invalid_type(values)
+
+        values = _combine(values)
+        elements = pc.list_flatten(values)
+        parents = pc.list_parent_indices(values).to_numpy()
+        invalid_elements = self._values(field, elements,
+                                        parents if rows is None else rows[parents],
+                                        num_rows, path, masks)
+        invalid_elements |= _to_numpy(pc.is_null(elements))
+
+        invalid = np.zeros(len(values), dtype=bool)
+        invalid[parents[invalid_elements]] = True
+        return invalid
+
+    def _values(self,
+                field: dict,
+                values: Column,
+                rows: Optional["np.ndarray"],
+                num_rows: int,
+                path: str,
+                masks: Dict[str, "np.ndarray"]) -> "np.ndarray":
+        """Function to validate not null values of the column."""
+        if pa.types.is_dictionary(values.type):
+            values = pc.cast(values, values.type.value_type)
+
+        if field['type'] not in ("RECORD", "STRUCT"):
+            return _check(field['type'])(values, field['type'])
+
+        if not pa.types.is_struct(values.type):
+            return _invalid_type(values)
+
+        values = _combine(values)
+        self._level(field['fields'],
+                    lambda name: _child(values, name),
+                    len(values),
+                    _to_numpy(pc.is_valid(values)),
+                    rows,
+                    num_rows,
+                    path,
+                    masks)
+        return np.zeros(len(values), dtype=bool)
+
+    def validate(self, batch: Union["pa.Table", "pa.RecordBatch", Mapping]) -> BatchReport:
+        """Function to validate the batch.
+
+        Args:
+
+          batch: pyarrow Table or RecordBatch, or mapping of column name to numpy array or sequence.
+
+        Returns:
+
+          BatchReport with per column and per row masks of invalid rows.
+        """
+        if isinstance(batch, Mapping):
+            batch = pa.table({name: values if isinstance(values, (pa.Array, pa.ChunkedArray))
+                              else pa.array(values)
+                              for name, values in batch.items()})
+
+        names = set(batch.schema.names)
+        masks = {}
+        self._level(self.gbq_schema,
+                    lambda name: batch.column(name) if name in names else None,
+                    batch.num_rows,
+                    None,
+                    None,
+                    batch.num_rows,
+                    None,
+                    masks)
+
+        rows = np.zeros(batch.num_rows, dtype=bool)
+        for mask in masks.values():
+            rows |= mask
+        return BatchReport(masks, rows)
+
+    __call__ = validate
@@ -0,0 +1,271 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: Transparent compressed files reading and writing.
+
+Input compression is detected by the magic bytes, output compression by the file extension.
+gzip, bz2 and xz are supported with the standard library,
+zstd requires zstandard: pip install gbqschema_converter[zstd]
+"""
+import os
+import bz2
+import gzip
+import lzma
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
+
+EXTENSIONS = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+}
+
+COMPRESSIONS = ("gzip", "bz2", "xz", "zstd")
+
+SUFFIXES = {
+    "gzip": ".gz",
+    "bz2": ".bz2",
+    "xz": ".xz",
+    "zstd": ".zst",
+}
+
+
+def detect(header: bytes) -> Optional[str]:
+    """Function to detect compression by the magic bytes.
+
+    Args:
+
+      header: First bytes of the file, at least 6.
+
+    Returns:
+
+      Compression name, None if not compressed.
+    """
+    for magic, compression in MAGIC.items():
+        if header.startswith(magic):
+            return compression
+    return None
+
+
+def detect_file(path: str) -> Optional[str]:
+    """Function to detect compression of the file by its magic bytes.
+
+    Args:
+
+      path: File path.
+
+    Returns:
+
+      Compression name, None if not compressed.
+    """
+    with open(path, 'rb') as f:
+        return detect(f.read(6))
+
+
+def from_extension(path: str) -> Optional[str]:
+    """Function to define compression by the file extension.
+
+    Args:
+
+      path: File path.
+
+    Returns:
+
+      Compression name, None if extension is not known.
+    """
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def with_extension(path: str, compression: Optional[str]) -> str:
+    """Function to replace compression extension of the file path.
+
+    Args:
+
+      path: File path, compressed or not.
+
+      compression: One of COMPRESSIONS, the extension is stripped if not set.
+
+    Returns:
+
+      File path, e.g. schema.json.zst for schema.json.gz and "zstd".
+    """
+    if from_extension(path) is not None:
+        path = os.path.splitext(path)[0]
+    return path if compression is None else path + SUFFIXES[compression]
+
+
+def _zstandard() -> object:
+    if zstandard is None:
+        raise ImportError("zstandard is required for zstd compression: pip install gbqschema_converter[zstd]")
+    return zstandard
+
+
+def decompress(data: bytes) -> bytes:
+    """Function to decompress the data if compressed.
+
+    Args:
+
+      data: Data, compressed or not.
+
+    Returns:
+
+      Decompressed data.
+    """
+    compression = detect(data[:6])
+    if compression == "gzip":
+        return gzip.decompress(data)
+    if compression == "bz2":
+        return bz2.decompress(data)
+    if compression == "xz":
+        return lzma.decompress(data)
+    if compression == "zstd":
+        with _zstandard().ZstdDecompressor().stream_reader(data) as f:
+            return f.read()
+    return data
+
+
+def compress(data: bytes, compression: Optional[str]) -> bytes:
+    """Function to compress the data.
+
+    Args:
+
+      data: Data.
+
+      compression: One of COMPRESSIONS, data is returned as is if not set.
+
+    Returns:
+
+      Compressed data.
+
+    Raises:
+
+      ValueError: Error occured if compression is unknown.
+    """
+    if compression is None:
+        return data
+    if compression == "gzip":
+        return gzip.compress(data)
+    if compression == "bz2":
+        return bz2.compress(data)
+    if compression == "xz":
+        return lzma.compress(data)
+    if compression == "zstd":
+        return _zstandard().ZstdCompressor().compress(data)
+    raise ValueError(f"Unknown compression '{compression}', must be one of: {', '.join(COMPRESSIONS)}")
+
+
+@contextmanager
+def open_file(path: str,
+              mode: str = 'rb',
+              compression: Optional[str] = None) -> Iterator[BinaryIO]:
+    """Context manager to open binary file, compressed or not.
+
+    Args:
+
+      path: File path.
+
+      mode: One of 'rb', 'wb'.
+
+      compression: One of COMPRESSIONS, detected by the magic bytes on read
+                 and by the extension on write if not set.
+
+    Returns:
+
+      Binary file object, the data is (de)compressed as a stream.
+
+    Raises:
+
+      ValueError: Error occured if mode or compression is unknown.
+
+      ImportError: Error occured if zstandard is required, but not installed.
+    """
+    if mode not in ('rb', 'wb'):
+        raise ValueError(f"Unknown mode '{mode}', must be one of: rb, wb")
+    if compression is None:
+        compression = detect_file(path) if mode == 'rb' else from_extension(path)
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}', must be one of: {', '.join(COMPRESSIONS)}")
+
+    if compression == "gzip":
+        f = gzip.open(path, mode)
+    elif compression == "bz2":
+        f = bz2.open(path, mode)
+    elif compression == "xz":
+        f = lzma.open(path, mode)
+    elif compression == "zstd":
+        raw = open(path, mode)
+        try:
+            f = _zstandard().ZstdDecompressor().stream_reader(raw, closefd=True) if mode == 'rb'\
+                else _zstandard().ZstdCompressor().stream_writer(raw, closefd=True)
+        except Exception:
+            raw.close()
+            raise
+    else:
+        f = open(path, mode)
+
+    try:
+        yield f
+    finally:
+        f.close()
+
+
+@contextmanager
+def open_stream(fileobj: BinaryIO,
+                compression: Optional[str] = None) -> Iterator[BinaryIO]:
+    """Context manager to compress the data written to the open binary file object, e.g. stdout.
+
+    Args:
+
+      fileobj: Writable binary file object, it is not closed.
+
+      compression: One of COMPRESSIONS, the data is written as is if not set.
+
+    Returns:
+
+      Binary file object, the data is compressed as a stream.
+
+    Raises:
+
+      ValueError: Error occured if compression is unknown.
+
+      ImportError: Error occured if zstd is required, but zstandard is not installed.
+    """
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}', must be one of: {', '.join(COMPRESSIONS)}")
+
+    if compression is None:
+        yield fileobj
+        fileobj.flush()
+        return
+
+    if compression == "gzip":
+        f = gzip.GzipFile(fileobj=fileobj, mode='wb')
+    elif compression == "bz2":
+        f = bz2.BZ2File(fileobj, 'wb')
+    elif compression == "xz":
+        f = lzma.LZMAFile(fileobj, 'wb')
+    else:
+        f = _zstandard().ZstdCompressor().stream_writer(fileobj, closefd=False)
+
+    try:
+        yield f
+    finally:
+        f.close()
+        fileobj.flush()
@@ -0,0 +1,169 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: Reusable schema converter with the options compiled once.
+
+Converter objects hold no mutable state, hence a single object
+can be shared by many threads. The outputs can be cached by the input fingerprint
+in a cache shared by processes, e.g. SharedCache.
+"""
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Union
+from gbqschema_converter import gbqschema_to_jsonschema, jsonschema_to_gbqschema
+from gbqschema_converter._schema import as_json_representation, fingerprint
+from gbqschema_converter.projection import compile_projection
+
+
+DIRECTIONS = ("gbqschema_to_jsonschema", "jsonschema_to_gbqschema")
+
+
+def _paths(paths: Union[str, Iterable[str], None]) -> Optional[List[str]]:
+    if paths is None:
+        return None
+    return [paths] if isinstance(paths, str) else sorted(paths)
+
+
+class Converter:
+    """Schema converter.
+
+    Args:
+
+      direction: One of "gbqschema_to_jsonschema", "jsonschema_to_gbqschema".
+
+      sdk_representation: Google BigQuery schema is in Google SDK representation,
+                        i.e. the input for "gbqschema_to_jsonschema", or the output for "jsonschema_to_gbqschema".
+
+      additional_properties: Json schema should contain "additionalProperties",
+                           used for "gbqschema_to_jsonschema" only.
+
+      include: Dotted paths of the columns to convert, e.g. "user.id", "user.address.*".
+             All columns are converted by default.
+
+      exclude: Dotted paths of the columns to skip.
+
+      with_index: Return the fields index along with the output schema.
+
+      cache: Cache of the pickled outputs with get(key) and set(key, value) methods,
+           e.g. SharedCache, the outputs are not cached if not set.
+
+    Raises:
+
+      ValueError: Error occured if the direction is unknown.
+    """
+    def __init__(self,
+                 direction: str = "gbqschema_to_jsonschema",
+                 sdk_representation: bool = False,
+                 additional_properties: bool = False,
+                 include: Union[str, Iterable[str], None] = None,
+                 exclude: Union[str, Iterable[str], None] = None,
+                 with_index: bool = False,
+                 cache: Optional[object] = None):
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown direction '{direction}', must be one of: {', '.join(DIRECTIONS)}")
+
+        self.direction = direction
+        self.sdk_representation = sdk_representation
+        self.additional_properties = additional_properties
+        self.include = include
+        self.exclude = exclude
+        self.with_index = with_index
+        self.cache = cache
+
+        module = gbqschema_to_jsonschema if direction == "gbqschema_to_jsonschema"\
+            else jsonschema_to_gbqschema
+        self._function = module.sdk_representation if sdk_representation\
+            else module.json_representation
+
+        self._options = {
+            "include": compile_projection(include, exclude),
+            "with_index": with_index,
+        }
+        if direction == "gbqschema_to_jsonschema":
+            self._options['additional_properties'] = additional_properties
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (self.direction,
+                                self.sdk_representation,
+                                self.additional_properties,
+                                self.include,
+                                self.exclude,
+                                self.with_index,
+                                self.cache)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(direction='{self.direction}', "\
+            f"sdk_representation={self.sdk_representation}, "\
+            f"additional_properties={self.additional_properties}, "\
+            f"include={self.include!r}, exclude={self.exclude!r}, "\
+            f"with_index={self.with_index}, cache={self.cache!r})"
+
+    def convert(self, schema: Union[list, dict]) -> Union[list, dict, tuple]:
+        """Function to convert the schema.
+
+        Args:
+
+          schema: Input schema.
+
+        Returns:
+
+          Output schema, or tuple of output schema and FieldIndex if with_index is set.
+
+        Raises:
+
+          fastjsonschema.JsonSchemaException: Error occured if input schema is invalid.
+        """
+        if self.cache is None:
+            return self._function(schema, **self._options)
+
+        key = self._key(schema)
+        value = self.cache.get(key)
+        if value is not None:
+            return pickle.loads(value)
+        output = self._function(schema, **self._options)
+        try:
+            value = pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return output
+        self.cache.set(key, value)
+        return output
+
+    def _key(self, schema: Union[list, dict]) -> bytes:
+        """Function to fingerprint the input schema along with the options."""
+        if isinstance(schema, list):
+            schema = as_json_representation(schema)
+        return bytes.fromhex(fingerprint([self.direction,
+                                          self.sdk_representation,
+                                          self.additional_properties,
+                                          _paths(self.include),
+                                          _paths(self.exclude),
+                                          self.with_index,
+                                          schema]))
+
+    __call__ = convert
+
+    def map(self,
+            schemas: Iterable[Union[list, dict]],
+            threads: Optional[int] = None) -> List[Union[list, dict, tuple]]:
+        """Function to convert the schemas in a thread pool.
+
+        Args:
+
+          schemas: Input schemas.
+
+          threads: Number of threads, ThreadPoolExecutor default if not set.
+                 Schemas are converted in the current thread if set to 1.
+
+        Returns:
+
+          Output schemas in the input order.
+
+        Raises:
+
+          fastjsonschema.JsonSchemaException: Error occured if any input schema is invalid.
+        """
+        if threads == 1:
+            return list(map(self.convert, schemas))
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            return list(pool.map(self.convert, schemas))
@@ -0,0 +1,182 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: To compare Google BigQuery table schema versions and check whether BigQuery accepts the update.
+
+Every column is hashed bottom-up once, the hash covers the column name, type, mode and nested fields,
+so identical RECORD subtrees are skipped without walking them.
+Fields are aligned by case-insensitive name, descriptions are ignored.
+The changes BigQuery accepts on schema update:
+- new NULLABLE or REPEATED columns,
+- REQUIRED mode relaxed to NULLABLE,
+- INT64 widened to NUMERIC or FLOAT64, NUMERIC widened to FLOAT64.
+References:
+- https://cloud.google.com/bigquery/docs/managing-table-schemas
+"""
+import hashlib
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Tuple
+from gbqschema_converter.merge import WIDENINGS, Schema, _as_gbqschema
+from gbqschema_converter._schema import STANDARD_TYPES
+
+
+Change = namedtuple("Change", ['path', 'kind', 'old', 'new', 'accepted'])
+Change.__doc__ = """Column change.
+
+Attributes:
+
+  path: Dotted path of the column.
+
+  kind: One of "added", "dropped", "relaxed", "mode", "type".
+
+  old: Previous type for "type" change, previous mode otherwise, None for added column.
+
+  new: New type for "type" change, new mode otherwise, None for dropped column.
+
+  accepted: BigQuery accepts the change on schema update.
+"""
+
+
+class DiffResult(namedtuple("DiffResult", ['changes'])):
+    """Schema versions comparison result.
+
+    Attributes:
+
+      changes: List of Change.
+    """
+    __slots__ = ()
+
+    @property
+    def accepted(self) -> bool:
+        """BigQuery accepts all changes on schema update."""
+        return all(change.accepted for change in self.changes)
+
+
+_Column = namedtuple("_Column", ['name', 'type', 'mode', 'digest', 'fields'])
+
+
+def _hash(*parts: bytes) -> bytes:
+    return hashlib.blake2b(b"\x00".join(parts), digest_size=16).digest()
+
+
+def _tree(gbq_schema: list) -> Tuple[bytes, Dict[str, _Column]]:
+    """Function to hash the schema level.
+
+    Args:
+
+      gbq_schema: BigQuery schema level, JSON representation.
+
+    Returns:
+
+      Tuple of (level hash, dict of lowercase column name to column).
+    """
+    level = {}
+    for element in gbq_schema:
+        key = element['name'].lower()
+        field_type = STANDARD_TYPES.get(element['type'], element['type'])
+        mode = element.get('mode') or "NULLABLE"
+        fields_digest, fields = _tree(element['fields']) if field_type == "RECORD" else (b"", None)
+        level[key] = _Column(element['name'], field_type, mode,
+                             _hash(key.encode("utf-8"), field_type.encode(), mode.encode(), fields_digest),
+                             fields)
+    return _hash(*sorted(column.digest for column in level.values())), level
+
+
+def _diff_level(old: Dict[str, _Column],
+                new: Dict[str, _Column],
+                parent: Optional[str],
+                changes: List[Change]) -> None:
+    """Function to compare the schema levels.
+
+    Args:
+
+      old: Previous level.
+
+      new: New level.
+
+      parent: Dotted path of the level.
+
+      changes: List of changes to fill in.
+    """
+    for key, column in old.items():
+        path = column.name if parent is None else f"{parent}.{column.name}"
+        other = new.get(key)
+        if other is None:
+            changes.append(Change(path, "dropped", column.mode, None, False))
+            continue
+
+        if column.digest == other.digest:
+            continue
+
+        # the column update is accepted only if both its type and mode changes are accepted
+        widened = column.type == other.type\
+            or WIDENINGS.get(frozenset([column.type, other.type])) == other.type
+        relaxed = column.mode == other.mode or (column.mode == "REQUIRED" and other.mode == "NULLABLE")
+
+        if column.type != other.type:
+            changes.append(Change(path, "type", column.type, other.type, widened and relaxed))
+
+        if column.mode != other.mode:
+            changes.append(Change(path, "relaxed" if relaxed else "mode", column.mode, other.mode,
+                                  widened and relaxed))
+
+        if column.type == other.type and column.fields is not None:
+            _diff_level(column.fields, other.fields, path, changes)
+
+    for key, column in new.items():
+        if key not in old:
+            path = column.name if parent is None else f"{parent}.{column.name}"
+            changes.append(Change(path, "added", None, column.mode, column.mode != "REQUIRED"))
+
+
+def _compare(old: Tuple[bytes, Dict[str, _Column]],
+             new: Tuple[bytes, Dict[str, _Column]]) -> DiffResult:
+    changes = []
+    if old[0] != new[0]:
+        _diff_level(old[1], new[1], None, changes)
+    return DiffResult(changes)
+
+
+def diff(old: Schema, new: Schema) -> DiffResult:
+    """Function to compare the table schema versions.
+
+    Args:
+
+      old: Live schema.
+
+      new: Proposed schema.
+         Every version is either Google BigQuery schema in JSON or SDK representation,
+         or json schema.
+
+    Returns:
+
+      DiffResult with the list of Change.
+    """
+    return _compare(_tree(_as_gbqschema(old)), _tree(_as_gbqschema(new)))
+
+
+def diff_batch(pairs: Iterable[Tuple[Schema, Schema]]) -> List[DiffResult]:
+    """Function to compare many pairs of the table schema versions.
+
+    Every schema object is hashed once per call,
+    so a live schema compared with many proposed schemas is processed once.
+
+    Args:
+
+      pairs: Pairs of (live schema, proposed schema).
+
+    Returns:
+
+      List of DiffResult in the input order.
+    """
+    trees = {}
+
+    def _cached(schema: Schema) -> Tuple[bytes, Dict[str, _Column]]:
+        # the schema is kept in the cache along with its tree, so its id is not reused
+        cached = trees.get(id(schema))
+        if cached is None:
+            cached = trees[id(schema)] = schema, _tree(_as_gbqschema(schema))
+        return cached[1]
+
+    return [_compare(_cached(old), _cached(new)) for old, new in pairs]
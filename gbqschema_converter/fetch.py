@@ -0,0 +1,270 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: To fetch and convert the schemas of all tables of Google BigQuery project.
+
+Datasets and tables are listed page by page, table schemas are fetched concurrently
+over a single HTTP session with bounded connection pool and rate limit,
+every schema is converted in the worker thread as soon as it arrives.
+References:
+- https://cloud.google.com/bigquery/docs/reference/rest/v2/datasets/list
+- https://cloud.google.com/bigquery/docs/reference/rest/v2/tables/list
+- https://cloud.google.com/bigquery/docs/reference/rest/v2/tables/get
+"""
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterable, Iterator, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from gbqschema_converter import serializer
+from gbqschema_converter.converter import Converter
+
+
+API_ENDPOINT = "https://bigquery.googleapis.com"
+SCOPES = ("https://www.googleapis.com/auth/bigquery.readonly",)
+
+PAGE_SIZE = 1000
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+ExportedTable = namedtuple("ExportedTable", ['dataset', 'table', 'schema', 'output', 'error'])
+ExportedTable.__doc__ = """Fetched and converted table schema.
+
+Attributes:
+
+  dataset: Dataset ID.
+
+  table: Table ID.
+
+  schema: Google BigQuery schema, JSON representation, None if fetch failed.
+
+  output: Conversion output, None if fetch or conversion failed.
+
+  error: Exception raised by fetch or conversion, None on success.
+"""
+
+
+class RateLimiter:
+    """Thread-safe token bucket.
+
+    Args:
+
+      rate: Number of requests per second.
+
+      burst: Number of requests which can be sent at once, defaults to rate.
+    """
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Function to wait for a token."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+def _default_session() -> requests.Session:
+    """Function to create HTTP session authorized with Google application default credentials."""
+    import google.auth
+    from google.auth.transport.requests import AuthorizedSession
+
+    credentials, _ = google.auth.default(scopes=SCOPES)
+    return AuthorizedSession(credentials)
+
+
+class SchemaFetcher:
+    """Google BigQuery project schemas fetcher.
+
+    Args:
+
+      project: Project ID.
+
+      session: HTTP session sending authorized requests,
+             AuthorizedSession with application default credentials if not set.
+
+      endpoint: BigQuery REST API endpoint.
+
+      max_workers: Number of concurrent requests, it is also the connection pool size.
+
+      rate_limit: Max number of requests per second, not limited if not set.
+
+      retries: Number of retries of the failed requests, 429 and 5xx responses are retried with backoff.
+
+      timeout: Request timeout in seconds.
+    """
+    def __init__(self,
+                 project: str,
+                 session: Optional[requests.Session] = None,
+                 endpoint: str = API_ENDPOINT,
+                 max_workers: int = 16,
+                 rate_limit: Optional[float] = None,
+                 retries: int = 3,
+                 timeout: float = 60):
+        self.project = project
+        self.endpoint = endpoint.rstrip("/")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._limiter = RateLimiter(rate_limit) if rate_limit else None
+
+        self.session = session if session is not None else _default_session()
+        adapter = HTTPAdapter(pool_connections=1,
+                              pool_maxsize=max_workers,
+                              pool_block=True,
+                              max_retries=Retry(total=retries,
+                                                backoff_factor=0.5,
+                                                status_forcelist=RETRY_STATUSES,
+                                                allowed_methods=frozenset(["GET"]),
+                                                raise_on_status=False))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _get(self, path: str, **params) -> dict:
+        """Function to send GET request to the API.
+
+        Raises:
+
+          requests.HTTPError: Error occured if the API responded with error status.
+        """
+        if self._limiter is not None:
+            self._limiter.acquire()
+        response = self.session.get(f"{self.endpoint}/bigquery/v2/projects/{self.project}/{path}",
+                                    params={k: v for k, v in params.items() if v is not None},
+                                    timeout=self.timeout)
+        response.raise_for_status()
+        return serializer.loads(response.content)
+
+    def _pages(self, path: str, key: str) -> Iterator[dict]:
+        """Function to iterate over the items of paginated list."""
+        token = None
+        while True:
+            page = self._get(path, maxResults=PAGE_SIZE, pageToken=token)
+            yield from page.get(key, ())
+            token = page.get('nextPageToken')
+            if not token:
+                return
+
+    def datasets(self) -> Iterator[str]:
+        """Function to list the project datasets.
+
+        Returns:
+
+          Iterator of dataset IDs.
+        """
+        for dataset in self._pages("datasets", "datasets"):
+            yield dataset['datasetReference']['datasetId']
+
+    def tables(self, dataset: str) -> Iterator[str]:
+        """Function to list the dataset tables.
+
+        Args:
+
+          dataset: Dataset ID.
+
+        Returns:
+
+          Iterator of table IDs.
+        """
+        for table in self._pages(f"datasets/{dataset}/tables", "tables"):
+            yield table['tableReference']['tableId']
+
+    def schema(self, dataset: str, table: str) -> list:
+        """Function to fetch the table schema.
+
+        Args:
+
+          dataset: Dataset ID.
+
+          table: Table ID.
+
+        Returns:
+
+          Google BigQuery schema, JSON representation.
+        """
+        return self._get(f"datasets/{dataset}/tables/{table}", fields="schema")\
+            .get('schema', {}).get('fields', [])
+
+    def _export_table(self, dataset: str, table: str, converter: Callable[[list], object]) -> ExportedTable:
+        schema = None
+        try:
+            schema = self.schema(dataset, table)
+            return ExportedTable(dataset, table, schema, converter(schema), None)
+        except Exception as ex:
+            return ExportedTable(dataset, table, schema, None, ex)
+
+    def export(self,
+               datasets: Optional[Iterable[str]] = None,
+               converter: Optional[Callable[[list], object]] = None) -> Iterator[ExportedTable]:
+        """Function to fetch and convert the schemas of all tables.
+
+        Tables are listed while the schemas of the listed ones are fetched,
+        at most 2 * max_workers tables are in flight.
+
+        Args:
+
+          datasets: Dataset IDs, all project datasets by default.
+
+          converter: Function to convert Google BigQuery schema in JSON representation,
+                   Converter() by default, i.e. to json schema.
+
+        Returns:
+
+          Iterator of ExportedTable in completion order.
+
+        Raises:
+
+          requests.HTTPError: Error occured if datasets or tables cannot be listed.
+        """
+        converter = converter or Converter()
+        datasets = self.datasets() if datasets is None else datasets
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = set()
+            for dataset in datasets:
+                for table in self.tables(dataset):
+                    pending.add(pool.submit(self._export_table, dataset, table, converter))
+                    if len(pending) >= 2 * self.max_workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+
+def export_project(project: str,
+                   datasets: Optional[Iterable[str]] = None,
+                   converter: Optional[Callable[[list], object]] = None,
+                   **kwargs) -> Iterator[ExportedTable]:
+    """Function to fetch and convert the schemas of all project tables.
+
+    Args:
+
+      project: Project ID.
+
+      datasets: Dataset IDs, all project datasets by default.
+
+      converter: Function to convert Google BigQuery schema in JSON representation,
+               Converter() by default, i.e. to json schema.
+
+      **kwargs: SchemaFetcher arguments.
+
+    Returns:
+
+      Iterator of ExportedTable in completion order.
+    """
+    return SchemaFetcher(project, **kwargs).export(datasets, converter)
@@ -0,0 +1,259 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: To assemble nested Google BigQuery schemas from flat column paths rows.
+
+Rows of (table, field path, data type, mode) as exported from INFORMATION_SCHEMA.COLUMN_FIELD_PATHS
+are read from CSV or NDJSON files as a stream. Every column is attached to its parent RECORD
+found by the path in a dict, so the tables are rebuilt in a single linear pass.
+A table is passed on as soon as its rows end, when the rows are grouped by table.
+References:
+- https://cloud.google.com/bigquery/docs/information-schema-column-field-paths
+"""
+import io
+import os
+import re
+import csv
+from typing import Callable, Iterable, Iterator, Optional, Sequence, Tuple, Union
+from gbqschema_converter import compression, serializer
+from gbqschema_converter.converter import Converter
+from gbqschema_converter._schema import STANDARD_TYPES
+
+
+TABLE_COLUMNS = ("table_catalog", "table_schema", "table_name")
+PATH_COLUMN = "field_path"
+TYPE_COLUMN = "data_type"
+MODE_COLUMN = "mode"
+NULLABLE_COLUMN = "is_nullable"
+DESCRIPTION_COLUMN = "description"
+
+FORMATS = ("csv", "ndjson")
+
+BASE_TYPE = re.compile(r'[A-Z0-9_]+')
+
+
+def _parse_type(data_type: str) -> Tuple[str, bool]:
+    """Function to parse SQL data type, e.g. ARRAY<STRUCT<a INT64>>, NUMERIC(10, 2).
+
+    Returns:
+
+      Tuple of (BigQuery type, the column is repeated).
+    """
+    data_type = data_type.strip().upper()
+    repeated = data_type.startswith("ARRAY<")
+    if repeated:
+        data_type = data_type[6:]
+    match = BASE_TYPE.match(data_type)
+    if match is None:
+        raise ValueError(f"Unknown data type '{data_type}'")
+    base = match.group()
+    return ("RECORD" if base == "STRUCT" else STANDARD_TYPES.get(base, base)), repeated
+
+
+class _Table:
+    """Google BigQuery schema assembled from the column paths.
+
+    Placeholder RECORDs are created for the parents which appear after their fields.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.columns = []
+        self._index = {}
+        self._defined = set()
+
+    def _node(self, path: str) -> dict:
+        node = self._index.get(path)
+        if node is None:
+            parent, _, name = path.rpartition(".")
+            node = {"name": name, "type": "RECORD", "mode": "NULLABLE", "fields": []}
+            if parent:
+                parent_node = self._node(parent)
+                if 'fields' not in parent_node:
+                    raise ValueError(f"{self.name}: column '{parent}' of the field '{path}' is not RECORD")
+                parent_node['fields'].append(node)
+            else:
+                self.columns.append(node)
+            self._index[path] = node
+        return node
+
+    def add(self, path: str, data_type: str, mode: Optional[str], description: Optional[str]) -> None:
+        """Function to add the column definition.
+
+        Raises:
+
+          ValueError: Error occured if the column is defined twice, or its data type is not valid.
+        """
+        if path in self._defined:
+            raise ValueError(f"{self.name}: column '{path}' is defined twice")
+        self._defined.add(path)
+        node = self._node(path)
+        node['type'], repeated = _parse_type(data_type)
+        node['mode'] = "REPEATED" if repeated else (mode or "NULLABLE").upper()
+        if description:
+            node['description'] = description
+        if node['type'] != "RECORD":
+            if node.pop('fields'):
+                raise ValueError(f"{self.name}: column '{path}' has fields, but it is not RECORD")
+
+
+def _mode(row: dict, mode_column: Optional[str]) -> Optional[str]:
+    mode = row.get(mode_column) if mode_column else None
+    if mode:
+        return mode
+    if str(row.get(NULLABLE_COLUMN, "")).upper() == "NO":
+        return "REQUIRED"
+    return None
+
+
+def assemble(rows: Iterable[dict],
+             table_columns: Sequence[str] = TABLE_COLUMNS,
+             path_column: str = PATH_COLUMN,
+             type_column: str = TYPE_COLUMN,
+             mode_column: Optional[str] = MODE_COLUMN,
+             description_column: Optional[str] = DESCRIPTION_COLUMN,
+             grouped: bool = True) -> Iterator[Tuple[str, list]]:
+    """Function to assemble Google BigQuery schemas from the column paths rows.
+
+    The column is REPEATED if its data type is ARRAY<...>, otherwise the mode is taken
+    from the mode column, or is REQUIRED if "is_nullable" is "NO", and NULLABLE by default.
+
+    Args:
+
+      rows: Column paths rows as dicts.
+
+      table_columns: Columns identifying the table, present non empty values are joined with ".".
+
+      path_column: Dotted field path column.
+
+      type_column: SQL data type column.
+
+      mode_column: Column mode column, not used if None.
+
+      description_column: Column description column, not used if None.
+
+      grouped: The rows are grouped by table, so a table is passed on as soon as its rows end.
+             All tables are kept in memory until the rows end otherwise.
+
+    Returns:
+
+      Iterator of tuples (table, Google BigQuery schema in JSON representation).
+
+    Raises:
+
+      ValueError: Error occured if grouped rows of a table are not contiguous,
+                or a column definition is not valid.
+    """
+    tables = {}
+    done = set()
+    current = None
+    for row in rows:
+        name = ".".join(str(row[column]) for column in table_columns if row.get(column))
+        if current is None or current.name != name:
+            if grouped and current is not None:
+                done.add(current.name)
+                yield current.name, tables.pop(current.name).columns
+            if name in done:
+                raise ValueError(f"Rows of the table '{name}' are not contiguous")
+            current = tables.get(name)
+            if current is None:
+                current = tables[name] = _Table(name)
+        current.add(row[path_column],
+                    row[type_column],
+                    _mode(row, mode_column),
+                    row.get(description_column) if description_column else None)
+
+    for table in tables.values():
+        yield table.name, table.columns
+
+
+def _format(path: str) -> str:
+    name = path
+    if compression.from_extension(name) is not None:
+        name = os.path.splitext(name)[0]
+    return "csv" if os.path.splitext(name)[1].lower() == ".csv" else "ndjson"
+
+
+def read_rows(path: str, format: Optional[str] = None, delimiter: str = ",") -> Iterator[dict]:
+    """Function to read column paths rows from the file as a stream.
+
+    Args:
+
+      path: CSV file with header, or NDJSON file path, compressed files are decompressed on the fly.
+
+      format: One of "csv", "ndjson", defined by the file extension by default.
+
+      delimiter: CSV delimiter.
+
+    Returns:
+
+      Iterator of rows as dicts.
+
+    Raises:
+
+      ValueError: Error occured if format is unknown.
+    """
+    format = format or _format(path)
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format '{format}', must be one of: {', '.join(FORMATS)}")
+    with compression.open_file(path) as f:
+        if format == "csv":
+            yield from csv.DictReader(io.TextIOWrapper(f, encoding="utf-8", newline=""), delimiter=delimiter)
+            return
+        for line in f:
+            if line.strip():
+                yield serializer.loads(line)
+
+
+def tables(paths: Union[str, Iterable[str]],
+           format: Optional[str] = None,
+           grouped: bool = True,
+           **kwargs) -> Iterator[Tuple[str, list]]:
+    """Function to assemble Google BigQuery schemas from column paths export files.
+
+    Args:
+
+      paths: CSV or NDJSON file path(s), read one after another.
+
+      format: One of "csv", "ndjson", defined by the file extension by default.
+
+      grouped: The rows are grouped by table.
+
+      **kwargs: assemble columns arguments.
+
+    Returns:
+
+      Iterator of tuples (table, Google BigQuery schema in JSON representation).
+    """
+    paths = [paths] if isinstance(paths, str) else paths
+    rows = (row for path in paths for row in read_rows(path, format))
+    return assemble(rows, grouped=grouped, **kwargs)
+
+
+def convert(paths: Union[str, Iterable[str]],
+            converter: Optional[Callable[[list], object]] = None,
+            format: Optional[str] = None,
+            grouped: bool = True,
+            **kwargs) -> Iterator[Tuple[str, object]]:
+    """Function to convert the tables from column paths export files.
+
+    Args:
+
+      paths: CSV or NDJSON file path(s).
+
+      converter: Function to convert Google BigQuery schema in JSON representation,
+               Converter() by default, i.e. to json schema.
+
+      format: One of "csv", "ndjson", defined by the file extension by default.
+
+      grouped: The rows are grouped by table.
+
+      **kwargs: assemble columns arguments.
+
+    Returns:
+
+      Iterator of tuples (table, conversion output).
+    """
+    converter = converter or Converter()
+    for name, gbq_schema in tables(paths, format, grouped, **kwargs):
+        yield name, converter(gbq_schema)
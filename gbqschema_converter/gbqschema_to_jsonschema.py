@@ -2,10 +2,14 @@
 # www.dkisler.com
 
 from copy import deepcopy
-from typing import Union, Tuple, List
+from typing import Union, Tuple, List, Iterable, Optional
 from collections import namedtuple
+from collections.abc import Mapping
 from google.cloud.bigquery import SchemaField
 import fastjsonschema
+from gbqschema_converter.index import FieldIndex
+from gbqschema_converter._schema import CompiledValidator
+from gbqschema_converter.projection import Projection, compile_projection, project
 
 
 gbq_schema = {
@@ -56,7 +60,8 @@ gbq_schema = {
                         "type": "string",
                         "enum": [
                             "REQUIRED",
-                            "NULLABLE"
+                            "NULLABLE",
+                            "REPEATED",
                         ]
                     },
                     {
@@ -69,7 +74,7 @@ gbq_schema = {
     },
 }
 
-validate_json = fastjsonschema.compile(gbq_schema)
+validate_json = CompiledValidator.from_definition(gbq_schema)
 
 TEMPLATE = {
     "$schema": "http://json-schema.org/draft-07/schema#",
@@ -110,8 +115,153 @@ map_types = MapTypes(
 )
 
 
+def _repeated(value: dict, mode: Optional[str]) -> dict:
+    """Function to wrap the column definition into array if the column is REPEATED."""
+    if mode == "REPEATED":
+        return {"type": "array", "items": value}
+    return value
+
+
+def _json_converter(gbq_schema: list,
+                    projection: Optional[Projection] = None,
+                    index: Optional[FieldIndex] = None,
+                    parent: Optional[str] = None) -> dict:
+    """Conversion step for BigQuery schema in JSON representation.
+
+    Args:
+
+      gbq_schema: BigQuery schema, JSON representation.
+
+      projection: Columns selection.
+
+      index: Fields index to fill in.
+
+      parent: Dotted path of the converted RECORD.
+
+    Returns:
+
+      Json schema object definition.
+
+    Raises:
+
+      fastjsonschema.JsonSchemaException: Error occured if input Google BigQuery schema is invalid.
+    """
+    columns = list(project(gbq_schema, projection,
+                           lambda element: element.get('name'),
+                           lambda element: element.get('type') == "RECORD"))
+
+    try:
+        validate_json(gbq_schema if projection is None
+                      else [element for element, _ in columns])
+    except fastjsonschema.JsonSchemaException as ex:
+        raise ex
+
+    output = {
+        "type": "object",
+        "properties": {
+        },
+        "additionalProperties": False,
+        "required": [
+        ],
+    }
+
+    for element, fields_projection in columns:
+        key = element['name']
+
+        if element['type'] == "RECORD":
+            path = None if index is None\
+                else index.add(parent, key, None, "RECORD", element.get('mode'))
+            value = _json_converter(element['fields'], fields_projection, index, path)
+            if not value['properties'] and fields_projection is not None:
+                if index is not None:
+                    del index[path]
+                continue
+            value = _repeated(value, element.get('mode'))
+            if index is not None:
+                index[path] = index[path]._replace(node=value)
+        else:
+            value = _repeated(dict(getattr(map_types, element['type'])), element.get('mode'))
+            if index is not None:
+                index.add(parent, key, value, element['type'], element.get('mode'))
+
+        output['properties'][key] = value
+
+        if 'mode' in element:
+            if element['mode'] == "REQUIRED":
+                output['required'].append(key)
+
+    if not output['required']:
+        _ = output.pop('required')
+
+    return output
+
+
+def _sdk_converter(gbq_schema: List[SchemaField],
+                   projection: Optional[Projection] = None,
+                   index: Optional[FieldIndex] = None,
+                   parent: Optional[str] = None) -> dict:
+    """Conversion step for BigQuery schema in Google SDK representation.
+
+    Args:
+
+      gbq_schema: BigQuery schema, SDK representation.
+
+      projection: Columns selection.
+
+      index: Fields index to fill in.
+
+      parent: Dotted path of the converted RECORD.
+
+    Returns:
+
+      Json schema object definition.
+    """
+    output = {
+        "type": "object",
+        "properties": {
+        },
+        "additionalProperties": False,
+        "required": [
+        ],
+    }
+
+    for element, fields_projection in project(gbq_schema, projection,
+                                              lambda element: element.name,
+                                              lambda element: element.field_type == "RECORD"):
+        key = element.name
+
+        if element.field_type == "RECORD":
+            path = None if index is None\
+                else index.add(parent, key, None, "RECORD", element.mode)
+            value = _sdk_converter(element.fields, fields_projection, index, path)
+            if not value['properties'] and fields_projection is not None:
+                if index is not None:
+                    del index[path]
+                continue
+            value = _repeated(value, element.mode)
+            if index is not None:
+                index[path] = index[path]._replace(node=value)
+        else:
+            value = _repeated(dict(getattr(map_types, element.field_type)), element.mode)
+            if index is not None:
+                index.add(parent, key, value, element.field_type, element.mode)
+
+        output['properties'][key] = value
+
+        if element.mode == "REQUIRED":
+            output['required'].append(key)
+
+    if not output['required']:
+        _ = output.pop('required')
+
+    return output
+
+
 def json_representation(gbq_schema: dict,
-                        additional_properties: bool = False) -> dict:
+                        additional_properties: bool = False,
+                        include: Union[str, Iterable[str], None] = None,
+                        exclude: Union[str, Iterable[str], None] = None,
+                        with_index: bool = False) -> Union[dict, Tuple[dict, FieldIndex]]:
     """Function to convert Google BigQuery schema in JSON representation to json schema.
 
     Args:
@@ -122,58 +272,41 @@ def json_representation(gbq_schema: dict,
 
       additional_properties: Json schema should contain "additionalProperties".
 
+      include: Dotted paths of the columns to convert, e.g. "user.id", "user.address.*".
+             All columns are converted by default.
+
+      exclude: Dotted paths of the columns to skip.
+
+      with_index: Return the fields index along with json schema.
+
     Returns:
 
-      Json schema as dict.
+      Json schema as dict, or tuple of json schema and FieldIndex if with_index is set.
 
     Raises:
 
       fastjsonschema.JsonSchemaException: Error occured if input Google BigQuery schema is invalid.
     """
     output = deepcopy(TEMPLATE)
-    
-    def _converter(gbq_schema: dict) -> dict:
-        """Conversion step."""
-        try:
-            validate_json(gbq_schema)
-        except fastjsonschema.JsonSchemaException as ex:
-            raise ex
-
-        output = {
-            "type": "object",
-            "properties": {
-            },
-            "additionalProperties": False,
-            "required": [
-            ],
-        }
-
-        for element in gbq_schema:
-            key = element['name']
-            
-            output['properties'][key] = getattr(map_types, element['type'])
-
-            if 'mode' in element:
-                if element['mode'] == "REQUIRED":
-                    output['required'].append(key)
-            
-            if element['type'] == "RECORD":
-                output['properties'][key] = _converter(element['fields'])
-                
-        if not output['required']:
-            _ = output.pop('required')
-            
-        return output
-    
-    output['definitions']['element'] = _converter(gbq_schema)
+
+    index = FieldIndex() if with_index else None
+
+    output['definitions']['element'] = _json_converter(gbq_schema,
+                                                       compile_projection(include, exclude),
+                                                       index)
 
     output['definitions']['element']['additionalProperties'] = additional_properties
 
+    if with_index:
+        return output, index
     return output
 
 
 def sdk_representation(gbq_schema: List[SchemaField],
-                       additional_properties: bool = False) -> dict:
+                       additional_properties: bool = False,
+                       include: Union[str, Iterable[str], None] = None,
+                       exclude: Union[str, Iterable[str], None] = None,
+                       with_index: bool = False) -> Union[dict, Tuple[dict, FieldIndex]]:
     """Function to convert Google BigQuery schema in Google SDK representation to json schema.
 
     Args:
@@ -184,40 +317,183 @@ def sdk_representation(gbq_schema: List[SchemaField],
 
       additional_properties: Json Schema should contain "additionalProperties".
 
+      include: Dotted paths of the columns to convert, e.g. "user.id", "user.address.*".
+             All columns are converted by default.
+
+      exclude: Dotted paths of the columns to skip.
+
+      with_index: Return the fields index along with json schema.
+
     Returns:
 
-      json schema as dict.
+      json schema as dict, or tuple of json schema and FieldIndex if with_index is set.
     """
     output = deepcopy(TEMPLATE)
 
-    def _converter(gbq_schema: dict) -> dict:
-        output = {
-            "type": "object",
-            "properties": {
-            },
-            "additionalProperties": False,
-            "required": [
-            ],
-        }
-        
-        for element in gbq_schema:
-            key = element.name
+    index = FieldIndex() if with_index else None
 
-            output['properties'][key] = getattr(map_types, element.field_type)
+    output['definitions']['element'] = _sdk_converter(gbq_schema,
+                                                      compile_projection(include, exclude),
+                                                      index)
 
-            if element.mode == "REQUIRED":
-                output['required'].append(key)
-            
-            if element.field_type == "RECORD":
-                output['properties'][key] = _converter(element.fields)
+    output['definitions']['element']['additionalProperties'] = additional_properties
+
+    if with_index:
+        return output, index
+    return output
 
-        if not output['required']:
-            _ = output.pop('required')
-        
-        return output
-    
-    output['definitions']['element'] = _converter(gbq_schema)
 
-    output['definitions']['element']['additionalProperties'] = additional_properties
+def _materialize(value: object) -> object:
+    """Function to convert lazy value to plain dict."""
+    if isinstance(value, (LazyJsonSchema, _LazyProperties)):
+        return value.materialize()
+    if isinstance(value, dict):
+        return {key: _materialize(v) for key, v in value.items()}
+    return value
+
+
+class _LazyProperties(Mapping):
+    """Json schema "properties" converted column by column on first access.
+
+    Args:
+
+      gbq_schema: BigQuery schema level, JSON representation.
+    """
+    def __init__(self, gbq_schema: list):
+        self._elements = {element['name']: element for element in gbq_schema}
+        self._cache = {}
+
+    def __getitem__(self, key: str) -> Union[dict, 'LazyJsonSchema']:
+        if key not in self._cache:
+            element = self._elements[key]
+            if element['type'] == "RECORD":
+                value = LazyJsonSchema(_lazy_object, element['fields'])
+            else:
+                value = dict(getattr(map_types, element['type']))
+            self._cache[key] = _repeated(value, element.get('mode'))
+        return self._cache[key]
+
+    def __iter__(self):
+        return iter(self._elements)
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self._elements)})"
+
+    def materialize(self) -> dict:
+        """Function to convert all properties.
+
+        Returns:
+
+          Json schema properties as dict.
+        """
+        return {key: _materialize(self[key]) for key in self._elements}
+
+
+class LazyJsonSchema(Mapping):
+    """Json schema mapping which is built on first access and memoized.
+
+    Nested RECORD columns are themselves LazyJsonSchema objects,
+    hence a subtree is validated and converted only when it is accessed.
+
+    Args:
+
+      loader: Function building the mapping.
+
+      *args: Loader arguments.
+    """
+    def __init__(self, loader, *args):
+        self._loader = loader
+        self._args = args
+        self._data = None
+
+    @property
+    def _mapping(self) -> dict:
+        if self._data is None:
+            self._data = self._loader(*self._args)
+            self._loader = self._args = None
+        return self._data
+
+    def __getitem__(self, key: str) -> object:
+        return self._mapping[key]
+
+    def __iter__(self):
+        return iter(self._mapping)
+
+    def __len__(self) -> int:
+        return len(self._mapping)
+
+    def __repr__(self) -> str:
+        if self._data is None:
+            return f"{self.__class__.__name__}(<not loaded>)"
+        return f"{self.__class__.__name__}({self._data!r})"
+
+    def materialize(self) -> dict:
+        """Function to convert the whole subtree.
+
+        Returns:
+
+          Json schema as dict, identical to the output of the eager conversion.
+        """
+        return {key: _materialize(value) for key, value in self._mapping.items()}
+
+
+def _lazy_object(gbq_schema: list,
+                 additional_properties: bool = False) -> dict:
+    """Conversion step of the lazy representation.
+
+    Raises:
+
+      fastjsonschema.JsonSchemaException: Error occured if input Google BigQuery schema is invalid.
+    """
+    try:
+        validate_json(gbq_schema)
+    except fastjsonschema.JsonSchemaException as ex:
+        raise ex
+
+    output = {
+        "type": "object",
+        "properties": _LazyProperties(gbq_schema),
+        "additionalProperties": additional_properties,
+    }
+
+    required = [element['name'] for element in gbq_schema
+                if element.get('mode') == "REQUIRED"]
+    if required:
+        output['required'] = required
 
     return output
+
+
+def lazy_representation(gbq_schema: list,
+                        additional_properties: bool = False) -> LazyJsonSchema:
+    """Function to convert Google BigQuery schema in JSON representation to json schema on access.
+
+    Every RECORD subtree is validated and converted when it is accessed for the first time,
+    the result is memoized. Call materialize() to get the output of json_representation.
+
+    Args:
+
+      gbq_schema: BigQuery schema, JSON representation
+                read https://cloud.google.com/bigquery/docs/schemas#creating_a_json_schema_file
+                for details.
+
+      additional_properties: Json schema should contain "additionalProperties".
+
+    Returns:
+
+      Json schema as read-only mapping.
+
+    Raises:
+
+      fastjsonschema.JsonSchemaException: Error occured on access if input Google BigQuery schema is invalid.
+    """
+    output = deepcopy(TEMPLATE)
+
+    output['definitions']['element'] = LazyJsonSchema(_lazy_object,
+                                                      gbq_schema,
+                                                      additional_properties)
+
+    return LazyJsonSchema(dict, output)
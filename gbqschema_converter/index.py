@@ -0,0 +1,99 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: Flat index of the converted schema fields by dotted path.
+
+The index is filled by the converters in the same pass as the conversion.
+"""
+from collections import namedtuple, Counter
+from typing import Optional
+
+FieldInfo = namedtuple("FieldInfo", ['node', 'type', 'mode', 'depth', 'parent'])
+FieldInfo.__doc__ = """Indexed field.
+
+Attributes:
+
+  node: Output schema node of the field.
+
+  type: Google BigQuery type of the field.
+
+  mode: Google BigQuery mode of the field.
+
+  depth: Nesting level, 0 for top-level columns.
+
+  parent: Dotted path of the parent RECORD, None for top-level columns.
+"""
+
+
+class FieldIndex(dict):
+    """Mapping of dotted field path to FieldInfo.
+
+    Fields count and depth statistics are kept up to date on insertion.
+    """
+    def __init__(self):
+        super().__init__()
+        self.depths = Counter()
+
+    def __setitem__(self, path: str, info: FieldInfo) -> None:
+        if path in self:
+            self.depths[self[path].depth] -= 1
+        super().__setitem__(path, info)
+        self.depths[info.depth] += 1
+
+    def __delitem__(self, path: str) -> None:
+        self.depths[self[path].depth] -= 1
+        super().__delitem__(path)
+
+    def __reduce__(self) -> tuple:
+        # the items are restored with __setitem__ after __init__, so depths are counted again
+        return self.__class__, (), None, None, iter(self.items())
+
+    def add(self,
+            parent: Optional[str],
+            name: str,
+            node: object,
+            field_type: str,
+            mode: Optional[str]) -> str:
+        """Function to index the field.
+
+        Args:
+
+          parent: Dotted path of the parent RECORD, None for top-level columns.
+
+          name: Field name.
+
+          node: Output schema node of the field.
+
+          field_type: Google BigQuery type of the field.
+
+          mode: Google BigQuery mode of the field, NULLABLE if not set.
+
+        Returns:
+
+          Dotted path of the field.
+        """
+        if parent is None:
+            path, depth = name, 0
+        else:
+            path, depth = f"{parent}.{name}", self[parent].depth + 1
+        self[path] = FieldInfo(node, field_type, mode or "NULLABLE", depth, parent)
+        return path
+
+    @property
+    def max_depth(self) -> int:
+        """Maximum nesting level, -1 if the index is empty."""
+        return max((depth for depth, count in self.depths.items() if count), default=-1)
+
+    def children(self, parent: Optional[str]) -> list:
+        """Function to list the fields of the RECORD.
+
+        Args:
+
+          parent: Dotted path of the RECORD, None for top-level columns.
+
+        Returns:
+
+          Dotted paths of the fields.
+        """
+        return [path for path, info in self.items() if info.parent == parent]
@@ -0,0 +1,306 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: To infer Google BigQuery table schema from NDJSON sample data.
+
+Input files are split into shards at line boundaries, every shard is read as a stream
+and summarized into a partial schema in a separate process,
+partial schemas are merged associatively.
+References:
+- https://cloud.google.com/bigquery/docs/loading-data-cloud-storage-json
+"""
+import os
+import re
+from functools import reduce
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple, Union
+from google.cloud.bigquery import SchemaField
+from gbqschema_converter import compression, serializer
+
+
+CHUNK_SIZE = 64 * 1024 * 1024
+
+DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+TIME = re.compile(r'^\d{2}:\d{2}:\d{2}(\.\d{1,6})?$')
+DATETIME = re.compile(r'^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d{1,6})?$')
+TIMESTAMP = re.compile(r'^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d{1,6})?( ?UTC|Z|[+-]\d{2}:?\d{2})$')
+
+TEMPORAL_TYPES = frozenset(["DATE", "DATETIME", "TIMESTAMP"])
+NUMERIC_TYPES = frozenset(["INT64", "FLOAT64"])
+
+Shard = Tuple[str, int, Optional[int]]
+
+
+def _level() -> dict:
+    """Partial schema of the object level.
+
+    Format:
+    {
+        "rows": number of objects,
+        "fields": {
+            "field name": {
+                "types": set of types of non-null values,
+                "count": number of objects with non-null value,
+                "repeated": value is array,
+                "record": partial schema of the nested object level or None,
+            },
+        },
+    }
+    """
+    return {"rows": 0, "fields": {}}
+
+
+def _field() -> dict:
+    return {"types": set(), "count": 0, "repeated": False, "record": None}
+
+
+def _scalar_type(value: Union[bool, int, float, str]) -> str:
+    """Function to define BigQuery type of the scalar value."""
+    if isinstance(value, bool):
+        return "BOOLEAN"
+    if isinstance(value, int):
+        return "INT64"
+    if isinstance(value, float):
+        return "FLOAT64"
+    if 8 <= len(value) <= 40 and value[:1].isdigit():
+        for name, pattern in (("DATE", DATE),
+                              ("TIME", TIME),
+                              ("DATETIME", DATETIME),
+                              ("TIMESTAMP", TIMESTAMP)):
+            if pattern.match(value):
+                return name
+    return "STRING"
+
+
+def _observe_value(field: dict, value: object) -> None:
+    """Function to add the non-null value to the field summary."""
+    if isinstance(value, dict):
+        field['types'].add("RECORD")
+        if field['record'] is None:
+            field['record'] = _level()
+        _observe(field['record'], value)
+    elif isinstance(value, list):
+        # BigQuery does not support nested arrays, items are flattened
+        for item in value:
+            if item is not None:
+                _observe_value(field, item)
+    else:
+        field['types'].add(_scalar_type(value))
+
+
+def _observe(level: dict, row: dict) -> None:
+    """Function to add the object to the level summary."""
+    level['rows'] += 1
+    fields = level['fields']
+    for name, value in row.items():
+        field = fields.get(name)
+        if field is None:
+            field = fields[name] = _field()
+        if value is None:
+            continue
+        field['count'] += 1
+        if isinstance(value, list):
+            field['repeated'] = True
+        _observe_value(field, value)
+
+
+def merge(left: dict, right: dict) -> dict:
+    """Function to merge two partial schemas.
+
+    The merge is associative, fields order follows the first appearance.
+
+    Args:
+
+      left: Partial schema.
+
+      right: Partial schema.
+
+    Returns:
+
+      Merged partial schema, left is updated in-place.
+    """
+    left['rows'] += right['rows']
+    fields = left['fields']
+    for name, other in right['fields'].items():
+        field = fields.get(name)
+        if field is None:
+            fields[name] = other
+            continue
+        field['types'].update(other['types'])
+        field['count'] += other['count']
+        field['repeated'] = field['repeated'] or other['repeated']
+        if other['record'] is not None:
+            field['record'] = other['record'] if field['record'] is None\
+                else merge(field['record'], other['record'])
+    return left
+
+
+def _shards(paths: Iterable[str], chunk_size: int) -> List[Shard]:
+    """Function to split the files into byte ranges, compressed files are not split."""
+    output = []
+    for path in paths:
+        if compression.detect_file(path) is not None:
+            output.append((path, 0, None))
+            continue
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), chunk_size):
+            output.append((path, start, min(start + chunk_size, size)))
+    return output
+
+
+def infer_shard(shard: Shard) -> dict:
+    """Function to summarize the lines starting within the byte range of the file.
+
+    Args:
+
+      shard: Tuple of (file path, start position, end position),
+           the whole file is read if end position is None.
+
+    Returns:
+
+      Partial schema.
+
+    Raises:
+
+      ValueError: Error occured if a line is not valid JSON object.
+    """
+    path, start, end = shard
+    level = _level()
+    with compression.open_file(path) as f:
+        if start:
+            # the line crossing the start belongs to the previous shard
+            f.seek(start - 1)
+            f.readline()
+        pos = f.tell()
+        while end is None or pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            if line.strip():
+                row = serializer.loads(line)
+                if not isinstance(row, dict):
+                    raise ValueError(f"{path}: JSON object expected at position {pos - len(line)}")
+                _observe(level, row)
+    return level
+
+
+def infer(paths: Union[str, Iterable[str]],
+          processes: Optional[int] = None,
+          chunk_size: int = CHUNK_SIZE) -> dict:
+    """Function to summarize NDJSON files into partial schema.
+
+    Args:
+
+      paths: NDJSON file path(s), compressed files are read as a stream.
+
+      processes: Number of worker processes, os.cpu_count() by default.
+               Shards are processed in the current process if set to 1.
+
+      chunk_size: Shard size in bytes.
+
+    Returns:
+
+      Partial schema.
+    """
+    shards = _shards([paths] if isinstance(paths, str) else paths, chunk_size)
+    if processes == 1 or len(shards) == 1:
+        levels = map(infer_shard, shards)
+        return reduce(merge, levels, _level())
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return reduce(merge, pool.map(infer_shard, shards), _level())
+
+
+def _resolve_type(types: set) -> str:
+    """Function to define BigQuery type compatible with all observed types."""
+    if len(types) == 1:
+        return next(iter(types))
+    if not types or "RECORD" in types:
+        return "STRING"
+    if types <= NUMERIC_TYPES:
+        return "FLOAT64"
+    if types <= TEMPORAL_TYPES:
+        return "TIMESTAMP"
+    return "STRING"
+
+
+def to_gbqschema(level: dict,
+                 infer_required: bool = False) -> list:
+    """Function to convert partial schema to Google BigQuery schema in JSON representation.
+
+    Args:
+
+      level: Partial schema.
+
+      infer_required: Set REQUIRED mode for the fields with non-null value in every object.
+
+    Returns:
+
+      Google BigQuery table json schema as list of dict.
+    """
+    output = []
+    for name, field in level['fields'].items():
+        gbq_column = {
+            "name": name,
+            "type": _resolve_type(field['types']),
+            "mode": "NULLABLE",
+        }
+
+        if field['repeated']:
+            gbq_column['mode'] = "REPEATED"
+        elif infer_required and field['count'] == level['rows']:
+            gbq_column['mode'] = "REQUIRED"
+
+        if gbq_column['type'] == "RECORD":
+            gbq_column['fields'] = to_gbqschema(field['record'], infer_required)
+
+        output.append(gbq_column)
+    return output
+
+
+def json_representation(paths: Union[str, Iterable[str]],
+                        processes: Optional[int] = None,
+                        infer_required: bool = False,
+                        chunk_size: int = CHUNK_SIZE) -> list:
+    """Function to infer Google BigQuery schema in JSON representation from NDJSON files.
+
+    Args:
+
+      paths: NDJSON file path(s).
+
+      processes: Number of worker processes, os.cpu_count() by default.
+
+      infer_required: Set REQUIRED mode for the fields with non-null value in every object.
+
+      chunk_size: Shard size in bytes.
+
+    Returns:
+
+      Google BigQuery table json schema as list of dict.
+    """
+    return to_gbqschema(infer(paths, processes, chunk_size), infer_required)
+
+
+def sdk_representation(paths: Union[str, Iterable[str]],
+                       processes: Optional[int] = None,
+                       infer_required: bool = False,
+                       chunk_size: int = CHUNK_SIZE) -> List[SchemaField]:
+    """Function to infer Google BigQuery schema in Google SDK representation from NDJSON files.
+
+    Args:
+
+      paths: NDJSON file path(s).
+
+      processes: Number of worker processes, os.cpu_count() by default.
+
+      infer_required: Set REQUIRED mode for the fields with non-null value in every object.
+
+      chunk_size: Shard size in bytes.
+
+    Returns:
+
+      List of SchemaField objects.
+    """
+    return [SchemaField.from_api_repr(gbq_column)
+            for gbq_column in json_representation(paths, processes, infer_required, chunk_size)]
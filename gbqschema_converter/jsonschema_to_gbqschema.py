@@ -1,11 +1,15 @@
 # Dmitry Kisler © 2020
 # www.dkisler.com
 
+import threading
 from copy import deepcopy
-from typing import Union, Tuple, List
+from typing import Union, Tuple, List, Iterable, Optional
 from collections import namedtuple
 from google.cloud.bigquery import SchemaField
 import fastjsonschema
+from gbqschema_converter.index import FieldIndex
+from gbqschema_converter._schema import CompiledValidator, fingerprint
+from gbqschema_converter.projection import Projection, compile_projection, project
 
 
 MapTypes = namedtuple("map_types",
@@ -20,6 +24,11 @@ map_types = MapTypes(
     object="RECORD"
 )
 
+VALIDATORS_CACHE_SIZE = 1024
+
+_validators = {}
+_validators_lock = threading.Lock()
+
 TEMPLATE_GBQ_COLUMN = {
     "description": None,
     "name": "col_a",
@@ -28,8 +37,107 @@ TEMPLATE_GBQ_COLUMN = {
 }
 
 
+def compile_validator(json_schema: dict) -> CompiledValidator:
+    """Function to compile json schema validator.
+
+    Compiled validators are cached by the json schema hash,
+    up to VALIDATORS_CACHE_SIZE validators are kept.
+
+    Args:
+
+      json_schema: Json schema.
+
+    Returns:
+
+      CompiledValidator object.
+
+    Raises:
+
+      fastjsonschema.JsonSchemaDefinitionException: Error occured if input json schema is invalid.
+    """
+    validator = _validators.get(fingerprint(json_schema))
+    if validator is None:
+        validator = register_validator(CompiledValidator.from_definition(json_schema))
+    return validator
+
+
+def register_validator(validator: CompiledValidator) -> CompiledValidator:
+    """Function to add compiled validator to the cache, e.g. the validator pickled by the parent process.
+
+    Args:
+
+      validator: CompiledValidator object returned by compile_validator.
+
+    Returns:
+
+      Cached CompiledValidator object for the same json schema.
+
+    Raises:
+
+      ValueError: Error occured if the validator has no json schema fingerprint.
+    """
+    if validator.key is None:
+        raise ValueError("Validator has no json schema fingerprint")
+    with _validators_lock:
+        cached = _validators.get(validator.key)
+        if cached is not None:
+            return cached
+        if len(_validators) >= VALIDATORS_CACHE_SIZE:
+            _ = _validators.pop(next(iter(_validators)), None)
+        _validators[validator.key] = validator
+    return validator
+
+
+Property = namedtuple("Property", ['definition', 'type', 'description', 'repeated', 'nullable'])
+
+
+def resolve_property(definition: dict) -> Property:
+    """Function to resolve json schema property definition to a single type.
+
+    Nullable unions, i.e. "type" list with "null", or "oneOf"/"anyOf" with {"type": "null"} branch,
+    resolve to their not null branch; arrays resolve to their items.
+
+    Args:
+
+      definition: Json schema property definition.
+
+    Returns:
+
+      Property tuple of (resolved definition, json type, description,
+      property is array, property is nullable).
+    """
+    description = None
+    repeated = nullable = False
+    while True:
+        if description is None:
+            description = definition.get('description')
+
+        field_type = definition.get('type')
+        if isinstance(field_type, list):
+            types = [t for t in field_type if t != "null"]
+            nullable = nullable or len(types) < len(field_type)
+            if len(types) == 1:
+                field_type = types[0]
+        elif field_type is None:
+            branches = definition.get('oneOf') or definition.get('anyOf') or ()
+            not_null = [branch for branch in branches if branch.get('type') != "null"]
+            if len(not_null) == 1 and len(branches) > 1:
+                nullable = True
+                definition = not_null[0]
+                continue
+
+        if field_type == "array" and not repeated:
+            repeated = True
+            definition = definition['items']
+            continue
+
+        return Property(definition, field_type, description, repeated, nullable)
+
+
 def _converter(json_schema: dict, 
-               to_sdk_schema: bool = False) -> Union[List, List[SchemaField]]:
+               to_sdk_schema: bool = False,
+               projection: Optional[Projection] = None,
+               index: Optional[FieldIndex] = None) -> Union[List, List[SchemaField]]:
     """Base function to convert Google BigQuery table schema, JSON representation.
     
     Args:
@@ -37,13 +145,21 @@ def _converter(json_schema: dict,
       json_schema: Json schema
                  read https://json-schema.org/
                  for details.
+
+      to_sdk_schema: Output as list of SchemaField.
+
+      projection: Columns selection.
+
+      index: Fields index to fill in.
     
     Returns:
       
       Google BigQuery table schema.
     """
     def __gbq_columns(properties: dict,
-                      required: list = None) -> list:
+                      required: list = None,
+                      projection: Optional[Projection] = None,
+                      parent: Optional[str] = None) -> list:
         """Function to define Google BigQuery table columns in JSON schema format.
 
         Column format:
@@ -68,40 +184,61 @@ def _converter(json_schema: dict,
           
           required: List of required keys.
 
+          projection: Columns selection.
+
+          parent: Dotted path of the converted RECORD.
+
         Returns:
           
           List of column definition dict objects.
         """
         output = []
-        for k, v in properties.items():
+        for (k, v), fields_projection in project(properties.items(), projection,
+                                                 lambda item: item[0],
+                                                 lambda item: 'properties' in resolve_property(item[1]).definition):
             gbq_column = deepcopy(TEMPLATE_GBQ_COLUMN)
 
             gbq_column['name'] = k
 
+            v, field_type, description, repeated, nullable = resolve_property(v)
+            if repeated:
+                gbq_column['mode'] = "REPEATED"
+            elif required and not nullable:
+                if k in required:
+                    gbq_column['mode'] = "REQUIRED"
+
             if 'format' not in v:
-                gbq_column['type'] = getattr(map_types, v['type'])
+                gbq_column['type'] = getattr(map_types, field_type)
             else:
                 gbq_column['type'] = "TIMESTAMP" if v['format'] == "date-time"\
                     else getattr(map_types, v['format']) if v['format'] in map_types.__dir__()\
                     else "STRING"
 
-            if required:
-                if k in required:
-                    gbq_column['mode'] = "REQUIRED"
+            if index is not None:
+                path = index.add(parent, k, None, gbq_column['type'], gbq_column['mode'])
 
-            if 'description' in v:
-                gbq_column['description'] = v['description']
+            if description is not None:
+                gbq_column['description'] = description
             else:
                 _ = gbq_column.pop('description')
 
             if gbq_column['type'] == "RECORD":
                 gbq_column['fields'] = __gbq_columns(v['properties'],
-                                                     v['required'])
-                
+                                                     v.get('required'),
+                                                     fields_projection,
+                                                     path if index is not None else None)
+                if not gbq_column['fields'] and fields_projection is not None:
+                    if index is not None:
+                        del index[path]
+                    continue
+
             if to_sdk_schema:
                 gbq_column['field_type'] = gbq_column.pop('type')
                 gbq_column = SchemaField(**gbq_column)
-                
+
+            if index is not None:
+                index[path] = index[path]._replace(node=gbq_column)
+
             output.append(gbq_column)
         return output
 
@@ -111,16 +248,59 @@ def _converter(json_schema: dict,
         for prop in json_schema['definitions'].values():
             properties = prop['properties']
             required = prop['required'] if 'required' in prop else None
-            output.extend(__gbq_columns(properties, required))
+            output.extend(__gbq_columns(properties, required, projection))
     else:
         properties = json_schema['properties']
         required = json_schema['required'] if 'required' in json_schema else None
-        output.extend(__gbq_columns(properties, required))
+        output.extend(__gbq_columns(properties, required, projection))
+
+    return output
+
+
+def _prune(json_schema: dict,
+           projection: Optional[Projection]) -> dict:
+    """Function to drop not selected properties before the json schema validation.
+
+    Nested properties are pruned along the projection through nullable unions and array items.
 
+    Args:
+
+      json_schema: Json schema.
+
+      projection: Columns selection.
+
+    Returns:
+
+      Copy of json schema with selected properties only, not changed definitions are shared.
+    """
+    if projection is None:
+        return json_schema
+
+    def _select(definition: dict, projection: Projection) -> dict:
+        output = dict(definition)
+        if 'properties' in definition:
+            output['properties'] = {k: v if fields_projection is None else _select(v, fields_projection)
+                                    for (k, v), fields_projection in project(definition['properties'].items(),
+                                                                             projection,
+                                                                             lambda item: item[0],
+                                                                             lambda item: 'properties' in resolve_property(item[1]).definition)}
+        if isinstance(definition.get('items'), dict):
+            output['items'] = _select(definition['items'], projection)
+        for union in ('oneOf', 'anyOf'):
+            if union in definition:
+                output[union] = [_select(branch, projection) for branch in definition[union]]
+        return output
+
+    output = _select(json_schema, projection)
+    if 'definitions' in json_schema:
+        output['definitions'] = {k: _select(v, projection) for k, v in json_schema['definitions'].items()}
     return output
 
 
-def json_representation(json_schema: dict) -> list:
+def json_representation(json_schema: dict,
+                        include: Union[str, Iterable[str], None] = None,
+                        exclude: Union[str, Iterable[str], None] = None,
+                        with_index: bool = False) -> Union[list, Tuple[list, FieldIndex]]:
     """Function to convert json schema to Google BigQuery schema in JSON representation.
 
     Args:
@@ -129,22 +309,38 @@ def json_representation(json_schema: dict) -> list:
                  read https://json-schema.org/
                  for details.
 
+      include: Dotted paths of the columns to convert, e.g. "user.id", "user.address.*".
+             All columns are converted by default.
+
+      exclude: Dotted paths of the columns to skip.
+
+      with_index: Return the fields index along with the columns.
+
     Returns:
       
-      Google BigQuery table json schema as list of dict.
+      Google BigQuery table json schema as list of dict,
+      or tuple of the schema and FieldIndex if with_index is set.
 
     Raises:
       
       fastjsonschema.JsonSchemaDefinitionException: Error occured if input json schema is invalid.
     """
+    projection = compile_projection(include, exclude)
     try:
-        fastjsonschema.compile(json_schema)
+        compile_validator(_prune(json_schema, projection))
     except fastjsonschema.JsonSchemaDefinitionException as ex:
         raise ex
-    return _converter(json_schema)
+    index = FieldIndex() if with_index else None
+    output = _converter(json_schema, projection=projection, index=index)
+    if with_index:
+        return output, index
+    return output
 
 
-def sdk_representation(json_schema: dict) -> List[SchemaField]:
+def sdk_representation(json_schema: dict,
+                       include: Union[str, Iterable[str], None] = None,
+                       exclude: Union[str, Iterable[str], None] = None,
+                       with_index: bool = False) -> Union[List[SchemaField], Tuple[List[SchemaField], FieldIndex]]:
     """Function to convert json schema to Google BigQuery schema in Google SDK representation.
 
     Args:
@@ -153,12 +349,25 @@ def sdk_representation(json_schema: dict) -> List[SchemaField]:
                  read https://json-schema.org/
                  for details.
 
+      include: Dotted paths of the columns to convert, e.g. "user.id", "user.address.*".
+             All columns are converted by default.
+
+      exclude: Dotted paths of the columns to skip.
+
+      with_index: Return the fields index along with the columns.
+
     Returns:
       
-      List of SchemaField objects.
+      List of SchemaField objects,
+      or tuple of the list and FieldIndex if with_index is set.
     """
+    projection = compile_projection(include, exclude)
     try:
-        fastjsonschema.compile(json_schema)
+        compile_validator(_prune(json_schema, projection))
     except fastjsonschema.JsonSchemaDefinitionException as ex:
-        raise ex    
-    return _converter(json_schema, to_sdk_schema=True)
+        raise ex
+    index = FieldIndex() if with_index else None
+    output = _converter(json_schema, to_sdk_schema=True, projection=projection, index=index)
+    if with_index:
+        return output, index
+    return output
@@ -0,0 +1,171 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: To merge versions of Google BigQuery table schema into their union.
+
+Fields are aligned by case-insensitive name in hash maps, so N versions merge in linear time.
+The changes BigQuery accepts on schema update are applied:
+- new columns are added in NULLABLE mode,
+- REQUIRED mode is relaxed to NULLABLE if the column is NULLABLE or missing in any version,
+- INT64 is widened to NUMERIC or FLOAT64, NUMERIC is widened to FLOAT64.
+Other differences are reported as conflicts, the earliest definition is kept.
+References:
+- https://cloud.google.com/bigquery/docs/managing-table-schemas
+"""
+from collections import namedtuple
+from typing import Iterable, List, Optional, Union
+from google.cloud.bigquery import SchemaField
+from gbqschema_converter.jsonschema_to_gbqschema import json_representation as jsonschema_to_gbqschema
+from gbqschema_converter._schema import STANDARD_TYPES, as_json_representation
+
+
+Conflict = namedtuple("Conflict", ['path', 'kind', 'detail'])
+Conflict.__doc__ = """Incompatible definitions of the column.
+
+Attributes:
+
+  path: Dotted path of the column.
+
+  kind: One of "type", "mode".
+
+  detail: Description of the conflict.
+"""
+
+MergeResult = namedtuple("MergeResult", ['schema', 'conflicts'])
+
+WIDENINGS = {
+    frozenset(["INT64", "NUMERIC"]): "NUMERIC",
+    frozenset(["INT64", "FLOAT64"]): "FLOAT64",
+    frozenset(["NUMERIC", "FLOAT64"]): "FLOAT64",
+}
+
+Schema = Union[list, List[SchemaField], dict]
+
+
+def _as_gbqschema(schema: Schema) -> list:
+    """Function to convert the input schema to Google BigQuery schema in JSON representation."""
+    if isinstance(schema, dict):
+        return jsonschema_to_gbqschema(schema)
+    return as_json_representation(schema)
+
+
+def _level() -> dict:
+    return {"columns": {}, "required": set()}
+
+
+def _merge_level(level: dict,
+                 gbq_schema: list,
+                 parent: Optional[str],
+                 first: bool,
+                 conflicts: list) -> None:
+    """Function to merge the schema level into the union.
+
+    Args:
+
+      level: Union level, dict with
+           "columns": dict of lowercase column name to column,
+           "required": set of lowercase names of REQUIRED columns.
+
+      gbq_schema: BigQuery schema level, JSON representation.
+
+      parent: Dotted path of the level.
+
+      first: The level is seen for the first time.
+
+      conflicts: List of conflicts to fill in.
+    """
+    columns = level['columns']
+    seen = set()
+    for element in gbq_schema:
+        key = element['name'].lower()
+        seen.add(key)
+        path = element['name'] if parent is None else f"{parent}.{element['name']}"
+        field_type = STANDARD_TYPES.get(element['type'], element['type'])
+        mode = element.get('mode') or "NULLABLE"
+
+        column = columns.get(key)
+        if column is None:
+            column = {
+                "name": element['name'],
+                "type": field_type,
+                "mode": mode if first or mode != "REQUIRED" else "NULLABLE",
+            }
+            if element.get('description'):
+                column['description'] = element['description']
+            if field_type == "RECORD":
+                column['fields'] = _level()
+                _merge_level(column['fields'], element['fields'], path, True, conflicts)
+            if column['mode'] == "REQUIRED":
+                level['required'].add(key)
+            columns[key] = column
+            continue
+
+        widened = column['type'] if column['type'] == field_type\
+            else WIDENINGS.get(frozenset([column['type'], field_type]))
+        if widened is None:
+            conflicts.append(Conflict(path, "type", f"{column['type']} and {field_type}"))
+            continue
+
+        # the union is updated only if the column version has no conflicts
+        if column['mode'] != mode and "REPEATED" in (column['mode'], mode):
+            conflicts.append(Conflict(path, "mode", f"{column['mode']} and {mode}"))
+            continue
+
+        column['type'] = widened
+        if column['mode'] != mode:
+            column['mode'] = "NULLABLE"
+            level['required'].discard(key)
+
+        if element.get('description'):
+            column['description'] = element['description']
+
+        if field_type == "RECORD":
+            _merge_level(column['fields'], element['fields'], path, False, conflicts)
+
+    missing = level['required'].difference(seen)
+    for key in missing:
+        columns[key]['mode'] = "NULLABLE"
+    level['required'].difference_update(missing)
+
+
+def _output(level: dict, to_sdk_schema: bool) -> Union[list, List[SchemaField]]:
+    """Function to convert the union level to Google BigQuery schema."""
+    output = []
+    for column in level['columns'].values():
+        column = dict(column)
+        if 'fields' in column:
+            column['fields'] = _output(column['fields'], to_sdk_schema)
+        if to_sdk_schema:
+            column = SchemaField(name=column['name'],
+                                 field_type=column['type'],
+                                 mode=column['mode'],
+                                 description=column.get('description'),
+                                 fields=column.get('fields', ()))
+        output.append(column)
+    return output
+
+
+def merge(schemas: Iterable[Schema],
+          to_sdk_schema: bool = False) -> MergeResult:
+    """Function to merge versions of the table schema.
+
+    Args:
+
+      schemas: Schema versions, from oldest to newest.
+             Every version is either Google BigQuery schema in JSON or SDK representation,
+             or json schema.
+
+      to_sdk_schema: Output as list of SchemaField.
+
+    Returns:
+
+      Tuple of (union schema, list of Conflict).
+      The union schema is Google BigQuery schema in JSON representation,
+      or list of SchemaField if to_sdk_schema is set.
+    """
+    level = _level()
+    conflicts = []
+    for i, schema in enumerate(schemas):
+        _merge_level(level, _as_gbqschema(schema), None, i == 0, conflicts)
+    return MergeResult(_output(level, to_sdk_schema), conflicts)
@@ -0,0 +1,175 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: Selection of the schema columns by dotted paths.
+
+Paths, e.g. "user.id", "user.address.*", "event_ts", are compiled into a trie,
+one segment per node, segments may be glob patterns (see fnmatch).
+The converters walk the trie along with the schema,
+so excluded subtrees are neither traversed nor validated.
+"""
+from fnmatch import fnmatchcase
+from typing import Callable, Iterable, Iterator, Optional, Tuple, Union
+
+GLOB_CHARS = frozenset("*?[")
+
+
+class _Node:
+    """Trie node."""
+    __slots__ = ('children', 'globs', 'terminal')
+
+    def __init__(self):
+        self.children = {}
+        self.globs = []
+        self.terminal = False
+
+    def insert(self, path: str) -> None:
+        node = self
+        for segment in path.split('.'):
+            if GLOB_CHARS.intersection(segment):
+                for pattern, child in node.globs:
+                    if pattern == segment:
+                        break
+                else:
+                    child = _Node()
+                    node.globs.append((segment, child))
+            else:
+                child = node.children.setdefault(segment, _Node())
+            node = child
+        node.terminal = True
+
+    def match(self, name: str) -> Iterator['_Node']:
+        child = self.children.get(name)
+        if child is not None:
+            yield child
+        for pattern, child in self.globs:
+            if fnmatchcase(name, pattern):
+                yield child
+
+
+class Projection:
+    """Compiled columns selection at the schema level.
+
+    Args:
+
+      include: Trie nodes of the included paths, None to include all columns.
+
+      exclude: Trie nodes of the excluded paths.
+    """
+    __slots__ = ('_include', '_exclude')
+
+    def __init__(self,
+                 include: Optional[Tuple[_Node, ...]],
+                 exclude: Tuple[_Node, ...]):
+        self._include = include
+        self._exclude = exclude
+
+    @property
+    def partial(self) -> bool:
+        """Only some columns of the level are included."""
+        return self._include is not None
+
+    def select(self, name: str) -> Tuple[bool, Optional['Projection']]:
+        """Function to select the column.
+
+        Args:
+
+          name: Column name.
+
+        Returns:
+
+          Tuple of (the column is selected, projection of the column fields).
+          The projection is None if all the column fields are selected.
+        """
+        exclude = []
+        for node in self._exclude:
+            for child in node.match(name):
+                if child.terminal:
+                    return False, None
+                exclude.append(child)
+
+        include = None
+        if self._include is not None:
+            include = []
+            for node in self._include:
+                for child in node.match(name):
+                    if child.terminal:
+                        include = None
+                        break
+                    include.append(child)
+                if include is None:
+                    break
+            if include is not None and not include:
+                return False, None
+
+        if include is None and not exclude:
+            return True, None
+        return True, Projection(None if include is None else tuple(include),
+                                tuple(exclude))
+
+
+def compile_projection(include: Union[str, Iterable[str], Projection, None] = None,
+                       exclude: Union[str, Iterable[str], None] = None) -> Optional[Projection]:
+    """Function to compile columns selection.
+
+    Args:
+
+      include: Dotted paths of the columns to convert, all columns by default.
+             Compiled Projection is returned as is.
+
+      exclude: Dotted paths of the columns to skip.
+
+    Returns:
+
+      Projection of the schema root, None if all columns are selected.
+    """
+    if isinstance(include, Projection) and exclude is None:
+        return include
+
+    if include is None and exclude is None:
+        return None
+
+    def _trie(paths: Union[str, Iterable[str]]) -> _Node:
+        root = _Node()
+        for path in [paths] if isinstance(paths, str) else paths:
+            root.insert(path)
+        return root
+
+    return Projection(None if include is None else (_trie(include),),
+                      () if exclude is None else (_trie(exclude),))
+
+
+def project(elements: Iterable,
+            projection: Optional[Projection],
+            name: Callable[[object], str],
+            is_record: Callable[[object], bool]) -> Iterator[Tuple[object, Optional[Projection]]]:
+    """Generator of the selected columns.
+
+    Args:
+
+      elements: Schema level columns.
+
+      projection: Projection of the level.
+
+      name: Function returning the column name.
+
+      is_record: Function to check if the column has nested fields.
+
+    Returns:
+
+      Iterator of (column, projection of the column fields).
+    """
+    if projection is None:
+        for element in elements:
+            yield element, None
+        return
+
+    for element in elements:
+        selected, child = projection.select(name(element))
+        if not selected:
+            continue
+        if child is not None and child.partial and not is_record(element):
+            # the path points below a column without nested fields
+            continue
+        yield element, child
@@ -0,0 +1,302 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: To generate __slots__ row classes from Google BigQuery table schema.
+
+Python source of the classes is generated per schema, one class per RECORD,
+from_dict parses JSON row into typed attributes in a single specialized pass,
+to_dict converts the attributes back into the JSON values defined by map_types,
+i.e. the output is valid against the json schema of gbqschema_to_jsonschema.
+Column names which are Python keywords or reserved names get "_" suffix as attribute names.
+"""
+import re
+import base64
+import datetime
+import keyword
+import threading
+from decimal import Decimal
+from typing import Iterable, List, Pattern, Union
+from google.cloud.bigquery import SchemaField
+from gbqschema_converter.gbqschema_to_jsonschema import MapTypes
+from gbqschema_converter.row_encoder import _bytes, _timestamp
+from gbqschema_converter._schema import as_json_representation, fingerprint
+
+
+DATE = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})$')
+TIME = re.compile(r'^(\d{1,2}):(\d{1,2}):(\d{1,2})(?:\.(\d{1,6}))?$')
+DATETIME = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})[T ]?(\d{1,2}):(\d{1,2}):(\d{1,2})(?:\.(\d{1,6}))?'
+                      r'(?: ?(Z|UTC|[+-]\d{2}:?\d{2}))?$')
+
+
+def _match(pattern: Pattern, value: str, type_name: str) -> tuple:
+    match = pattern.match(value)
+    if match is None:
+        raise ValueError(f"Invalid {type_name} value '{value}'")
+    return match.groups()
+
+
+def _microseconds(fraction: str) -> int:
+    return int((fraction or "0").ljust(6, "0"))
+
+
+def _bool(value: Union[bool, str]) -> bool:
+    return value.lower() == "true" if isinstance(value, str) else bool(value)
+
+
+def _numeric(value: Union[int, float, str]) -> Decimal:
+    return Decimal(repr(value)) if isinstance(value, float) else Decimal(value)
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.b64decode(value)
+
+
+def _date(value: str) -> datetime.date:
+    year, month, day = _match(DATE, value, "DATE")
+    return datetime.date(int(year), int(month), int(day))
+
+
+def _time(value: str) -> datetime.time:
+    hour, minute, second, fraction = _match(TIME, value, "TIME")
+    return datetime.time(int(hour), int(minute), int(second), _microseconds(fraction))
+
+
+def _datetime(value: str, type_name: str = "DATETIME") -> datetime.datetime:
+    *fields, fraction, zone = _match(DATETIME, value, type_name)
+    if zone is not None and type_name == "DATETIME":
+        raise ValueError(f"Invalid DATETIME value '{value}', time zone is not allowed")
+    if zone is None or zone in ("Z", "UTC"):
+        tzinfo = datetime.timezone.utc
+    else:
+        offset = datetime.timedelta(hours=int(zone[1:3]), minutes=int(zone[-2:]))
+        tzinfo = datetime.timezone(-offset if zone[0] == "-" else offset)
+    return datetime.datetime(*map(int, fields), _microseconds(fraction),
+                             tzinfo=None if type_name == "DATETIME" else tzinfo)
+
+
+def _parse_timestamp(value: Union[float, str]) -> datetime.datetime:
+    if isinstance(value, str) and "-" in value[1:]:
+        return _datetime(value, "TIMESTAMP")
+    # REST API returns epoch seconds, e.g. "1.586381e9"
+    return datetime.datetime.fromtimestamp(float(value), datetime.timezone.utc)
+
+
+map_parsers = MapTypes(
+    INT="int({})",
+    INTEGER="int({})",
+    INT64="int({})",
+    FLOAT="float({})",
+    FLOAT64="float({})",
+    NUMERIC="_numeric({})",
+    BOOL="_bool({})",
+    BOOLEAN="_bool({})",
+    STRING="{}",
+    BYTES="_b64decode({})",
+    DATE="_date({})",
+    DATETIME="_datetime({})",
+    TIME="_time({})",
+    TIMESTAMP="_parse_timestamp({})",
+    RECORD="{}.from_dict",
+)
+
+map_formatters = MapTypes(
+    INT="{}",
+    INTEGER="{}",
+    INT64="{}",
+    FLOAT="{}",
+    FLOAT64="{}",
+    NUMERIC="float({})",
+    BOOL="{}",
+    BOOLEAN="{}",
+    STRING="{}",
+    BYTES="_bytes({})",
+    DATE="{}.isoformat()",
+    DATETIME="{}.isoformat()",
+    TIME="{}.isoformat()",
+    TIMESTAMP="_timestamp({})",
+    RECORD="{}.to_dict()",
+)
+
+NAMESPACE = {
+    "_bool": _bool,
+    "_numeric": _numeric,
+    "_b64decode": _b64decode,
+    "_date": _date,
+    "_time": _time,
+    "_datetime": _datetime,
+    "_parse_timestamp": _parse_timestamp,
+    "_bytes": _bytes,
+    "_timestamp": _timestamp,
+}
+
+
+RESERVED = frozenset(keyword.kwlist) | frozenset(["self", "from_dict", "to_dict"])
+
+
+def attribute_name(column: str, taken: Iterable[str] = ()) -> str:
+    """Function to define the attribute name of the column.
+
+    Args:
+
+      column: Column name.
+
+      taken: Attribute names of the other columns of the RECORD.
+
+    Returns:
+
+      Column name, with "_" suffix if it is Python keyword or reserved name, e.g. self, to_dict,
+      with "field" prefix if it starts with "__", the suffix is extended until the name is not taken.
+
+    Raises:
+
+      ValueError: Error occured if the column name is not valid identifier.
+    """
+    if not column.isidentifier():
+        raise ValueError(f"Column name '{column}' is not valid identifier")
+    # the names starting with "__" are mangled in the class body, or clash with the special methods
+    attribute = f"field{column}" if column.startswith("__") else column
+    if attribute in RESERVED:
+        attribute += "_"
+    while attribute in taken:
+        attribute += "_"
+    return attribute
+
+
+def generate_source(gbq_schema: list, name: str = "Row") -> str:
+    """Function to generate Python source of the row classes.
+
+    Args:
+
+      gbq_schema: BigQuery schema, JSON representation.
+
+      name: Root class name, nested classes are named by the RECORD path, e.g. Row_address,
+          a number suffix is added if the name is taken, e.g. Row_address_2.
+
+    Returns:
+
+      Python source defining the classes.
+    """
+    classes = []
+    names = set()
+
+    def _class(gbq_schema: list, name: str) -> str:
+        # RECORD "a" with the field "b_c" and RECORD "a_b" with the field "c" share the path name
+        unique, suffix = name, 1
+        while unique in names:
+            suffix += 1
+            unique = f"{name}_{suffix}"
+        name = unique
+        names.add(name)
+        attributes = []
+        for element in gbq_schema:
+            attributes.append(attribute_name(element['name'], attributes))
+        parse = ["    @classmethod",
+                 "    def from_dict(cls, row):",
+                 "        self = cls.__new__(cls)"]
+        serialize = ["    def to_dict(self):",
+                     "        output = {}"]
+        for element, attribute in zip(gbq_schema, attributes):
+            key = repr(element['name'])
+            mode = element.get('mode') or "NULLABLE"
+            if element['type'] == "RECORD":
+                record = _class(element['fields'], f"{name}_{element['name']}")
+                parser = map_parsers.RECORD.format(record) + "({})"
+            else:
+                parser = getattr(map_parsers, element['type'])
+            formatter = getattr(map_formatters, element['type'])
+
+            if mode == "REPEATED":
+                parse.append(f"        value = row.get({key})")
+                parse.append(f"        self.{attribute} = [] if value is None"
+                             f" else [{parser.format('item')} for item in value]")
+                serialize.append(f"        output[{key}] = [{formatter.format('item')}"
+                                 f" for item in self.{attribute} or ()]")
+            elif mode == "REQUIRED":
+                parse.append(f"        self.{attribute} = {parser.format(f'row[{key}]')}")
+                serialize.append(f"        output[{key}] = {formatter.format(f'self.{attribute}')}")
+            else:
+                parse.append(f"        value = row.get({key})")
+                parse.append(f"        self.{attribute} = None if value is None else {parser.format('value')}")
+                serialize.append(f"        value = self.{attribute}")
+                serialize.append("        if value is not None:")
+                serialize.append(f"            output[{key}] = {formatter.format('value')}")
+        parse.append("        return self")
+        serialize.append("        return output")
+
+        slots = "".join(f"{attribute!r}, " for attribute in attributes)
+        arguments = "".join(f", {attribute}=None" for attribute in attributes)
+        lines = [f"class {name}:",
+                 f"    __slots__ = ({slots})",
+                 "",
+                 f"    def __init__(self{arguments}):"]
+        for element, attribute in zip(gbq_schema, attributes):
+            if element.get('mode') == "REPEATED":
+                lines.append(f"        self.{attribute} = [] if {attribute} is None else {attribute}")
+            else:
+                lines.append(f"        self.{attribute} = {attribute}")
+        if not attributes:
+            lines.append("        pass")
+        lines.append("")
+        lines.extend(parse)
+        lines.append("")
+        lines.extend(serialize)
+        lines.extend(["",
+                      "    def __eq__(self, other):",
+                      "        if other.__class__ is not self.__class__:",
+                      "            return NotImplemented",
+                      f"        return all(getattr(self, attribute) == getattr(other, attribute)"
+                      f" for attribute in self.__slots__)",
+                      "",
+                      "    def __repr__(self):",
+                      f"        return '{name}(' + ', '.join(f'{{attribute}}={{getattr(self, attribute)!r}}'"
+                      f" for attribute in self.__slots__) + ')'"])
+        classes.append("\n".join(lines))
+        return name
+
+    _class(gbq_schema, name)
+    return "\n\n\n".join(classes) + "\n"
+
+
+ROW_CLASSES_CACHE_SIZE = 1024
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def compile_row_class(gbq_schema: Union[list, List[SchemaField]], name: str = "Row") -> type:
+    """Function to compile row classes for Google BigQuery schema.
+
+    Compiled classes are cached by the schema hash,
+    up to ROW_CLASSES_CACHE_SIZE classes are kept.
+
+    Args:
+
+      gbq_schema: BigQuery schema, JSON or SDK representation.
+
+      name: Root class name.
+
+    Returns:
+
+      Root row class with from_dict and to_dict methods, its source is stored in __source__.
+
+    Raises:
+
+      AttributeError: Error occured if the schema contains unknown type.
+
+      ValueError: Error occured if a column name is not valid identifier.
+    """
+    gbq_schema = as_json_representation(gbq_schema)
+    key = (name, fingerprint(gbq_schema))
+    row_class = _cache.get(key)
+    if row_class is None:
+        source = generate_source(gbq_schema, name)
+        namespace = dict(NAMESPACE)
+        exec(compile(source, f"<row_class {name}>", "exec"), namespace)
+        row_class = namespace[name]
+        row_class.__source__ = source
+        with _cache_lock:
+            if len(_cache) >= ROW_CLASSES_CACHE_SIZE:
+                _ = _cache.pop(next(iter(_cache)), None)
+            row_class = _cache.setdefault(key, row_class)
+    return row_class
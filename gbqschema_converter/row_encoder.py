@@ -0,0 +1,185 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: To encode Python rows into insertAll-compatible JSON using Google BigQuery table schema.
+
+Python source of the encoder function is generated per schema, the same way fastjsonschema
+generates validators, hence the schema is inspected once rather than on every row.
+References:
+- https://cloud.google.com/bigquery/docs/reference/rest/v2/tabledata/insertAll
+"""
+import base64
+import datetime
+import threading
+from typing import Iterable, List, Union
+from google.cloud.bigquery import SchemaField
+from gbqschema_converter.gbqschema_to_jsonschema import MapTypes
+from gbqschema_converter._schema import as_json_representation, fingerprint
+
+
+def _bytes(value: Union[bytes, str]) -> str:
+    return base64.b64encode(value).decode("ascii") if isinstance(value, (bytes, bytearray)) else value
+
+
+def _isoformat(value: Union[datetime.date, datetime.time, str]) -> str:
+    return value if isinstance(value, str) else value.isoformat()
+
+
+def _timestamp(value: Union[datetime.datetime, float, str]) -> Union[float, str]:
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return value.isoformat() + "Z"
+    return value
+
+
+map_encoders = MapTypes(
+    INT="int({})",
+    INTEGER="int({})",
+    INT64="int({})",
+    FLOAT="float({})",
+    FLOAT64="float({})",
+    NUMERIC="str({})",
+    BOOL="bool({})",
+    BOOLEAN="bool({})",
+    STRING="{}",
+    BYTES="_bytes({})",
+    DATE="_isoformat({})",
+    DATETIME="_isoformat({})",
+    TIME="_isoformat({})",
+    TIMESTAMP="_timestamp({})",
+    RECORD="{}",
+)
+
+NAMESPACE = {
+    "_bytes": _bytes,
+    "_isoformat": _isoformat,
+    "_timestamp": _timestamp,
+}
+
+
+def generate_source(gbq_schema: list) -> str:
+    """Function to generate Python source of the row encoder.
+
+    Args:
+
+      gbq_schema: BigQuery schema, JSON representation.
+
+    Returns:
+
+      Python source defining the function "encode".
+    """
+    functions = []
+
+    def _function(gbq_schema: list) -> str:
+        index = len(functions)
+        name = f"encode_{index}"
+        functions.append(None)
+        lines = [f"def {name}(row):",
+                 "    output = {}"]
+        for element in gbq_schema:
+            key = repr(element['name'])
+            mode = element.get('mode') or "NULLABLE"
+            if element['type'] == "RECORD":
+                expression = _function(element['fields']) + "({})"
+            else:
+                expression = getattr(map_encoders, element['type'])
+
+            if mode == "REPEATED":
+                value = f"[{expression.format('item')} for item in value]"
+            else:
+                value = expression.format("value")
+
+            if mode == "REQUIRED":
+                lines.append(f"    value = row[{key}]")
+                lines.append(f"    output[{key}] = {value}")
+            else:
+                lines.append(f"    value = row.get({key})")
+                lines.append("    if value is not None:")
+                lines.append(f"        output[{key}] = {value}")
+        lines.append("    return output")
+        functions[index] = "\n".join(lines)
+        return name
+
+    functions_root = _function(gbq_schema)
+    return "\n\n\n".join(functions) + f"\n\n\nencode = {functions_root}\n"
+
+
+class RowEncoder:
+    """Compiled row encoder.
+
+    Args:
+
+      source: Python source generated by generate_source.
+    """
+    def __init__(self, source: str):
+        namespace = dict(NAMESPACE)
+        exec(compile(source, "<row_encoder>", "exec"), namespace)
+        self.source = source
+        self.encode = namespace['encode']
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (self.source,)
+
+    def __call__(self, row: dict) -> dict:
+        """Function to encode the row.
+
+        Args:
+
+          row: Row as dict with Python values (datetime, date, Decimal, bytes, nested dicts).
+
+        Returns:
+
+          JSON-serializable row.
+        """
+        return self.encode(row)
+
+    def batch(self, rows: Iterable[dict]) -> List[dict]:
+        """Function to encode the rows.
+
+        Args:
+
+          rows: Rows as dicts with Python values.
+
+        Returns:
+
+          List of JSON-serializable rows.
+        """
+        return list(map(self.encode, rows))
+
+
+ENCODERS_CACHE_SIZE = 1024
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def compile_row_encoder(gbq_schema: Union[list, List[SchemaField]]) -> RowEncoder:
+    """Function to compile row encoder for Google BigQuery schema.
+
+    Compiled encoders are cached by the schema hash,
+    up to ENCODERS_CACHE_SIZE encoders are kept.
+
+    Args:
+
+      gbq_schema: BigQuery schema, JSON or SDK representation.
+
+    Returns:
+
+      RowEncoder object.
+
+    Raises:
+
+      AttributeError: Error occured if the schema contains unknown type.
+    """
+    gbq_schema = as_json_representation(gbq_schema)
+    key = fingerprint(gbq_schema)
+    encoder = _cache.get(key)
+    if encoder is None:
+        encoder = RowEncoder(generate_source(gbq_schema))
+        with _cache_lock:
+            if len(_cache) >= ENCODERS_CACHE_SIZE:
+                _ = _cache.pop(next(iter(_cache)), None)
+            encoder = _cache.setdefault(key, encoder)
+    return encoder
@@ -0,0 +1,76 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: JSON (de)serialization backend.
+
+The fastest available library is picked at import time:
+orjson, then ujson, then the standard library json module.
+"""
+from typing import Any, Union
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+if orjson is not None:
+    BACKEND = "orjson"
+elif ujson is not None:
+    BACKEND = "ujson"
+else:
+    BACKEND = "json"
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Function to deserialize JSON document.
+
+    Args:
+
+      data: JSON document as str or bytes.
+
+    Returns:
+
+      Python object.
+
+    Raises:
+
+      ValueError: Error occured if the document is not valid JSON.
+    """
+    if BACKEND == "orjson":
+        return orjson.loads(data)
+    if BACKEND == "ujson":
+        return ujson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, compact: bool = False) -> bytes:
+    """Function to serialize object to JSON.
+
+    Args:
+
+      obj: Python object.
+
+      compact: Output without indentation and whitespaces.
+
+    Returns:
+
+      UTF-8 encoded JSON document.
+    """
+    if BACKEND == "orjson":
+        return orjson.dumps(obj) if compact\
+            else orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    if BACKEND == "ujson":
+        return ujson.dumps(obj, indent=0 if compact else 2,
+                           ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj,
+                      indent=None if compact else 2,
+                      separators=(',', ':') if compact else None,
+                      ensure_ascii=False).encode("utf-8")
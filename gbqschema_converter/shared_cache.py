@@ -0,0 +1,204 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: Cache of the serialized conversion results shared by the processes of the host.
+
+The cache is a memory mapped file, /dev/shm by default, so every process opening the same path,
+e.g. every gunicorn worker, hits the values stored by the others.
+The file is a set-associative table of fixed size slots, a key maps to a set of ways slots,
+the least recently used slot of the set is evicted. The file space is reserved when the file is created,
+so the writes to a full tmpfs fail in the constructor instead of killing the process with SIGBUS.
+
+Writers are serialized with a file lock, readers take no locks: every slot is guarded
+by a sequence counter which is odd while the slot is written (seqlock), the reader retries
+if the counter changed while it copied the value, and the value checksum is verified.
+References:
+- https://en.wikipedia.org/wiki/Seqlock
+"""
+import os
+import mmap
+import errno
+import time
+import fcntl
+import struct
+import hashlib
+import tempfile
+import threading
+from typing import Optional
+
+
+MAGIC = b"GBQCACHE"
+VERSION = 1
+
+HEADER = struct.Struct("<8sIIII")
+SLOT = struct.Struct("<Q16sI8sQ")
+SEQ = struct.Struct("<Q")
+LAST_USED = struct.Struct("<Q")
+LAST_USED_OFFSET = SLOT.size - LAST_USED.size
+
+HEADER_SIZE = 64
+SLOT_HEADER_SIZE = 64
+READ_RETRIES = 3
+
+
+def _default_path() -> str:
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"gbqschema_converter-{os.getuid() if hasattr(os, 'getuid') else 0}.cache")
+
+
+def _checksum(value: bytes) -> bytes:
+    return hashlib.blake2b(value, digest_size=8).digest()
+
+
+class SharedCache:
+    """Key-value cache in a memory mapped file shared by processes.
+
+    The file is created with the owner only permissions, all processes must open it
+    with the same slots, ways and slot_size.
+
+    Args:
+
+      path: Cache file path, in /dev/shm by default.
+
+      slots: Number of slots, i.e. max number of cached values.
+
+      ways: Number of slots per set, LRU eviction is done within the set.
+
+      slot_size: Max value size in bytes, larger values are not cached.
+
+    Raises:
+
+      ValueError: Error occured if the existing file has other layout.
+
+      OSError: Error occured if there is not enough space for the file,
+             about 36 MiB with the default layout.
+    """
+    def __init__(self,
+                 path: Optional[str] = None,
+                 slots: int = 1024,
+                 ways: int = 8,
+                 slot_size: int = 32 * 1024):
+        if slots < ways or slots % ways:
+            raise ValueError("Number of slots must be multiple of ways")
+        self.path = path or _default_path()
+        self.slots = slots
+        self.ways = ways
+        self.slot_size = slot_size
+        self._sets = slots // ways
+        self._stride = -(-(SLOT_HEADER_SIZE + slot_size) // mmap.PAGESIZE) * mmap.PAGESIZE
+        self._lock = threading.Lock()
+
+        size = HEADER_SIZE + slots * self._stride
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                header = HEADER.pack(MAGIC, VERSION, slots, ways, slot_size)
+                if os.fstat(self._fd).st_size == 0:
+                    self._allocate(size)
+                    os.pwrite(self._fd, header, 0)
+                elif os.pread(self._fd, HEADER.size, 0) != header or os.fstat(self._fd).st_size != size:
+                    raise ValueError(f"Cache file {self.path} has other layout")
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._mm = mmap.mmap(self._fd, size)
+        except Exception:
+            os.close(self._fd)
+            raise
+
+    def _allocate(self, size: int) -> None:
+        # writing a page of a sparse file to full tmpfs raises SIGBUS, so the space is reserved upfront
+        try:
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(self._fd, 0, size)
+            else:
+                stat = os.fstatvfs(self._fd)
+                if stat.f_bavail * stat.f_frsize < size:
+                    raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+                os.ftruncate(self._fd, size)
+        except OSError as ex:
+            os.ftruncate(self._fd, 0)
+            raise OSError(ex.errno, f"Not enough space for the cache file {self.path} of {size} bytes, "
+                                    f"reduce slots or slot_size") from ex
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (self.path, self.slots, self.ways, self.slot_size)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(path='{self.path}', slots={self.slots}, "\
+            f"ways={self.ways}, slot_size={self.slot_size})"
+
+    def _offsets(self, key: bytes) -> range:
+        first = HEADER_SIZE + int.from_bytes(key[:8], "little") % self._sets * self.ways * self._stride
+        return range(first, first + self.ways * self._stride, self._stride)
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        """Function to read the value without locking.
+
+        Args:
+
+          key: 16 bytes key.
+
+        Returns:
+
+          Value, None if not cached.
+        """
+        mm = self._mm
+        for offset in self._offsets(key):
+            for _ in range(READ_RETRIES):
+                seq, slot_key, length, checksum, _ = SLOT.unpack_from(mm, offset)
+                if seq & 1:
+                    continue
+                if slot_key != key:
+                    break
+                start = offset + SLOT_HEADER_SIZE
+                value = mm[start:start + min(length, self.slot_size)]
+                if SEQ.unpack_from(mm, offset)[0] != seq or _checksum(value) != checksum:
+                    continue
+                LAST_USED.pack_into(mm, offset + LAST_USED_OFFSET, time.monotonic_ns())
+                return value
+        return None
+
+    def set(self, key: bytes, value: bytes) -> bool:
+        """Function to write the value, the least recently used value of the set is evicted.
+
+        Args:
+
+          key: 16 bytes key.
+
+          value: Value.
+
+        Returns:
+
+          True if cached, False if the value is larger than slot_size.
+        """
+        if len(value) > self.slot_size:
+            return False
+        mm = self._mm
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                victim, victim_used = None, None
+                for offset in self._offsets(key):
+                    _, slot_key, _, _, last_used = SLOT.unpack_from(mm, offset)
+                    if slot_key == key:
+                        victim = offset
+                        break
+                    if victim is None or last_used < victim_used:
+                        victim, victim_used = offset, last_used
+
+                seq = (SEQ.unpack_from(mm, victim)[0] + 1) | 1
+                SEQ.pack_into(mm, victim, seq)
+                start = victim + SLOT_HEADER_SIZE
+                mm[start:start + len(value)] = value
+                SLOT.pack_into(mm, victim, seq, key, len(value), _checksum(value), time.monotonic_ns())
+                SEQ.pack_into(mm, victim, seq + 1)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return True
+
+    def close(self) -> None:
+        """Function to unmap the file, the file is kept for other processes."""
+        self._mm.close()
+        os.close(self._fd)
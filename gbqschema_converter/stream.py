@@ -0,0 +1,298 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: Incremental conversion of large schema files.
+
+The input file is memory-mapped and scanned for the boundaries of top-level columns,
+every column is parsed, converted and written out before the next one is read,
+hence the peak memory is bounded by the largest single column subtree.
+"""
+import re
+import mmap
+from contextlib import contextmanager
+from typing import Iterator, Tuple, BinaryIO, Union
+import fastjsonschema
+from gbqschema_converter import compression, serializer
+from gbqschema_converter.gbqschema_to_jsonschema import _json_converter
+from gbqschema_converter.jsonschema_to_gbqschema import _converter
+
+
+Buffer = Union[bytes, mmap.mmap]
+
+WHITESPACE = re.compile(rb'[ \t\n\r]*')
+STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+SCALAR = re.compile(rb'[^,\]}\s]+')
+TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|([\[{])|([\]}])', re.S)
+
+
+def _skip(buf: Buffer, pos: int) -> int:
+    """Function to skip whitespaces."""
+    return WHITESPACE.match(buf, pos).end()
+
+
+def _expect(buf: Buffer, pos: int, char: bytes) -> int:
+    """Function to check the character at the position.
+
+    Raises:
+
+      ValueError: Error occured if the character is not found.
+    """
+    pos = _skip(buf, pos)
+    if buf[pos:pos + 1] != char:
+        raise ValueError(f"Expecting '{char.decode()}' at position {pos}")
+    return pos + 1
+
+
+def _value_end(buf: Buffer, pos: int) -> int:
+    """Function to find the end of JSON value starting at the position.
+
+    Args:
+
+      buf: JSON document.
+
+      pos: Value start position.
+
+    Returns:
+
+      Position following the value.
+
+    Raises:
+
+      ValueError: Error occured if the value is malformed.
+    """
+    char = buf[pos:pos + 1]
+    if char in (b'{', b'['):
+        depth = 0
+        for token in TOKEN.finditer(buf, pos):
+            if token.lastindex == 1:
+                depth += 1
+            elif token.lastindex == 2:
+                depth -= 1
+                if not depth:
+                    return token.end()
+        raise ValueError(f"Unterminated value at position {pos}")
+    match = STRING.match(buf, pos) if char == b'"' else SCALAR.match(buf, pos)
+    if match is None:
+        raise ValueError(f"Expecting value at position {pos}")
+    return match.end()
+
+
+def iter_array(buf: Buffer, pos: int = 0) -> Iterator[Tuple[int, int]]:
+    """Generator of JSON array elements boundaries.
+
+    Args:
+
+      buf: JSON document.
+
+      pos: Array start position.
+
+    Returns:
+
+      Iterator of (start, end) positions of the elements.
+    """
+    pos = _expect(buf, pos, b'[')
+    pos = _skip(buf, pos)
+    if buf[pos:pos + 1] == b']':
+        return
+    while True:
+        start = _skip(buf, pos)
+        end = _value_end(buf, start)
+        yield start, end
+        pos = _skip(buf, end)
+        char = buf[pos:pos + 1]
+        if char == b']':
+            return
+        if char != b',':
+            raise ValueError(f"Expecting ',' delimiter at position {pos}")
+        pos += 1
+
+
+def iter_object(buf: Buffer, pos: int = 0) -> Iterator[Tuple[str, int, int]]:
+    """Generator of JSON object members boundaries.
+
+    Args:
+
+      buf: JSON document.
+
+      pos: Object start position.
+
+    Returns:
+
+      Iterator of (key, start, end), where start and end are the positions of the value.
+    """
+    pos = _expect(buf, pos, b'{')
+    pos = _skip(buf, pos)
+    if buf[pos:pos + 1] == b'}':
+        return
+    while True:
+        pos = _skip(buf, pos)
+        match = STRING.match(buf, pos)
+        if match is None:
+            raise ValueError(f"Expecting property name at position {pos}")
+        key = serializer.loads(buf[match.start():match.end()])
+        start = _skip(buf, _expect(buf, match.end(), b':'))
+        end = _value_end(buf, start)
+        yield key, start, end
+        pos = _skip(buf, end)
+        char = buf[pos:pos + 1]
+        if char == b'}':
+            return
+        if char != b',':
+            raise ValueError(f"Expecting ',' delimiter at position {pos}")
+        pos += 1
+
+
+@contextmanager
+def open_mmap(path: str) -> Iterator[Buffer]:
+    """Context manager to memory-map the file read-only.
+
+    Compressed file cannot be mapped, it is decompressed into memory.
+
+    Args:
+
+      path: File path.
+
+    Returns:
+
+      Memory-mapped file content.
+    """
+    if compression.detect_file(path) is not None:
+        with compression.open_file(path) as f:
+            yield f.read()
+        return
+
+    with open(path, 'rb') as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file cannot be mapped
+            yield b''
+            return
+        try:
+            if hasattr(buf, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                buf.madvise(mmap.MADV_SEQUENTIAL)
+            yield buf
+        finally:
+            buf.close()
+
+
+def iter_gbqschema(buf: Buffer) -> Iterator[dict]:
+    """Generator of BigQuery schema columns.
+
+    Args:
+
+      buf: BigQuery schema, JSON representation.
+
+    Returns:
+
+      Iterator of column definitions.
+    """
+    for start, end in iter_array(buf, _skip(buf, 0)):
+        yield serializer.loads(buf[start:end])
+
+
+def iter_jsonschema(buf: Buffer) -> Iterator[Tuple[str, dict, bool]]:
+    """Generator of Json schema top-level properties.
+
+    Properties are read from every object in "definitions",
+    or from the root object if "definitions" is missing.
+
+    Args:
+
+      buf: Json schema.
+
+    Returns:
+
+      Iterator of (property name, property definition, property is required).
+    """
+    def _properties(pos: int) -> Iterator[Tuple[str, dict, bool]]:
+        members = {key: start for key, start, _ in iter_object(buf, pos)}
+        required = set()
+        if 'required' in members:
+            start = members['required']
+            required = set(serializer.loads(buf[start:_value_end(buf, start)]))
+        for key, start, end in iter_object(buf, members['properties']):
+            yield key, serializer.loads(buf[start:end]), key in required
+
+    root = {key: start for key, start, _ in iter_object(buf, _skip(buf, 0))}
+    if 'definitions' in root:
+        for _, start, _ in iter_object(buf, root['definitions']):
+            yield from _properties(start)
+    else:
+        yield from _properties(_skip(buf, 0))
+
+
+def gbqschema_to_jsonschema(path: str,
+                            fout: BinaryIO,
+                            additional_properties: bool = False,
+                            compact: bool = False) -> None:
+    """Function to convert Google BigQuery schema file to json schema column by column.
+
+    Args:
+
+      path: BigQuery schema file path, JSON representation.
+
+      fout: Binary output stream.
+
+      additional_properties: Json schema should contain "additionalProperties".
+
+      compact: Output without indentation.
+
+    Raises:
+
+      ValueError: Error occured if input file is not valid JSON.
+
+      fastjsonschema.JsonSchemaException: Error occured if input Google BigQuery schema is invalid.
+    """
+    sep = b'' if compact else b'\n'
+    required = []
+    with open_mmap(path) as buf:
+        fout.write(b'{"$schema":"http://json-schema.org/draft-07/schema#",'
+                   b'"type":"array","items":{"$ref":"#/definitions/element"},'
+                   b'"definitions":{"element":{"type":"object","properties":{' + sep)
+        for i, element in enumerate(iter_gbqschema(buf)):
+            definition = _json_converter([element])
+            (key, value), = definition['properties'].items()
+            required.extend(definition.get('required', []))
+            fout.write((b',' + sep if i else b'') + serializer.dumps(key) + b':'
+                       + serializer.dumps(value, compact=compact))
+    fout.write(sep + b'},"additionalProperties":'
+               + serializer.dumps(additional_properties))
+    if required:
+        fout.write(b',"required":' + serializer.dumps(required, compact=True))
+    fout.write(b'}}}' + sep)
+
+
+def jsonschema_to_gbqschema(path: str,
+                            fout: BinaryIO,
+                            compact: bool = False) -> None:
+    """Function to convert json schema file to Google BigQuery schema column by column.
+
+    Args:
+
+      path: Json schema file path.
+
+      fout: Binary output stream.
+
+      compact: Output without indentation.
+
+    Raises:
+
+      ValueError: Error occured if input file is not valid JSON.
+
+      fastjsonschema.JsonSchemaDefinitionException: Error occured if input json schema is invalid.
+    """
+    sep = b'' if compact else b'\n'
+    with open_mmap(path) as buf:
+        fout.write(b'[' + sep)
+        for i, (key, value, required) in enumerate(iter_jsonschema(buf)):
+            try:
+                fastjsonschema.compile(value)
+            except fastjsonschema.JsonSchemaDefinitionException as ex:
+                raise ex
+            column, = _converter({"properties": {key: value},
+                                  "required": [key] if required else []})
+            fout.write((b',' + sep if i else b'')
+                       + serializer.dumps(column, compact=compact))
+    fout.write(sep + b']' + sep)
@@ -0,0 +1,223 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: To validate input schemas collecting all errors in a single pass.
+
+Every error is reported with JSON pointer to the invalid node.
+The compiled validators run first at every schema level,
+the detailed checks run only for the levels which failed, so valid inputs cost
+no more than the validation performed by the converters.
+References:
+- https://tools.ietf.org/html/rfc6901
+"""
+import re
+from collections import namedtuple
+from typing import List
+import fastjsonschema
+from gbqschema_converter import gbqschema_to_jsonschema, jsonschema_to_gbqschema
+
+
+ValidationError = namedtuple("ValidationError", ['path', 'message'])
+ValidationError.__doc__ = """Validation error.
+
+Attributes:
+
+  path: JSON pointer to the invalid node.
+
+  message: Error description.
+"""
+
+
+class Report(namedtuple("Report", ['errors'])):
+    """Validation report.
+
+    Attributes:
+
+      errors: List of ValidationError.
+    """
+    __slots__ = ()
+
+    @property
+    def valid(self) -> bool:
+        """Input schema is valid."""
+        return not self.errors
+
+
+def _pointer(parent: str, key: object) -> str:
+    """Function to append the key to JSON pointer."""
+    return f"{parent}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+
+GBQ_ELEMENT = gbqschema_to_jsonschema.gbq_schema['items']
+GBQ_TYPES = GBQ_ELEMENT['properties']['type']['enum']
+GBQ_MODES = GBQ_ELEMENT['properties']['mode']['oneOf'][0]['enum']
+
+JSON_TYPES = list(jsonschema_to_gbqschema.map_types._fields)
+
+
+def _check_gbq_element(element: object, path: str, errors: List[ValidationError]) -> None:
+    """Function to collect the errors of BigQuery schema column definition."""
+    if not isinstance(element, dict):
+        errors.append(ValidationError(path, "must be object"))
+        return
+
+    for key in GBQ_ELEMENT['required']:
+        if key not in element:
+            errors.append(ValidationError(path, f"must contain '{key}' property"))
+
+    if 'name' in element and not isinstance(element['name'], str):
+        errors.append(ValidationError(_pointer(path, 'name'), "must be string"))
+
+    if 'type' in element and element['type'] not in GBQ_TYPES:
+        errors.append(ValidationError(_pointer(path, 'type'),
+                                      f"must be one of {GBQ_TYPES}"))
+
+    if element.get('mode') is not None and element['mode'] not in GBQ_MODES:
+        errors.append(ValidationError(_pointer(path, 'mode'),
+                                      f"must be one of {GBQ_MODES} or null"))
+
+    if element.get('description') is not None and not isinstance(element['description'], str):
+        errors.append(ValidationError(_pointer(path, 'description'), "must be string or null"))
+
+
+def _check_gbq_level(gbq_schema: object, path: str, errors: List[ValidationError]) -> None:
+    """Function to collect the errors of BigQuery schema level."""
+    try:
+        gbqschema_to_jsonschema.validate_json(gbq_schema)
+    except fastjsonschema.JsonSchemaException:
+        if not isinstance(gbq_schema, list):
+            errors.append(ValidationError(path, "must be array"))
+            return
+        for i, element in enumerate(gbq_schema):
+            _check_gbq_element(element, _pointer(path, i), errors)
+
+    names = set()
+    for i, element in enumerate(gbq_schema):
+        if not isinstance(element, dict):
+            continue
+        name = element.get('name')
+        if isinstance(name, str):
+            if name.lower() in names:
+                errors.append(ValidationError(_pointer(_pointer(path, i), 'name'),
+                                              f"duplicated column name '{name}'"))
+            names.add(name.lower())
+        if element.get('type') == "RECORD":
+            if 'fields' not in element:
+                errors.append(ValidationError(_pointer(path, i), "RECORD must contain 'fields' property"))
+            else:
+                _check_gbq_level(element['fields'], _pointer(_pointer(path, i), 'fields'), errors)
+
+
+def check_gbqschema(gbq_schema: list) -> Report:
+    """Function to validate Google BigQuery schema in JSON representation.
+
+    Args:
+
+      gbq_schema: BigQuery schema, JSON representation.
+
+    Returns:
+
+      Report with all errors found.
+    """
+    errors = []
+    _check_gbq_level(gbq_schema, "", errors)
+    return Report(errors)
+
+
+def _check_json_properties(definition: dict, path: str, errors: List[ValidationError]) -> None:
+    """Function to collect the conversion errors of json schema object definition."""
+    properties = definition.get('properties')
+    if not isinstance(properties, dict):
+        errors.append(ValidationError(path, "must contain 'properties' object"))
+        return
+
+    required = definition.get('required', [])
+    if not isinstance(required, list):
+        errors.append(ValidationError(_pointer(path, 'required'), "must be array"))
+
+    path = _pointer(path, 'properties')
+    for key, value in properties.items():
+        _check_json_property(value, _pointer(path, key), errors)
+
+
+def _check_json_property(definition: object,
+                         path: str,
+                         errors: List[ValidationError],
+                         repeated: bool = False) -> None:
+    """Function to collect the conversion errors of json schema property definition."""
+    if not isinstance(definition, dict):
+        errors.append(ValidationError(path, "must be object"))
+        return
+
+    field_type = definition.get('type')
+    if isinstance(field_type, list):
+        types = [t for t in field_type if t != "null"]
+        if len(types) != 1:
+            errors.append(ValidationError(_pointer(path, 'type'), "must contain single not null type"))
+            return
+        field_type = types[0]
+    elif field_type is None:
+        for keyword in ('oneOf', 'anyOf'):
+            branches = definition.get(keyword)
+            if not branches:
+                continue
+            not_null = [i for i, branch in enumerate(branches)
+                        if not isinstance(branch, dict) or branch.get('type') != "null"]
+            if len(not_null) != 1 or len(branches) == 1:
+                errors.append(ValidationError(_pointer(path, keyword),
+                                              "must contain single not null branch and null branch"))
+                return
+            _check_json_property(branches[not_null[0]], _pointer(_pointer(path, keyword), not_null[0]),
+                                 errors, repeated)
+            return
+
+    if field_type == "array" and not repeated:
+        _check_json_property(definition.get('items'), _pointer(path, 'items'), errors, True)
+        return
+
+    if 'format' in definition:
+        return
+    if field_type is None:
+        errors.append(ValidationError(path, "must contain 'type' property"))
+    elif field_type not in JSON_TYPES:
+        errors.append(ValidationError(_pointer(path, 'type'), f"must be one of {JSON_TYPES}"))
+    elif field_type == "object":
+        _check_json_properties(definition, path, errors)
+
+
+def check_jsonschema(json_schema: dict) -> Report:
+    """Function to validate json schema for conversion to Google BigQuery schema.
+
+    Args:
+
+      json_schema: Json schema.
+
+    Returns:
+
+      Report with all errors found.
+    """
+    if not isinstance(json_schema, dict):
+        return Report([ValidationError("", "must be object")])
+
+    errors = []
+    try:
+        jsonschema_to_gbqschema.compile_validator(json_schema)
+    except (fastjsonschema.JsonSchemaDefinitionException, re.error) as ex:
+        # reported along with the conversion errors, so all of them are fixed in one go
+        errors.append(ValidationError("", f"invalid json schema: {ex}"))
+
+    if 'definitions' in json_schema:
+        if not isinstance(json_schema['definitions'], dict):
+            errors.append(ValidationError("/definitions", "must be object"))
+            return Report(errors)
+        for key, definition in json_schema['definitions'].items():
+            path = _pointer(_pointer("", 'definitions'), key)
+            if isinstance(definition, dict):
+                _check_json_properties(definition, path, errors)
+            else:
+                errors.append(ValidationError(path, "must be object"))
+    else:
+        _check_json_properties(json_schema, "", errors)
+
+    return Report(errors)
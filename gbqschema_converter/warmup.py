@@ -0,0 +1,52 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: To build the compiled state in the parent process of a worker pool.
+
+Call preload() before the workers are forked: the modules are imported,
+validators and row encoders are compiled once, and the objects are moved
+to the permanent GC generation, so the children share them copy-on-write.
+Compiled validators, row encoders and Converter objects are picklable.
+Spawn-based pools pass the compiled validators to preload() as the pool initializer
+arguments: the children cache the generated source instead of recompiling the json schemas.
+"""
+import gc
+from typing import Iterable, List, Optional, Union
+from google.cloud.bigquery import SchemaField
+# the import compiles BigQuery schema validator
+from gbqschema_converter import gbqschema_to_jsonschema  # noqa: F401
+from gbqschema_converter.jsonschema_to_gbqschema import compile_validator, register_validator
+from gbqschema_converter._schema import CompiledValidator
+from gbqschema_converter.row_encoder import compile_row_encoder
+
+
+def preload(schemas: Optional[Iterable[Union[dict, list, List[SchemaField], CompiledValidator]]] = None,
+            freeze: bool = True) -> None:
+    """Function to build compiled state for the schemas.
+
+    Args:
+
+      schemas: Json schemas, their validators are compiled, and/or
+             Google BigQuery schemas in JSON or SDK representation, their row encoders are compiled, and/or
+             CompiledValidator objects returned by compile_validator, they are cached as is.
+
+      freeze: Move all objects to the permanent GC generation to avoid copy-on-write in forked children.
+
+    Raises:
+
+      fastjsonschema.JsonSchemaDefinitionException: Error occured if input json schema is invalid.
+
+      ValueError: Error occured if the validator has no json schema fingerprint.
+    """
+    for schema in schemas or ():
+        if isinstance(schema, CompiledValidator):
+            register_validator(schema)
+        elif isinstance(schema, dict):
+            compile_validator(schema)
+        else:
+            compile_row_encoder(schema)
+
+    if freeze and hasattr(gc, 'freeze'):
+        gc.collect()
+        gc.freeze()
@@ -0,0 +1,259 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+r"""
+Objective: To reconvert schema files as they change.
+
+Directories are monitored with inotify on Linux, the files are polled elsewhere.
+Bursts of events are debounced, a file is passed on only if its content hash changed,
+hence the callback runs in the same warm process with its compiled validators.
+References:
+- https://man7.org/linux/man-pages/man7/inotify.7.html
+"""
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+import fnmatch
+import hashlib
+import select
+import struct
+import threading
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple, Union
+from gbqschema_converter import compression
+
+
+PATTERN = ("*.json",) + tuple(f"*.json{extension}" for extension in compression.EXTENSIONS)
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+EVENT = struct.Struct("iIII")
+
+
+class _Targets:
+    """Watched files.
+
+    Files are watched through their parent directories, so the files replaced by editors
+    on save are still tracked.
+
+    Args:
+
+      paths: Paths of files, or directories with files matching the pattern.
+
+      pattern: Glob pattern(s) of the files in the watched directories.
+    """
+    def __init__(self, paths: Iterable[str], pattern: Union[str, Tuple[str, ...]] = PATTERN):
+        self.pattern = (pattern,) if isinstance(pattern, str) else tuple(pattern)
+        self.directories = {}
+        for path in paths:
+            path = os.path.abspath(path)
+            if os.path.isdir(path):
+                self.directories[path] = None
+            else:
+                names = self.directories.setdefault(os.path.dirname(path), set())
+                if names is not None:
+                    names.add(os.path.basename(path))
+
+    def match(self, path: str) -> bool:
+        """Function to check if the file is watched."""
+        directory, name = os.path.split(path)
+        if directory not in self.directories:
+            return False
+        names = self.directories[directory]
+        if names is None:
+            return any(fnmatch.fnmatchcase(name, pattern) for pattern in self.pattern)
+        return name in names
+
+    def files(self) -> Set[str]:
+        """Function to list existing watched files."""
+        output = set()
+        for directory, names in self.directories.items():
+            for name in (os.listdir(directory) if names is None else names):
+                path = os.path.join(directory, name)
+                if self.match(path) and os.path.isfile(path):
+                    output.add(path)
+        return output
+
+
+class _InotifyWatcher:
+    """Directories watcher based on Linux inotify.
+
+    Raises:
+
+      OSError: Error occured if inotify is not available.
+    """
+    def __init__(self, targets: _Targets):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is available on Linux only")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories = {}
+        for directory in targets.directories:
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(directory), IN_MASK)
+            if wd < 0:
+                os.close(self._fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+            self._directories[wd] = directory
+
+    def wait(self, timeout: float) -> Set[str]:
+        """Function to wait for the changes.
+
+        Args:
+
+          timeout: Max waiting time in seconds.
+
+        Returns:
+
+          Paths of the changed files, empty if timed out.
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        output = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return output
+            pos = 0
+            while pos < len(data):
+                wd, _, _, length = EVENT.unpack_from(data, pos)
+                pos += EVENT.size
+                name = data[pos:pos + length].rstrip(b"\0")
+                pos += length
+                if wd in self._directories and name:
+                    output.add(os.path.join(self._directories[wd], os.fsdecode(name)))
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _PollingWatcher:
+    """Files watcher based on periodic stat calls.
+
+    Args:
+
+      targets: Watched files.
+
+      interval: Polling interval in seconds.
+    """
+    def __init__(self, targets: _Targets, interval: float = 0.5):
+        self._targets = targets
+        self._interval = interval
+        self._state = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        output = {}
+        for path in self._targets.files():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            output[path] = (stat.st_mtime_ns, stat.st_size)
+        return output
+
+    def wait(self, timeout: float) -> Set[str]:
+        """Function to wait for the changes.
+
+        Args:
+
+          timeout: Max waiting time in seconds.
+
+        Returns:
+
+          Paths of the changed files, empty if timed out.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            state = self._snapshot()
+            changed = {path for path in state.keys() | self._state.keys()
+                       if state.get(path) != self._state.get(path)}
+            self._state = state
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self._interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+def watch(paths: Iterable[str],
+          callback: Callable[[str, bytes], None],
+          debounce: float = 0.05,
+          poll_interval: float = 0.5,
+          pattern: Union[str, Tuple[str, ...]] = PATTERN,
+          use_inotify: bool = True,
+          stop: Optional[threading.Event] = None) -> None:
+    """Function to call back on every change of the watched files content.
+
+    The callback is called for all existing files first.
+
+    Args:
+
+      paths: Paths of files, or directories with files matching the pattern.
+
+      callback: Function called with the file path and its content.
+
+      debounce: Quiet period in seconds which ends the burst of events.
+
+      poll_interval: Polling interval in seconds if inotify is not available.
+
+      pattern: Glob pattern(s) of the files in the watched directories,
+             json files, compressed or not, by default.
+
+      use_inotify: Use inotify if available.
+
+      stop: Event to stop watching, the function runs until interrupted if not set.
+    """
+    targets = _Targets(paths, pattern)
+    watcher = None
+    if use_inotify:
+        try:
+            watcher = _InotifyWatcher(targets)
+        except (OSError, AttributeError):
+            watcher = None
+    if watcher is None:
+        watcher = _PollingWatcher(targets, poll_interval)
+
+    stop = stop or threading.Event()
+    hashes = {}
+
+    def _sync(changed: Set[str]) -> None:
+        for path in sorted(changed):
+            if not targets.match(path):
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except (FileNotFoundError, IsADirectoryError):
+                _ = hashes.pop(path, None)
+                continue
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            if hashes.get(path) == digest:
+                continue
+            hashes[path] = digest
+            callback(path, data)
+
+    try:
+        _sync(targets.files())
+        while not stop.is_set():
+            changed = watcher.wait(min(poll_interval, 0.5))
+            if not changed:
+                continue
+            while True:
+                burst = watcher.wait(debounce)
+                if not burst:
+                    break
+                changed |= burst
+            _sync(changed)
+    finally:
+        watcher.close()
@@ -31,6 +31,11 @@ setup(
     ],
     packages=["gbqschema_converter"],
     install_requires=requirements,
+    extras_require={
+        "fast": ["orjson"],
+        "columnar": ["numpy", "pyarrow"],
+        "zstd": ["zstandard"],
+    },
     include_package_data=True,
     entry_points={
         "console_scripts": [
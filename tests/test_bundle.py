@@ -0,0 +1,107 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import pathlib
+import importlib.util
+from types import ModuleType
+import fastjsonschema
+import pytest
+from google.cloud.bigquery import SchemaField
+from gbqschema_converter.gbqschema_to_jsonschema import json_representation as to_json
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "bundle"
+
+FUNCTIONS = set(['bundle', 'table_schema'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_functions() -> None:
+    missing = FUNCTIONS.difference(set(module.__dir__()))
+    assert not missing, f"""Function(s) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+audit = {"name": "audit", "type": "RECORD", "mode": "REQUIRED", "fields": [
+    {"name": "created_at", "type": "TIMESTAMP", "mode": "REQUIRED"},
+    {"name": "geo", "type": "RECORD", "fields": [
+        {"name": "lat", "type": "FLOAT64"},
+        {"name": "lon", "type": "FLOAT64"},
+    ]},
+]}
+
+tables = {
+    "orders": [
+        {"name": "id", "type": "INT64", "mode": "REQUIRED"},
+        audit,
+    ],
+    "users": [
+        SchemaField("id", "STRING", "REQUIRED"),
+        SchemaField.from_api_repr(dict(audit, mode="REPEATED")),
+    ],
+    "events": [
+        {"name": "geo", "type": "RECORD", "fields": [
+            {"name": "lat", "type": "FLOAT64"},
+            {"name": "lon", "type": "FLOAT64"},
+        ]},
+        {"name": "payload", "type": "RECORD", "fields": [{"name": "value", "type": "STRING"}]},
+    ],
+}
+
+
+def _resolve(definition: object, definitions: dict) -> object:
+    if isinstance(definition, dict):
+        if '$ref' in definition:
+            return _resolve(definitions[definition['$ref'].split("/")[-1]], definitions)
+        return {key: _resolve(value, definitions) for key, value in definition.items()}
+    return definition
+
+
+def test_bundle() -> None:
+    schema_bundle = module.bundle(tables)
+
+    assert list(schema_bundle['properties']) == ["orders", "users", "events"], "Bundle doesn't work"
+    assert len(schema_bundle['definitions']) == 2, "Structs sharing doesn't work"
+
+    orders = schema_bundle['properties']['orders']['items']['properties']
+    users = schema_bundle['properties']['users']['items']['properties']
+    assert orders['audit'] == users['audit']['items'] and '$ref' in orders['audit'],\
+        "Structs sharing doesn't work"
+    assert 'properties' in schema_bundle['properties']['events']['items']['properties']['payload'],\
+        "Not shared struct must be inlined"
+
+    for name, gbq_schema in tables.items():
+        schema = module.table_schema(schema_bundle, name)
+        expected = to_json([element.to_api_repr() if isinstance(element, SchemaField) else element
+                            for element in gbq_schema])
+        assert _resolve(schema['items'], schema['definitions']) == expected['definitions']['element'],\
+            "Bundle doesn't work"
+
+    validate = fastjsonschema.compile(module.table_schema(schema_bundle, "orders"))
+    validate([{"id": 1, "audit": {"created_at": "2020-01-01T00:00:00Z", "geo": {"lat": 1.0}}}])
+    with pytest.raises(fastjsonschema.JsonSchemaException):
+        validate([{"id": 1, "audit": {"geo": {"lat": "north"}}}])
+
+    schema_bundle = module.bundle(tables, min_occurrences=1)
+    assert len(schema_bundle['definitions']) == 3, "Structs sharing doesn't work"
+    return
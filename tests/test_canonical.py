@@ -0,0 +1,95 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import pathlib
+import importlib.util
+from types import ModuleType
+import pytest
+from google.cloud.bigquery import SchemaField
+from gbqschema_converter.gbqschema_to_jsonschema import json_representation as to_json
+from gbqschema_converter.gbqschema_to_jsonschema import lazy_representation
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "canonical"
+
+FUNCTIONS = set(['dumps', 'etag', 'if_none_match', 'normalize'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_functions() -> None:
+    missing = FUNCTIONS.difference(set(module.__dir__()))
+    assert not missing, f"""Function(s) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+def test_dumps_gbqschema() -> None:
+    schema_01 = [
+        {"name": "att_01", "type": "INTEGER", "mode": "REQUIRED", "description": "Att 1"},
+        {"name": "att_02", "type": "STRUCT", "fields": [
+            {"type": "BOOL", "name": "att_11", "description": None},
+        ]},
+    ]
+    schema_02 = [
+        SchemaField("att_01", "INT64", "REQUIRED", "Att 1"),
+        SchemaField("att_02", "RECORD", "NULLABLE", fields=(
+            SchemaField("att_11", "BOOLEAN"),
+        )),
+    ]
+
+    output_01, output_02 = module.dumps(schema_01), module.dumps(schema_02)
+    assert output_01 == output_02, "Canonical serialization doesn't work"
+    assert output_01.data == b'[{"description":"Att 1","mode":"REQUIRED","name":"att_01","type":"INT64"},'\
+        b'{"fields":[{"mode":"NULLABLE","name":"att_11","type":"BOOLEAN"}],'\
+        b'"mode":"NULLABLE","name":"att_02","type":"RECORD"}]', "Canonical serialization doesn't work"
+    assert output_01.etag == module.etag(output_01.data) and output_01.etag.startswith('"'),\
+        "ETag doesn't work"
+
+    assert module.dumps(list(reversed(schema_01))).etag != output_01.etag,\
+        "Columns order must be preserved"
+    return
+
+
+def test_dumps_jsonschema() -> None:
+    schema_gbq = [
+        {"name": "att_01", "type": "INT64", "mode": "REQUIRED"},
+        {"name": "att_02", "type": "FLOAT64", "mode": "REQUIRED"},
+    ]
+
+    output = module.dumps(to_json(schema_gbq))
+    assert output == module.dumps(to_json(list(reversed(schema_gbq)))),\
+        "Canonical serialization doesn't work"
+    assert output == module.dumps(lazy_representation(schema_gbq)),\
+        "Canonical serialization doesn't work"
+
+    with pytest.raises(ValueError):
+        module.dumps({"default": float("nan")})
+    return
+
+
+def test_if_none_match() -> None:
+    tag = module.dumps([]).etag
+    assert module.if_none_match(tag, tag), "ETag check doesn't work"
+    assert module.if_none_match(f'"other", W/{tag}', tag), "ETag check doesn't work"
+    assert module.if_none_match("*", tag), "ETag check doesn't work"
+    assert not module.if_none_match('"other"', tag), "ETag check doesn't work"
+    return
@@ -0,0 +1,125 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import datetime
+import pathlib
+import importlib.util
+from types import ModuleType
+import pytest
+from google.cloud.bigquery import SchemaField
+
+np = pytest.importorskip("numpy")
+pa = pytest.importorskip("pyarrow")
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "columnar"
+
+CLASSES = set(['ColumnValidator'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_classes() -> None:
+    missing = CLASSES.difference(set(module.__dir__()))
+    assert not missing, f"""Class(es) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+def test_scalar_columns() -> None:
+    schema_in = [
+        {"name": "att_01", "type": "INT64", "mode": "REQUIRED"},
+        {"name": "att_02", "type": "INTEGER"},
+        {"name": "att_03", "type": "NUMERIC"},
+        {"name": "att_04", "type": "BOOL"},
+        {"name": "att_05", "type": "DATE"},
+        {"name": "att_06", "type": "TIME"},
+        {"name": "att_07", "type": "DATETIME"},
+        {"name": "att_08", "type": "TIMESTAMP"},
+        {"name": "att_09", "type": "STRING", "mode": "REQUIRED"},
+    ]
+
+    batch = {
+        "att_01": np.array([0, 2 ** 63, 2 ** 63 + 1, 1], dtype=np.uint64),
+        "att_02": ["1", "-9223372036854775808", "9223372036854775808", "1a"],
+        "att_03": np.array([1.5, np.nan, 1e30, 2.0]),
+        "att_04": ["true", "Y", "maybe", None],
+        "att_05": ["2020-01-31", "2020-02-30", None, "2020-1-5"],
+        "att_06": ["12:00:00", "25:00:00", "1:2:3.123", None],
+        "att_07": ["2020-01-10T12:00:00", "2020-01-01", None, "2020-01-11 12:00:00.123456"],
+        "att_08": [datetime.datetime(2020, 1, 1), None, None, None],
+    }
+
+    report = module.ColumnValidator(schema_in)(batch)
+    masks = {key: mask.tolist() for key, mask in report.masks.items()}
+    assert masks == {
+        "att_01": [False, True, True, False],
+        "att_02": [False, False, True, True],
+        "att_03": [False, True, True, False],
+        "att_04": [False, False, True, False],
+        "att_05": [False, True, False, False],
+        "att_06": [False, True, False, False],
+        "att_07": [False, True, False, False],
+        "att_08": [False, False, False, False],
+        "att_09": [True, True, True, True],
+    }, "Validation doesn't work"
+    assert report.rows.tolist() == [True, True, True, True] and not report.valid,\
+        "Validation doesn't work"
+
+    values = ["2020-01-20 00:00:00", "2020-12-30T23:59:59", "2020-01-31T12:00:00", "2020-13-01T12:00:00",
+              "2020-01-32T12:00:00", "2020-01-01T24:00:00", "2020-01-01T12:00:00Z"]
+    report = module.ColumnValidator(schema_in[6:7])({"att_07": values})
+    assert report.masks['att_07'].tolist() == [False, False, False, True, True, True, True],\
+        "DATETIME validation doesn't work"
+
+    report = module.ColumnValidator(schema_in[:1])(pa.table({"att_01": pa.chunked_array([[1, 2], [None]])}))
+    assert report.rows.tolist() == [False, False, True], "Validation doesn't work"
+    return
+
+
+def test_nested_columns() -> None:
+    schema_in = [
+        SchemaField("att_01", "RECORD", "NULLABLE", fields=(
+            SchemaField("att_11", "INT64", "REQUIRED"),
+        )),
+        SchemaField("att_02", "RECORD", "REPEATED", fields=(
+            SchemaField("att_21", "DATE", "REQUIRED"),
+        )),
+        SchemaField("att_03", "STRING", "REPEATED"),
+    ]
+
+    batch = pa.table({
+        "att_01": [{"att_11": 1}, {"att_11": None}, None, {"att_11": 2}],
+        "att_02": [[{"att_21": "2020-01-01"}], [{"att_21": "2020-01-01"}, {"att_21": "bad"}], None, []],
+        "att_03": [["a"], None, ["b", None], []],
+    })
+
+    report = module.ColumnValidator(schema_in).validate(batch)
+    masks = {key: mask.tolist() for key, mask in report.masks.items()}
+    assert masks == {
+        "att_01.att_11": [False, True, False, False],
+        "att_01": [False, False, False, False],
+        "att_02.att_21": [False, True, False, False],
+        "att_02": [False, False, False, False],
+        "att_03": [False, False, True, False],
+    }, "Validation doesn't work"
+    assert report.rows.tolist() == [False, True, True, False], "Validation doesn't work"
+    return
@@ -0,0 +1,105 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import io
+import pathlib
+import importlib.util
+from types import ModuleType
+import pytest
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "compression"
+
+FUNCTIONS = set(['compress', 'decompress', 'detect', 'open_file', 'open_stream', 'with_extension'])
+
+DATA = b'[{"name": "att_01", "type": "INT64"}]\n' * 100
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_functions() -> None:
+    missing = FUNCTIONS.difference(set(module.__dir__()))
+    assert not missing, f"""Function(s) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+@pytest.mark.parametrize("compression,extension", [
+    ("gzip", ".gz"), ("bz2", ".bz2"), ("xz", ".xz"), ("zstd", ".zst"), (None, ".json"),
+])
+def test_open_file(tmp_path, compression: str, extension: str) -> None:
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+
+    path = tmp_path / f"schema{extension}"
+    with module.open_file(str(path), 'wb') as f:
+        f.write(DATA)
+
+    assert module.detect_file(str(path)) == compression, "Compression detection doesn't work"
+    with module.open_file(str(path)) as f:
+        assert f.read() == DATA, "Decompression doesn't work"
+
+    # the magic bytes take precedence over the extension
+    path_renamed = path.rename(tmp_path / "schema.json")
+    with module.open_file(str(path_renamed)) as f:
+        assert f.read() == DATA, "Decompression doesn't work"
+
+    compressed = module.compress(DATA, compression)
+    assert module.detect(compressed) == compression and module.decompress(compressed) == DATA,\
+        "Compression doesn't work"
+    return
+
+
+@pytest.mark.parametrize("compression", ["gzip", "bz2", "xz", "zstd", None])
+def test_open_stream(compression: str) -> None:
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+
+    buf = io.BytesIO()
+    with module.open_stream(buf, compression) as f:
+        f.write(DATA[:10])
+        f.write(DATA[10:])
+    assert not buf.closed, "Stream compression doesn't work"
+    assert module.detect(buf.getvalue()) == compression and module.decompress(buf.getvalue()) == DATA,\
+        "Stream compression doesn't work"
+
+    with pytest.raises(ValueError):
+        with module.open_stream(buf, "lz4"):
+            pass
+    return
+
+
+def test_open_file_errors(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        with module.open_file(str(tmp_path / "schema.json"), 'wb', compression="lz4"):
+            pass
+    with pytest.raises(ValueError):
+        with module.open_file(str(tmp_path / "schema.json"), 'ab'):
+            pass
+    return
+
+
+def test_with_extension() -> None:
+    assert module.with_extension("schema.json.gz", None) == "schema.json", "Extension doesn't work"
+    assert module.with_extension("schema.json.gz", "zstd") == "schema.json.zst", "Extension doesn't work"
+    assert module.with_extension("schema.json", "bz2") == "schema.json.bz2", "Extension doesn't work"
+    assert module.with_extension("schema.json", None) == "schema.json", "Extension doesn't work"
+    return
@@ -0,0 +1,138 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import copy
+import pathlib
+import threading
+import importlib.util
+from types import ModuleType
+from google.cloud.bigquery import SchemaField
+from gbqschema_converter import gbqschema_to_jsonschema, jsonschema_to_gbqschema
+from gbqschema_converter.shared_cache import SharedCache
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "converter"
+
+CLASSES = set(['Converter'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_classes() -> None:
+    missing = CLASSES.difference(set(module.__dir__()))
+    assert not missing, f"""Class(es) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+schemas_in = [
+    [
+        {"name": f"att_{i:02d}", "type": "INT64", "mode": "REQUIRED"},
+        {"name": "att_rec", "type": "RECORD", "mode": "NULLABLE", "fields": [
+            {"name": f"att_{i:02d}", "type": "DATE", "mode": "REQUIRED"},
+            {"name": "att_x", "type": "TIME", "mode": "NULLABLE"},
+        ]},
+    ]
+    for i in range(100)
+]
+
+
+def test_direction() -> None:
+    try:
+        module.Converter("json_to_gbq")
+    except ValueError as ex:
+        assert "Unknown direction" in str(ex), "Direction check doesn't work"
+    else:
+        raise AssertionError("Direction check doesn't work")
+    return
+
+
+def test_convert() -> None:
+    converter = module.Converter(additional_properties=True, exclude="att_rec.att_x")
+    assert converter(schemas_in[0]) == gbqschema_to_jsonschema.json_representation(
+        schemas_in[0], True, exclude="att_rec.att_x"), "Convertion doesn't work"
+
+    converter = module.Converter("jsonschema_to_gbqschema", sdk_representation=True)
+    schema_json = gbqschema_to_jsonschema.json_representation(schemas_in[0])
+    assert converter(schema_json) == jsonschema_to_gbqschema.sdk_representation(schema_json),\
+        "Convertion doesn't work"
+    assert isinstance(converter(schema_json)[0], SchemaField), "Convertion doesn't work"
+    return
+
+
+def test_cache(tmp_path) -> None:
+    cache = SharedCache(str(tmp_path / "cache"), slots=16, ways=4)
+    converter = module.Converter(cache=cache)
+    assert converter(schemas_in[0]) == converter(schemas_in[0]) == module.Converter()(schemas_in[0]),\
+        "Cached convertion doesn't work"
+    assert cache.get(converter._key(schemas_in[0])) is not None, "Cached convertion doesn't work"
+    assert converter._key(schemas_in[0]) != module.Converter(additional_properties=True,
+                                                             cache=cache)._key(schemas_in[0]),\
+        "Cache key must depend on the options"
+
+    output = converter(schemas_in[1])
+    output['definitions']['element']['properties']['att_01']['type'] = "null"
+    assert converter(schemas_in[1]) != output, "Cached output must not be shared"
+
+    converter = module.Converter(with_index=True, cache=cache)
+    schema_out, index = converter(schemas_in[2])
+    schema_cached, index_cached = converter(schemas_in[2])
+    assert schema_cached == schema_out and index_cached == index and index_cached.max_depth == 1,\
+        "Cached convertion with index doesn't work"
+
+    converter = module.Converter("jsonschema_to_gbqschema", sdk_representation=True, cache=cache)
+    schema_json = gbqschema_to_jsonschema.json_representation(schemas_in[0])
+    assert converter(schema_json) == converter(schema_json) ==\
+        jsonschema_to_gbqschema.sdk_representation(schema_json), "Cached convertion doesn't work"
+    cache.close()
+    return
+
+
+def test_map_threads() -> None:
+    map_types = copy.deepcopy(gbqschema_to_jsonschema.map_types)
+    converter = module.Converter(include=["att_*", "att_rec.att_*"])
+    expected = [converter(schema) for schema in schemas_in]
+
+    barrier = threading.Barrier(4)
+    results = [None] * 4
+
+    def _worker(i: int) -> None:
+        barrier.wait()
+        results[i] = converter.map(schemas_in * 5, threads=4)
+        # outputs must not share state with the type tables and each other
+        for output in results[i]:
+            output['definitions']['element']['properties']['att_rec']['properties']['att_x']['type'] = "null"
+
+    threads = [threading.Thread(target=_worker, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for result in results:
+        assert len(result) == 500, "Batch convertion doesn't work"
+        for output, output_expected in zip(result, expected * 5):
+            output['definitions']['element']['properties']['att_rec']['properties']['att_x']['type'] = "string"
+            assert output == output_expected, "Concurrent convertion doesn't work"
+
+    assert gbqschema_to_jsonschema.map_types == map_types, "Type table is mutated"
+    assert converter.map(schemas_in, threads=1) == expected, "Batch convertion doesn't work"
+    return
@@ -0,0 +1,146 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import pathlib
+import importlib.util
+from types import ModuleType
+from google.cloud.bigquery import SchemaField
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "diff"
+
+FUNCTIONS = set(['diff', 'diff_batch'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_functions() -> None:
+    missing = FUNCTIONS.difference(set(module.__dir__()))
+    assert not missing, f"""Function(s) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+live = [
+    {"name": "att_01", "type": "INTEGER", "mode": "REQUIRED"},
+    {"name": "att_02", "type": "STRING", "mode": "REQUIRED", "description": "Att 2"},
+    {"name": "att_03", "type": "RECORD", "mode": "NULLABLE", "fields": [
+        {"name": "att_11", "type": "INT64", "mode": "REQUIRED"},
+        {"name": "att_12", "type": "STRING", "mode": "NULLABLE"},
+    ]},
+    {"name": "att_04", "type": "RECORD", "fields": [
+        {"name": "att_21", "type": "DATE"},
+    ]},
+    {"name": "att_05", "type": "STRING"},
+]
+
+
+def test_diff() -> None:
+    proposed = [
+        SchemaField("ATT_01", "INT64", "NULLABLE"),
+        SchemaField("att_02", "STRING", "REPEATED"),
+        SchemaField("att_03", "RECORD", "NULLABLE", fields=(
+            SchemaField("att_11", "FLOAT", "REQUIRED"),
+            SchemaField("att_13", "DATE", "REQUIRED"),
+        )),
+        SchemaField("att_04", "RECORD", fields=(
+            SchemaField("att_21", "DATE", description="changed"),
+        )),
+        SchemaField("att_06", "BOOL"),
+    ]
+
+    result = module.diff(live, proposed)
+    assert result.changes == [
+        module.Change("att_01", "relaxed", "REQUIRED", "NULLABLE", True),
+        module.Change("att_02", "mode", "REQUIRED", "REPEATED", False),
+        module.Change("att_03.att_11", "type", "INT64", "FLOAT64", True),
+        module.Change("att_03.att_12", "dropped", "NULLABLE", None, False),
+        module.Change("att_03.att_13", "added", None, "REQUIRED", False),
+        module.Change("att_05", "dropped", "NULLABLE", None, False),
+        module.Change("att_06", "added", None, "NULLABLE", True),
+    ], "Diff doesn't work"
+    assert not result.accepted, "Diff doesn't work"
+
+    result = module.diff(live, live[:1] + [{"name": "att_02", "type": "STRING"}] + live[2:])
+    assert result.changes == [module.Change("att_02", "relaxed", "REQUIRED", "NULLABLE", True)]\
+        and result.accepted, "Diff doesn't work"
+
+    result = module.diff(live, [{"name": "att_01", "type": "RECORD", "mode": "REQUIRED", "fields": []}] + live[1:])
+    assert result.changes == [module.Change("att_01", "type", "INT64", "RECORD", False)],\
+        "Diff doesn't work"
+
+    result = module.diff(live, live[:4] + [{"name": "att_05", "type": "STRING", "mode": "REQUIRED"}])
+    assert result.changes == [module.Change("att_05", "mode", "NULLABLE", "REQUIRED", False)]\
+        and not result.accepted, "Diff doesn't work"
+
+    result = module.diff([{"name": "att_01", "type": "INT64"}],
+                         [{"name": "att_01", "type": "FLOAT64", "mode": "REQUIRED"}])
+    assert result.changes == [module.Change("att_01", "type", "INT64", "FLOAT64", False),
+                              module.Change("att_01", "mode", "NULLABLE", "REQUIRED", False)]\
+        and not result.accepted, "Diff of type and mode change doesn't work"
+
+    result = module.diff([{"name": "att_01", "type": "INT64"}],
+                         [{"name": "att_01", "type": "NUMERIC", "mode": "REPEATED"}])
+    assert [change.kind for change in result.changes] == ["type", "mode"] and not result.accepted,\
+        "Diff of type and mode change doesn't work"
+
+    result = module.diff([{"name": "att_01", "type": "INT64", "mode": "REQUIRED"}],
+                         [{"name": "att_01", "type": "FLOAT64", "mode": "NULLABLE"}])
+    assert result.changes == [module.Change("att_01", "type", "INT64", "FLOAT64", True),
+                              module.Change("att_01", "relaxed", "REQUIRED", "NULLABLE", True)]\
+        and result.accepted, "Diff of type and mode change doesn't work"
+
+    result = module.diff(live, list(reversed(live)))
+    assert result.changes == [] and result.accepted, "Diff doesn't work"
+    return
+
+
+def test_diff_jsonschema() -> None:
+    json_schema = {
+        "type": "object",
+        "properties": {
+            "att_01": {"type": "integer"},
+            "att_02": {"type": "number"},
+        },
+        "required": ["att_01"],
+    }
+    gbq_schema = [
+        {"name": "att_01", "type": "INT64", "mode": "REQUIRED"},
+    ]
+
+    result = module.diff(gbq_schema, json_schema)
+    assert result.changes == [module.Change("att_02", "added", None, "NULLABLE", True)],\
+        "Diff doesn't work"
+    return
+
+
+def test_diff_batch() -> None:
+    proposed_01 = live + [{"name": "att_06", "type": "BOOL", "mode": "REQUIRED"}]
+    proposed_02 = live[1:]
+
+    results = module.diff_batch([(live, live), (live, proposed_01), (live, proposed_02)])
+    assert [result.accepted for result in results] == [True, False, False], "Batch diff doesn't work"
+    assert results[1].changes == [module.Change("att_06", "added", None, "REQUIRED", False)],\
+        "Batch diff doesn't work"
+    assert results == [module.diff(old, new) for old, new in
+                       [(live, live), (live, proposed_01), (live, proposed_02)]],\
+        "Batch diff doesn't work"
+    return
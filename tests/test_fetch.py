@@ -0,0 +1,147 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import json
+import pathlib
+import threading
+import importlib.util
+from types import ModuleType
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import requests
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "fetch"
+
+FUNCTIONS = set(['export_project'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_functions() -> None:
+    missing = FUNCTIONS.difference(set(module.__dir__()))
+    assert not missing, f"""Function(s) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+PROJECT = "project"
+DATASETS = {
+    f"dataset_{i}": [f"table_{j}" for j in range(5 * (i + 1))]
+    for i in range(3)
+}
+SCHEMA = [
+    {"name": "att_01", "type": "INTEGER", "mode": "REQUIRED"},
+    {"name": "att_02", "type": "RECORD", "mode": "REPEATED", "fields": [
+        {"name": "att_11", "type": "STRING", "mode": "NULLABLE"},
+    ]},
+]
+
+
+class FakeBigQuery(BaseHTTPRequestHandler):
+    """Stand-in for BigQuery REST API with 2 items per page."""
+    requests = []
+    lock = threading.Lock()
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _page(self, items: list, params: dict) -> dict:
+        start = int(params.get('pageToken', ["0"])[0])
+        output = {"items": items[start:start + 2]}
+        if start + 2 < len(items):
+            output['nextPageToken'] = str(start + 2)
+        return output
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        parts = url.path.split("/")[5:]
+        with self.lock:
+            self.requests.append(url.path)
+
+        if parts == ["datasets"]:
+            page = self._page(sorted(DATASETS), params)
+            body = {"datasets": [{"datasetReference": {"datasetId": dataset}} for dataset in page['items']]}
+        elif len(parts) == 3 and parts[2] == "tables":
+            page = self._page(DATASETS[parts[1]], params)
+            body = {"tables": [{"tableReference": {"tableId": table}} for table in page['items']]}
+        elif len(parts) == 4 and parts[3] == "table_0":
+            self.send_response(404)
+            self.end_headers()
+            return
+        else:
+            page = {}
+            body = {"schema": {"fields": SCHEMA}}
+
+        if 'nextPageToken' in page:
+            body['nextPageToken'] = page['nextPageToken']
+
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def test_export_project() -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBigQuery)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        results = list(module.export_project(PROJECT,
+                                             session=requests.Session(),
+                                             endpoint=f"http://127.0.0.1:{server.server_address[1]}",
+                                             max_workers=4,
+                                             rate_limit=1000,
+                                             retries=0))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    tables = sorted((result.dataset, result.table) for result in results)
+    assert tables == sorted((dataset, table) for dataset, tables in DATASETS.items() for table in tables),\
+        "Export doesn't work"
+
+    failed = [result for result in results if result.error is not None]
+    assert len(failed) == len(DATASETS) and all(result.table == "table_0" for result in failed),\
+        "Errors handling doesn't work"
+    assert all(isinstance(result.error, requests.HTTPError) for result in failed),\
+        "Errors handling doesn't work"
+
+    converted = next(result for result in results if result.error is None)
+    assert converted.schema == SCHEMA, "Export doesn't work"
+    assert converted.output['definitions']['element']['properties']['att_02']['type'] == "array",\
+        "Conversion doesn't work"
+
+    assert FakeBigQuery.requests.count(f"/bigquery/v2/projects/{PROJECT}/datasets") == 2,\
+        "Pagination doesn't work"
+    return
+
+
+def test_rate_limiter() -> None:
+    limiter = module.RateLimiter(rate=100, burst=1)
+    start = module.time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert module.time.monotonic() - start >= 0.04, "Rate limit doesn't work"
+    return
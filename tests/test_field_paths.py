@@ -0,0 +1,109 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import csv
+import gzip
+import json
+import pathlib
+import importlib.util
+from types import ModuleType
+import pytest
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "field_paths"
+
+FUNCTIONS = set(['assemble', 'read_rows', 'tables', 'convert'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_functions() -> None:
+    missing = FUNCTIONS.difference(set(module.__dir__()))
+    assert not missing, f"""Function(s) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+rows = [
+    {"table_schema": "ds", "table_name": "t1", "field_path": "att_01", "data_type": "INT64",
+     "is_nullable": "NO", "description": "Att 1"},
+    {"table_schema": "ds", "table_name": "t1", "field_path": "att_02",
+     "data_type": "ARRAY<STRUCT<att_11 STRING, att_12 STRUCT<att_21 NUMERIC(10, 2)>>>",
+     "is_nullable": "NO", "description": ""},
+    {"table_schema": "ds", "table_name": "t1", "field_path": "att_02.att_11", "data_type": "STRING",
+     "is_nullable": "YES", "description": ""},
+    {"table_schema": "ds", "table_name": "t1", "field_path": "att_02.att_12.att_21",
+     "data_type": "NUMERIC(10, 2)", "is_nullable": "YES", "description": ""},
+    {"table_schema": "ds", "table_name": "t1", "field_path": "att_02.att_12",
+     "data_type": "STRUCT<att_21 NUMERIC(10, 2)>", "is_nullable": "YES", "description": ""},
+    {"table_schema": "ds", "table_name": "t2", "field_path": "att_01", "data_type": "ARRAY<BOOL>",
+     "is_nullable": "NO", "description": ""},
+]
+
+schema_t1 = [
+    {"name": "att_01", "type": "INT64", "mode": "REQUIRED", "description": "Att 1"},
+    {"name": "att_02", "type": "RECORD", "mode": "REPEATED", "fields": [
+        {"name": "att_11", "type": "STRING", "mode": "NULLABLE"},
+        {"name": "att_12", "type": "RECORD", "mode": "NULLABLE", "fields": [
+            {"name": "att_21", "type": "NUMERIC", "mode": "NULLABLE"},
+        ]},
+    ]},
+]
+
+schema_t2 = [
+    {"name": "att_01", "type": "BOOLEAN", "mode": "REPEATED"},
+]
+
+
+def test_assemble() -> None:
+    output = list(module.assemble(rows))
+    assert output == [("ds.t1", schema_t1), ("ds.t2", schema_t2)], "Assemble doesn't work"
+
+    shuffled = [rows[5]] + rows[:5]
+    with pytest.raises(ValueError):
+        list(module.assemble(shuffled + [dict(rows[5], field_path="att_02")]))
+    assert dict(module.assemble(shuffled, grouped=False)) == dict(output),\
+        "Assemble of not grouped rows doesn't work"
+
+    with pytest.raises(ValueError):
+        list(module.assemble(rows[:1] * 2))
+    with pytest.raises(ValueError):
+        list(module.assemble([rows[0], dict(rows[2], field_path="att_01.att_11")]))
+    return
+
+
+def test_tables(tmp_path) -> None:
+    path_csv = tmp_path / "columns.csv.gz"
+    with gzip.open(path_csv, 'wt', newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    path_ndjson = tmp_path / "columns.json"
+    path_ndjson.write_text("\n".join(json.dumps(row) for row in rows))
+
+    assert list(module.tables(str(path_csv))) == list(module.tables(str(path_ndjson))) ==\
+        [("ds.t1", schema_t1), ("ds.t2", schema_t2)], "Read of export files doesn't work"
+
+    output = dict(module.convert([str(path_ndjson)]))
+    assert output['ds.t2']['definitions']['element']['properties']['att_01']['type'] == "array",\
+        "Conversion of export files doesn't work"
+    return
@@ -1,6 +1,7 @@
 # Dmitry Kisler © 2020
 # www.dkisler.com
 
+import pickle
 import pathlib
 import importlib.util
 from types import ModuleType
@@ -11,7 +12,7 @@ DIR = pathlib.Path(__file__).parent
 PACKAGE = "gbqschema_converter"
 MODULE = "gbqschema_to_jsonschema"
 
-FUNCTIONS = set(['json_representation', 'sdk_representation'])
+FUNCTIONS = set(['json_representation', 'sdk_representation', 'lazy_representation'])
 
 
 def load_module(module_name: str) -> ModuleType:
@@ -375,6 +376,213 @@ def test_sdk_representation_conversion_record() -> None:
     return
 
 
+def test_lazy_representation() -> None:
+    schema_in = [
+        {
+            "name": "att_01",
+            "type": "INT64",
+            "mode": "REQUIRED"
+        },
+        {
+            "name": "att_02",
+            "type": "RECORD",
+            "mode": "NULLABLE",
+            "fields": [
+                {
+                    "name": "att_11",
+                    "type": "FLOAT64",
+                    "mode": "REQUIRED",
+                },
+                {
+                    "name": "att_12",
+                    "type": "STRING",
+                    "mode": "NULLABLE",
+                },
+            ],
+        },
+        {
+            "name": "att_03",
+            "type": "RECORD",
+            "fields": [
+                {
+                    "name": "att_21",
+                    "type": "FFA",
+                },
+            ],
+        },
+    ]
+
+    schema_convert = module.lazy_representation(schema_in)
+    properties = schema_convert['definitions']['element']['properties']
+
+    assert list(properties) == ["att_01", "att_02", "att_03"],\
+        "Lazy convertion doesn't work"
+    assert properties['att_02'] == schema_out_record['definitions']['element']['properties']['att_02'],\
+        "Lazy convertion doesn't work"
+    assert properties['att_02'] is properties['att_02'],\
+        "Lazy convertion is not memoized"
+
+    try:
+        properties['att_03']['properties']
+    except Exception as ex:
+        assert "data[0].type must be one of" in str(ex),\
+            "Lazy input validation doesn't work"
+    else:
+        raise AssertionError("Lazy input validation doesn't work")
+
+    schema_convert = module.lazy_representation(schema_in[:2]).materialize()
+    assert type(schema_convert['definitions']['element']['properties']['att_02']) is dict,\
+        "Materialization doesn't work"
+    assert schema_convert == schema_out_record,\
+        "Materialization doesn't work"
+
+    return
+
+
+def test_projection() -> None:
+    schema_in = [
+        {
+            "name": "att_01",
+            "type": "INT64",
+            "mode": "REQUIRED"
+        },
+        {
+            "name": "att_02",
+            "type": "RECORD",
+            "mode": "NULLABLE",
+            "fields": [
+                {
+                    "name": "att_11",
+                    "type": "FLOAT64",
+                    "mode": "REQUIRED",
+                },
+                {
+                    "name": "att_12",
+                    "type": "STRING",
+                    "mode": "NULLABLE",
+                },
+            ],
+        },
+        {
+            "name": "att_03",
+            "type": "FFA",
+        },
+    ]
+
+    schema_convert = module.json_representation(schema_in, include=["att_0[12]"], exclude="att_02.att_12")
+    properties = schema_convert['definitions']['element']['properties']
+    assert list(properties) == ["att_01", "att_02"], "Projection doesn't work"
+    assert list(properties['att_02']['properties']) == ["att_11"], "Projection doesn't work"
+
+    schema_convert = module.json_representation(schema_in, include=["att_01", "att_02.att_99"])
+    assert schema_convert['definitions']['element']['properties'] == {"att_01": {"type": "integer"}},\
+        "Projection doesn't work"
+
+    schema_in = [
+        SchemaField('att_01', 'INT64', 'REQUIRED', None, ()),
+        SchemaField('att_02', 'RECORD', 'NULLABLE', None, (
+            SchemaField('att_11', 'FLOAT64', 'REQUIRED', None, ()),
+            SchemaField('att_12', 'STRING', 'NULLABLE', None, ()))
+        )
+    ]
+
+    schema_convert = module.sdk_representation(schema_in, include="att_02.*", exclude="*.att_12")
+    properties = schema_convert['definitions']['element']['properties']
+    assert list(properties) == ["att_02"], "Projection doesn't work"
+    assert list(properties['att_02']['properties']) == ["att_11"], "Projection doesn't work"
+    assert 'required' not in schema_convert['definitions']['element'], "Projection doesn't work"
+
+    return
+
+
+def test_index() -> None:
+    schema_in = [
+        SchemaField('att_01', 'INT64', 'REQUIRED', None, ()),
+        SchemaField('att_02', 'RECORD', 'NULLABLE', None, (
+            SchemaField('att_11', 'FLOAT64', 'REQUIRED', None, ()),
+            SchemaField('att_12', 'STRING', 'NULLABLE', None, ()))
+        )
+    ]
+
+    schema_convert, index = module.sdk_representation(schema_in, with_index=True)
+    assert schema_convert == schema_out_record, "Convertion doesn't work"
+
+    assert list(index) == ["att_01", "att_02", "att_02.att_11", "att_02.att_12"],\
+        "Index doesn't work"
+    assert index['att_02.att_11'] == ({"type": "number"}, "FLOAT64", "REQUIRED", 1, "att_02"),\
+        "Index doesn't work"
+    assert index['att_02'].node is schema_convert['definitions']['element']['properties']['att_02'],\
+        "Index doesn't work"
+    assert index.max_depth == 1 and index.depths[0] == 2, "Index statistics doesn't work"
+
+    schema_copy, index_copy = pickle.loads(pickle.dumps((schema_convert, index)))
+    assert index_copy == index and index_copy.depths == index.depths, "Index pickling doesn't work"
+    assert index_copy['att_02'].node is schema_copy['definitions']['element']['properties']['att_02'],\
+        "Index pickling doesn't work"
+
+    _, index = module.json_representation([
+        {"name": "att_01", "type": "INT64"},
+        {"name": "att_02", "type": "RECORD", "fields": [{"name": "att_11", "type": "DATE"}]},
+    ], include="att_01", with_index=True)
+    assert list(index) == ["att_01"] and index['att_01'].mode == "NULLABLE",\
+        "Index doesn't work"
+
+    return
+
+
+def test_repeated() -> None:
+    schema_out = {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "array",
+        "items": {"$ref": "#/definitions/element"},
+        "definitions": {
+            "element": {
+                "type": "object",
+                "properties": {
+                    "att_01": {"type": "array", "items": {"type": "integer"}},
+                    "att_02": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "att_11": {"type": "array", "items": {"type": "string", "format": "date"}},
+                                "att_12": {"type": "string"},
+                            },
+                            "additionalProperties": False,
+                            "required": ["att_12"],
+                        },
+                    },
+                },
+                "additionalProperties": False,
+            },
+        },
+    }
+
+    schema_in = [
+        {"name": "att_01", "type": "INT64", "mode": "REPEATED"},
+        {"name": "att_02", "type": "RECORD", "mode": "REPEATED", "fields": [
+            {"name": "att_11", "type": "DATE", "mode": "REPEATED"},
+            {"name": "att_12", "type": "STRING", "mode": "REQUIRED"},
+        ]},
+    ]
+    assert module.json_representation(schema_in) == schema_out, "Convertion doesn't work"
+    assert module.lazy_representation(schema_in).materialize() == schema_out, "Convertion doesn't work"
+
+    schema_in = [
+        SchemaField('att_01', 'INT64', 'REPEATED', None, ()),
+        SchemaField('att_02', 'RECORD', 'REPEATED', None, (
+            SchemaField('att_11', 'DATE', 'REPEATED', None, ()),
+            SchemaField('att_12', 'STRING', 'REQUIRED', None, ()))
+        )
+    ]
+    schema_convert, index = module.sdk_representation(schema_in, with_index=True)
+    assert schema_convert == schema_out, "Convertion doesn't work"
+    assert index['att_02'].mode == "REPEATED" and\
+        index['att_02'].node is schema_convert['definitions']['element']['properties']['att_02'],\
+        "Index doesn't work"
+    return
+
+
 if __name__ == "__main__":
     test_module_exists()
     test_module_miss_functions()
@@ -383,3 +591,7 @@ if __name__ == "__main__":
     test_sdk_representation_conversion()
     test_json_representation_conversion_record()
     test_sdk_representation_conversion_record()
+    test_lazy_representation()
+    test_projection()
+    test_index()
+    test_repeated()
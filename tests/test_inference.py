@@ -0,0 +1,116 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import gzip
+import json
+import pathlib
+import importlib.util
+from types import ModuleType
+from google.cloud.bigquery import SchemaField
+# worker processes import the shard reader by its package path
+from gbqschema_converter.inference import json_representation as json_representation_parallel
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "inference"
+
+FUNCTIONS = set(['json_representation', 'sdk_representation', 'infer', 'merge'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_functions() -> None:
+    missing = FUNCTIONS.difference(set(module.__dir__()))
+    assert not missing, f"""Function(s) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+rows = [
+    {"att_01": 1, "att_02": "a", "att_03": {"att_11": 1.5, "att_12": "2020-04-08"},
+     "att_04": [1, 2], "att_05": None},
+    {"att_01": 2, "att_02": "2020-04-08T21:42:51Z", "att_03": {"att_11": 2},
+     "att_04": [], "att_06": "21:42:51"},
+    {"att_01": 3, "att_03": {"att_11": 3, "att_12": "2020-04-09"},
+     "att_04": [3], "att_06": True, "att_07": [{"att_21": False}]},
+]
+
+schema_out = [
+    {"name": "att_01", "type": "INT64", "mode": "REQUIRED"},
+    {"name": "att_02", "type": "STRING", "mode": "NULLABLE"},
+    {"name": "att_03", "type": "RECORD", "mode": "REQUIRED", "fields": [
+        {"name": "att_11", "type": "FLOAT64", "mode": "REQUIRED"},
+        {"name": "att_12", "type": "DATE", "mode": "NULLABLE"},
+    ]},
+    {"name": "att_04", "type": "INT64", "mode": "REPEATED"},
+    {"name": "att_05", "type": "STRING", "mode": "NULLABLE"},
+    {"name": "att_06", "type": "STRING", "mode": "NULLABLE"},
+    {"name": "att_07", "type": "RECORD", "mode": "REPEATED", "fields": [
+        {"name": "att_21", "type": "BOOLEAN", "mode": "REQUIRED"},
+    ]},
+]
+
+
+def test_json_representation(tmp_path) -> None:
+    path = tmp_path / "sample.json"
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n\n")
+
+    schema_convert = module.json_representation(str(path), processes=1, infer_required=True)
+    assert schema_convert == schema_out, "Inference doesn't work"
+
+    for chunk_size in (1, 7, 64):
+        schema_convert = json_representation_parallel([str(path)], processes=2,
+                                                      infer_required=True, chunk_size=chunk_size)
+        assert schema_convert == schema_out, "Sharded inference doesn't work"
+
+    schema_convert = module.json_representation(str(path), processes=1)
+    assert schema_convert[0]['mode'] == "NULLABLE", "Inference doesn't work"
+
+    path_gzip = tmp_path / "sample.json.gz"
+    path_gzip.write_bytes(gzip.compress(path.read_bytes()))
+    schema_convert = json_representation_parallel([str(path_gzip), str(path)], processes=2,
+                                                  infer_required=True, chunk_size=7)
+    assert schema_convert == schema_out, "Compressed files inference doesn't work"
+    return
+
+
+def test_sdk_representation(tmp_path) -> None:
+    path = tmp_path / "sample.json"
+    path.write_text("\n".join(json.dumps(row) for row in rows[1:]))
+
+    schema_convert = module.sdk_representation(str(path), processes=1)
+    assert schema_convert[2] == SchemaField('att_03', 'RECORD', 'NULLABLE', None, (
+        SchemaField('att_11', 'INT64', 'NULLABLE', None, ()),
+        SchemaField('att_12', 'DATE', 'NULLABLE', None, ()),
+    )), "Inference doesn't work"
+    return
+
+
+def test_merge() -> None:
+    levels = []
+    for row in rows:
+        level = module._level()
+        module._observe(level, row)
+        levels.append(level)
+
+    left = module.merge(module.merge(module._level(), levels[0]),
+                        module.merge(levels[1], levels[2]))
+    assert module.to_gbqschema(left, True) == schema_out, "Merge doesn't work"
+    return
@@ -306,3 +306,168 @@ def test_sdk_representation_conversion_record() -> None:
         "Convertion doesn't work"
 
     return
+
+
+def test_projection() -> None:
+    schema_in = {
+        "type": "object",
+        "properties": {
+            "att_01": {"type": "integer"},
+            "att_02": {
+                "type": "object",
+                "properties": {
+                    "att_11": {"type": "number"},
+                    "att_12": {"type": "string"},
+                },
+                "required": ["att_11"],
+            },
+            "att_03": {"type": "array1"},
+        },
+        "required": ["att_01"],
+    }
+
+    schema_convert = module.json_representation(schema_in, include=["att_01", "att_02.*"], exclude=["att_02.att_12"])
+    assert schema_convert == [
+        {"name": "att_01", "type": "INT64", "mode": "REQUIRED"},
+        {"name": "att_02", "type": "RECORD", "mode": "NULLABLE", "fields": [
+            {"name": "att_11", "type": "FLOAT64", "mode": "REQUIRED"},
+        ]},
+    ], "Projection doesn't work"
+
+    schema_convert = module.sdk_representation(schema_in, include=["att_02.att_12"])
+    assert schema_convert == [
+        SchemaField('att_02', 'RECORD', 'NULLABLE', None, (
+            SchemaField('att_12', 'STRING', 'NULLABLE', None, ()),)),
+    ], "Projection doesn't work"
+
+    schema_in = {
+        "type": "object",
+        "properties": {
+            "att_01": {
+                "type": ["array", "null"],
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "att_11": {"type": "string"},
+                        "att_12": {"type": "string", "minLength": "x"},
+                    },
+                },
+            },
+            "att_02": {"type": "string", "minLength": "x"},
+        },
+    }
+
+    schema_convert = module.json_representation(schema_in, exclude=["att_01.att_12", "att_02"])
+    assert schema_convert == [
+        {"name": "att_01", "type": "RECORD", "mode": "REPEATED", "fields": [
+            {"name": "att_11", "type": "STRING", "mode": "NULLABLE"},
+        ]},
+    ], "Projection of nested excluded properties doesn't work"
+
+    return
+
+
+def test_index() -> None:
+    schema_convert, index = module.json_representation(schema_in_record, with_index=True)
+
+    assert list(index) == ["att_01", "att_02", "att_02.att_11", "att_02.att_12"],\
+        "Index doesn't work"
+    assert index['att_02'].node is schema_convert[1], "Index doesn't work"
+    assert index['att_02.att_11'][1:] == ("FLOAT64", "REQUIRED", 1, "att_02"),\
+        "Index doesn't work"
+    assert index.children("att_02") == ["att_02.att_11", "att_02.att_12"],\
+        "Index doesn't work"
+
+    schema_convert, index = module.sdk_representation(schema_in_record, exclude="att_02.*", with_index=True)
+    assert list(index) == ["att_01"] and index['att_01'].node is schema_convert[0],\
+        "Index doesn't work"
+    assert index.max_depth == 0, "Index statistics doesn't work"
+
+    return
+
+
+def test_repeated() -> None:
+    schema_in = {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "object",
+        "properties": {
+            "att_01": {"type": "array", "items": {"type": "integer"}, "description": "Att 1"},
+            "att_02": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "att_11": {"type": "array", "items": {"type": "string", "format": "date-time"}},
+                        "att_12": {"type": "string"},
+                    },
+                    "required": ["att_12"],
+                },
+            },
+        },
+        "required": ["att_01"],
+    }
+
+    schema_out = [
+        {"description": "Att 1", "name": "att_01", "type": "INT64", "mode": "REPEATED"},
+        {"name": "att_02", "type": "RECORD", "mode": "REPEATED", "fields": [
+            {"name": "att_11", "type": "TIMESTAMP", "mode": "REPEATED"},
+            {"name": "att_12", "type": "STRING", "mode": "REQUIRED"},
+        ]},
+    ]
+    assert module.json_representation(schema_in) == schema_out, "Convertion doesn't work"
+
+    schema_convert = module.sdk_representation(schema_in, include="att_02.att_11")
+    assert schema_convert == [
+        SchemaField('att_02', 'RECORD', 'REPEATED', None, (
+            SchemaField('att_11', 'TIMESTAMP', 'REPEATED', None, ()),
+        )),
+    ], "Convertion doesn't work"
+    return
+
+
+def test_nullable() -> None:
+    schema_in = {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "object",
+        "properties": {
+            "att_01": {"type": ["integer", "null"], "description": "Att 1"},
+            "att_02": {"oneOf": [{"type": "null"}, {"type": "string", "format": "date"}]},
+            "att_03": {
+                "description": "Att 3",
+                "anyOf": [
+                    {
+                        "type": "object",
+                        "properties": {
+                            "att_11": {"type": ["null", "number"]},
+                            "att_12": {"type": ["boolean"]},
+                        },
+                        "required": ["att_11", "att_12"],
+                    },
+                    {"type": "null"},
+                ],
+            },
+            "att_04": {"type": ["array", "null"], "items": {"type": ["string", "null"]}},
+            "att_05": {"type": "integer"},
+        },
+        "required": ["att_01", "att_02", "att_03", "att_05"],
+    }
+
+    schema_out = [
+        {"description": "Att 1", "name": "att_01", "type": "INT64", "mode": "NULLABLE"},
+        {"name": "att_02", "type": "DATE", "mode": "NULLABLE"},
+        {"description": "Att 3", "name": "att_03", "type": "RECORD", "mode": "NULLABLE", "fields": [
+            {"name": "att_11", "type": "FLOAT64", "mode": "NULLABLE"},
+            {"name": "att_12", "type": "BOOLEAN", "mode": "REQUIRED"},
+        ]},
+        {"name": "att_04", "type": "STRING", "mode": "REPEATED"},
+        {"name": "att_05", "type": "INT64", "mode": "REQUIRED"},
+    ]
+    assert module.json_representation(schema_in) == schema_out, "Convertion doesn't work"
+
+    schema_convert = module.sdk_representation(schema_in, include="att_03.att_12")
+    assert schema_convert == [
+        SchemaField('att_03', 'RECORD', 'NULLABLE', 'Att 3', (
+            SchemaField('att_12', 'BOOLEAN', 'REQUIRED', None, ()),
+        )),
+    ], "Convertion doesn't work"
+    return
@@ -0,0 +1,82 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import sys
+import pathlib
+import importlib.util
+from types import ModuleType
+import pytest
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "__main__"
+
+FUNCTIONS = set(['get_args', 'json_to_gbq', 'gbq_to_json'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(f"{PACKAGE}.{module_name}", file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_functions() -> None:
+    missing = FUNCTIONS.difference(set(module.__dir__()))
+    assert not missing, f"""Function(s) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+def _args(monkeypatch, *argv: str) -> object:
+    monkeypatch.setattr(sys, "argv", ["gbq2json", *argv])
+    return module.get_args()
+
+
+def test_args_watch(monkeypatch, tmp_path) -> None:
+    with pytest.raises(SystemExit):
+        _args(monkeypatch, "--watch", "-f", str(tmp_path))
+    with pytest.raises(SystemExit):
+        _args(monkeypatch, "--watch", "-f", str(tmp_path), "-o", str(tmp_path / "out.json"))
+    with pytest.raises(SystemExit):
+        _args(monkeypatch, "--watch", "-i", "[]")
+
+    with pytest.raises(SystemExit):
+        _args(monkeypatch, "--watch", "-f", str(tmp_path), "-o", str(tmp_path))
+    with pytest.raises(SystemExit):
+        _args(monkeypatch, "--watch", "-f", str(tmp_path), "-o", f"{tmp_path}/../{tmp_path.name}/")
+    (tmp_path / "link").symlink_to(tmp_path)
+    with pytest.raises(SystemExit):
+        _args(monkeypatch, "--watch", "-f", str(tmp_path), "-o", str(tmp_path / "link"))
+    path = tmp_path / "schema.json"
+    path.write_text("[]")
+    with pytest.raises(SystemExit):
+        _args(monkeypatch, "--watch", "-f", str(path), "-o", str(path))
+
+    (tmp_path / "out").mkdir()
+    args = _args(monkeypatch, "--watch", "-f", str(tmp_path), "-o", str(tmp_path / "out"))
+    assert args.watch and args.output == str(tmp_path / "out"), "Watch arguments check doesn't work"
+    return
+
+
+def test_args_canonical(monkeypatch, tmp_path) -> None:
+    path = tmp_path / "schema.json"
+    path.write_text("[]")
+    with pytest.raises(SystemExit):
+        _args(monkeypatch, "--stream", "--canonical", "-f", str(path))
+
+    args = _args(monkeypatch, "--canonical", "-f", str(path))
+    assert args.canonical, "Canonical arguments check doesn't work"
+    return
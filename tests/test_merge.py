@@ -0,0 +1,122 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import pathlib
+import importlib.util
+from types import ModuleType
+from google.cloud.bigquery import SchemaField
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "merge"
+
+FUNCTIONS = set(['merge'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_functions() -> None:
+    missing = FUNCTIONS.difference(set(module.__dir__()))
+    assert not missing, f"""Function(s) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+version_01 = [
+    {"name": "att_01", "type": "INTEGER", "mode": "REQUIRED"},
+    {"name": "att_02", "type": "STRING", "mode": "REQUIRED", "description": "Att 2"},
+    {"name": "att_03", "type": "RECORD", "mode": "NULLABLE", "fields": [
+        {"name": "att_11", "type": "INT64", "mode": "REQUIRED"},
+    ]},
+    {"name": "att_04", "type": "STRING", "mode": "REPEATED"},
+]
+
+version_02 = [
+    SchemaField("ATT_01", "INT64", "REQUIRED"),
+    SchemaField("att_03", "RECORD", "NULLABLE", fields=(
+        SchemaField("att_11", "FLOAT", "REQUIRED"),
+        SchemaField("att_12", "DATE", "REQUIRED"),
+    )),
+    SchemaField("att_04", "STRING", "NULLABLE"),
+    SchemaField("att_05", "BOOL", "REQUIRED"),
+]
+
+version_03 = {
+    "type": "object",
+    "properties": {
+        "att_01": {"type": "string"},
+        "att_02": {"type": "string", "description": "Att 2, updated"},
+    },
+    "required": ["att_01", "att_02"],
+}
+
+
+def test_merge() -> None:
+    schema_merged, conflicts = module.merge([version_01, version_02, version_03])
+
+    assert schema_merged == [
+        {"name": "att_01", "type": "INT64", "mode": "REQUIRED"},
+        {"name": "att_02", "type": "STRING", "mode": "NULLABLE", "description": "Att 2, updated"},
+        {"name": "att_03", "type": "RECORD", "mode": "NULLABLE", "fields": [
+            {"name": "att_11", "type": "FLOAT64", "mode": "REQUIRED"},
+            {"name": "att_12", "type": "DATE", "mode": "NULLABLE"},
+        ]},
+        {"name": "att_04", "type": "STRING", "mode": "REPEATED"},
+        {"name": "att_05", "type": "BOOLEAN", "mode": "NULLABLE"},
+    ], "Merge doesn't work"
+
+    assert conflicts == [
+        module.Conflict("att_04", "mode", "REPEATED and NULLABLE"),
+        module.Conflict("att_01", "type", "INT64 and STRING"),
+    ], "Conflicts detection doesn't work"
+    return
+
+
+def test_merge_conflict_widening() -> None:
+    schema_merged, conflicts = module.merge([
+        [{"name": "att_01", "type": "INT64", "mode": "REQUIRED"}],
+        [{"name": "att_01", "type": "FLOAT64", "mode": "REPEATED", "description": "rejected"}],
+    ])
+    assert schema_merged == [{"name": "att_01", "type": "INT64", "mode": "REQUIRED"}],\
+        "Conflicting version must not be merged"
+    assert conflicts == [module.Conflict("att_01", "mode", "REQUIRED and REPEATED")],\
+        "Conflicts detection doesn't work"
+    return
+
+
+def test_merge_sdk() -> None:
+    schema_merged, conflicts = module.merge([version_02, version_02], to_sdk_schema=True)
+
+    assert not conflicts, "Conflicts detection doesn't work"
+    assert schema_merged[1].fields[0] == SchemaField("att_11", "FLOAT64", "REQUIRED"),\
+        "Merge doesn't work"
+    assert schema_merged[::2] == version_02[::2], "Merge doesn't work"
+    return
+
+
+def test_merge_many() -> None:
+    versions = [[{"name": "id", "type": "INT64", "mode": "REQUIRED"},
+                 {"name": f"att_{i:05d}", "type": "STRING", "mode": "NULLABLE"}]
+                for i in range(10000)]
+    schema_merged, conflicts = module.merge(versions)
+
+    assert not conflicts and len(schema_merged) == 10001, "Merge doesn't work"
+    assert schema_merged[0]['mode'] == "REQUIRED", "Merge doesn't work"
+    return
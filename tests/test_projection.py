@@ -0,0 +1,85 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import pathlib
+import importlib.util
+from types import ModuleType
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "projection"
+
+FUNCTIONS = set(['compile_projection', 'project'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_functions() -> None:
+    missing = FUNCTIONS.difference(set(module.__dir__()))
+    assert not missing, f"""Function(s) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+def test_no_projection() -> None:
+    assert module.compile_projection() is None, "Empty projection must be None"
+    return
+
+
+def test_include() -> None:
+    projection = module.compile_projection(["user.id", "user.address.*", "event_ts"])
+
+    assert projection.select("event_ts") == (True, None), "Path selection doesn't work"
+    assert projection.select("event") == (False, None), "Path selection doesn't work"
+
+    selected, user = projection.select("user")
+    assert selected and user.partial, "Path selection doesn't work"
+    assert user.select("id") == (True, None), "Path selection doesn't work"
+    assert user.select("name") == (False, None), "Path selection doesn't work"
+
+    selected, address = user.select("address")
+    assert selected and address.partial, "Glob selection doesn't work"
+    assert address.select("zip") == (True, None), "Glob selection doesn't work"
+    return
+
+
+def test_exclude() -> None:
+    projection = module.compile_projection(exclude=["user.addr*", "tmp_?"])
+
+    assert projection.select("event_ts") == (True, None), "Path exclusion doesn't work"
+    assert projection.select("tmp_1") == (False, None), "Glob exclusion doesn't work"
+    assert projection.select("tmp_10") == (True, None), "Glob exclusion doesn't work"
+
+    selected, user = projection.select("user")
+    assert selected and not user.partial, "Path exclusion doesn't work"
+    assert user.select("id") == (True, None), "Path exclusion doesn't work"
+    assert user.select("address") == (False, None), "Path exclusion doesn't work"
+    return
+
+
+def test_project() -> None:
+    elements = [("a", False), ("b", True), ("c", False)]
+    projection = module.compile_projection(["a", "b.x", "c.x"], exclude="a")
+
+    selected = [element for element, _ in module.project(elements, projection,
+                                                         lambda element: element[0],
+                                                         lambda element: element[1])]
+    assert selected == [("b", True)], "Projection doesn't work"
+    return
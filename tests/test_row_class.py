@@ -0,0 +1,184 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import json
+import base64
+import pathlib
+import datetime
+import importlib.util
+from decimal import Decimal
+from types import ModuleType
+import pytest
+import fastjsonschema
+from google.cloud.bigquery import SchemaField
+from gbqschema_converter.gbqschema_to_jsonschema import json_representation
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "row_class"
+
+FUNCTIONS = set(['compile_row_class', 'generate_source'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_functions() -> None:
+    missing = FUNCTIONS.difference(set(module.__dir__()))
+    assert not missing, f"""Function(s) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+schema_in = [
+    {"name": "att_01", "type": "INT64", "mode": "REQUIRED"},
+    {"name": "att_02", "type": "NUMERIC"},
+    {"name": "att_03", "type": "BYTES", "mode": "NULLABLE"},
+    {"name": "att_04", "type": "TIMESTAMP", "mode": "NULLABLE"},
+    {"name": "att_05", "type": "RECORD", "mode": "REPEATED", "fields": [
+        {"name": "att_11", "type": "DATE", "mode": "REQUIRED"},
+        {"name": "att_12", "type": "DATETIME", "mode": "NULLABLE"},
+        {"name": "att_13", "type": "TIME", "mode": "REPEATED"},
+    ]},
+    {"name": "class", "type": "BOOL", "mode": "NULLABLE"},
+]
+
+row_in = {
+    "att_01": "1",
+    "att_02": 1.1,
+    "att_03": "AAE=",
+    "att_04": "2020-04-08 23:42:51.5+02:00",
+    "att_05": [
+        {"att_11": "2020-04-08", "att_12": "2020-04-08T21:42:51.0007", "att_13": ["21:42:00"]},
+        {"att_11": "2020-04-09", "att_12": None},
+    ],
+    "class": "false",
+}
+
+row_out = {
+    "att_01": 1,
+    "att_02": 1.1,
+    "att_03": "AAE=",
+    "att_04": "2020-04-08T21:42:51.500000Z",
+    "att_05": [
+        {"att_11": "2020-04-08", "att_12": "2020-04-08T21:42:51.000700", "att_13": ["21:42:00"]},
+        {"att_11": "2020-04-09", "att_13": []},
+    ],
+    "class": False,
+}
+
+
+def test_from_dict() -> None:
+    row_class = module.compile_row_class(schema_in)
+    row = row_class.from_dict(row_in)
+
+    assert row.att_01 == 1 and row.att_02 == Decimal("1.1") and row.att_03 == b"\x00\x01",\
+        "Parsing doesn't work"
+    assert row.att_04 == datetime.datetime(2020, 4, 8, 21, 42, 51, 500000, tzinfo=datetime.timezone.utc),\
+        "TIMESTAMP parsing doesn't work"
+    assert row.att_05[0].att_12 == datetime.datetime(2020, 4, 8, 21, 42, 51, 700) and\
+        row.att_05[0].att_13 == [datetime.time(21, 42)] and row.att_05[1].att_12 is None,\
+        "RECORD parsing doesn't work"
+    assert row.class_ is False, "Keyword column doesn't work"
+    assert not hasattr(row, "__dict__"), "Row class must have __slots__"
+
+    with pytest.raises(KeyError):
+        row_class.from_dict({"att_02": 1})
+    with pytest.raises(ValueError):
+        row_class.from_dict({"att_01": 1, "att_05": [{"att_11": "2020/04/08"}]})
+    return
+
+
+def test_to_dict() -> None:
+    row_class = module.compile_row_class(schema_in)
+    row = row_class.from_dict(row_in)
+
+    assert row.to_dict() == row_out, "Serialization doesn't work"
+    assert row_class.from_dict(row.to_dict()) == row, "Round trip doesn't work"
+    fastjsonschema.compile(json_representation(schema_in))([json.loads(json.dumps(row.to_dict()))])
+    return
+
+
+def test_class_names() -> None:
+    schema = [
+        {"name": "a", "type": "RECORD", "fields": [
+            {"name": "b", "type": "RECORD", "fields": [{"name": "x", "type": "INT64"}]},
+        ]},
+        {"name": "a_b", "type": "RECORD", "fields": [{"name": "y", "type": "STRING"}]},
+    ]
+    row_class = module.compile_row_class(schema)
+    row = {"a": {"b": {"x": 5}}, "a_b": {"y": "z"}}
+    assert row_class.from_dict(row).to_dict() == row, "Nested class names don't work"
+    return
+
+
+def test_attribute_names() -> None:
+    schema = [
+        {"name": "self", "type": "INT64"},
+        {"name": "to_dict", "type": "INT64"},
+        {"name": "from_dict", "type": "INT64"},
+        {"name": "class", "type": "INT64"},
+        {"name": "class_", "type": "INT64"},
+        {"name": "__slots__", "type": "INT64"},
+        {"name": "__x", "type": "INT64"},
+    ]
+    row_class = module.compile_row_class(schema)
+    assert row_class.__slots__ == ("self_", "to_dict_", "from_dict_", "class_", "class__", "field__slots__",
+                                   "field__x"), "Attribute names don't work"
+    row = {column['name']: i for i, column in enumerate(schema)}
+    assert row_class.from_dict(row).to_dict() == row, "Attribute names don't work"
+    assert row_class(self_=1).self_ == 1, "Attribute names don't work"
+    return
+
+
+def test_repeated_default() -> None:
+    row_class = module.compile_row_class([{"name": "att_01", "type": "INT64", "mode": "REPEATED"},
+                                          {"name": "att_02", "type": "RECORD", "mode": "REPEATED", "fields": [
+                                              {"name": "att_11", "type": "DATE"}]}])
+    row = row_class()
+    assert row.att_01 == [] and row.to_dict() == {"att_01": [], "att_02": []}, "REPEATED default doesn't work"
+    row.att_02 = None
+    assert row.to_dict() == {"att_01": [], "att_02": []}, "REPEATED default doesn't work"
+    return
+
+
+def test_cache() -> None:
+    row_class = module.compile_row_class(schema_in)
+    assert module.compile_row_class(json.loads(json.dumps(schema_in))) is row_class,\
+        "Row class cache doesn't work"
+
+    schema_sdk = [SchemaField("att_01", "INT64", "REQUIRED"),
+                  SchemaField("att_02", "RECORD", "NULLABLE", fields=(
+                      SchemaField("att_11", "BYTES", "NULLABLE"),))]
+    row_class = module.compile_row_class(schema_sdk, "Table")
+    row = row_class(1, row_class.from_dict({"att_01": 1}).att_02)
+    assert row_class.from_dict({"att_01": 1, "att_02": {"att_11": base64.b64encode(b"a").decode()}})\
+        .att_02.att_11 == b"a" and row == row_class.from_dict({"att_01": 1}), "SDK representation doesn't work"
+    assert row_class.__name__ == "Table" and "class Table_att_02" in row_class.__source__,\
+        "Class names don't work"
+    return
+
+
+def test_cache_size(monkeypatch) -> None:
+    monkeypatch.setattr(module, "ROW_CLASSES_CACHE_SIZE", 2)
+    monkeypatch.setattr(module, "_cache", {})
+    for i in range(5):
+        module.compile_row_class([{"name": f"att_{i:02d}", "type": "INT64"}])
+    assert len(module._cache) == 2, "Cache size limit doesn't work"
+    return
@@ -0,0 +1,126 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import json
+import pathlib
+import datetime
+import importlib.util
+from decimal import Decimal
+from types import ModuleType
+from google.cloud.bigquery import SchemaField
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "row_encoder"
+
+FUNCTIONS = set(['compile_row_encoder', 'generate_source'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_functions() -> None:
+    missing = FUNCTIONS.difference(set(module.__dir__()))
+    assert not missing, f"""Function(s) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+schema_in = [
+    {"name": "att_01", "type": "INT64", "mode": "REQUIRED"},
+    {"name": "att_02", "type": "NUMERIC"},
+    {"name": "att_03", "type": "BYTES", "mode": "NULLABLE"},
+    {"name": "att_04", "type": "TIMESTAMP", "mode": "NULLABLE"},
+    {"name": "att_05", "type": "RECORD", "mode": "REPEATED", "fields": [
+        {"name": "att_11", "type": "DATE", "mode": "REQUIRED"},
+        {"name": "att_12", "type": "DATETIME", "mode": "NULLABLE"},
+        {"name": "att_13", "type": "TIME", "mode": "REPEATED"},
+    ]},
+    {"name": "att'06", "type": "FLOAT", "mode": "NULLABLE"},
+]
+
+
+def test_encode() -> None:
+    encoder = module.compile_row_encoder(schema_in)
+
+    row = {
+        "att_01": 1,
+        "att_02": Decimal("1.10"),
+        "att_03": b"\x00\x01",
+        "att_04": datetime.datetime(2020, 4, 8, 23, 42, 51,
+                                    tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+        "att_05": [
+            {"att_11": datetime.date(2020, 4, 8),
+             "att_12": datetime.datetime(2020, 4, 8, 21, 42, 51, 700),
+             "att_13": [datetime.time(21, 42), "21:43:00"]},
+            {"att_11": "2020-04-09", "att_12": None},
+        ],
+        "att'06": 1,
+        "att_07": "ignored",
+    }
+
+    row_out = {
+        "att_01": 1,
+        "att_02": "1.10",
+        "att_03": "AAE=",
+        "att_04": "2020-04-08T21:42:51Z",
+        "att_05": [
+            {"att_11": "2020-04-08",
+             "att_12": "2020-04-08T21:42:51.000700",
+             "att_13": ["21:42:00", "21:43:00"]},
+            {"att_11": "2020-04-09"},
+        ],
+        "att'06": 1.0,
+    }
+
+    assert encoder(row) == row_out, "Encoding doesn't work"
+    assert json.loads(json.dumps(encoder(row))) == row_out, "Output is not JSON-serializable"
+    assert encoder.batch([row, {"att_01": 2}]) == [row_out, {"att_01": 2}],\
+        "Batch encoding doesn't work"
+
+    try:
+        encoder({"att_02": 1})
+    except KeyError as ex:
+        assert "att_01" in str(ex), "REQUIRED field check doesn't work"
+    else:
+        raise AssertionError("REQUIRED field check doesn't work")
+    return
+
+
+def test_cache() -> None:
+    encoder = module.compile_row_encoder(schema_in)
+    assert module.compile_row_encoder(json.loads(json.dumps(schema_in))) is encoder,\
+        "Encoder cache doesn't work"
+
+    schema_sdk = [SchemaField("att_01", "INT64", "REQUIRED"),
+                  SchemaField("att_02", "RECORD", "NULLABLE", fields=(
+                      SchemaField("att_11", "BYTES", "NULLABLE"),))]
+    encoder = module.compile_row_encoder(schema_sdk)
+    assert encoder({"att_01": "1", "att_02": {"att_11": b"a"}}) == {"att_01": 1, "att_02": {"att_11": "YQ=="}},\
+        "SDK representation doesn't work"
+    return
+
+
+def test_cache_size(monkeypatch) -> None:
+    monkeypatch.setattr(module, "ENCODERS_CACHE_SIZE", 2)
+    monkeypatch.setattr(module, "_cache", {})
+    for i in range(5):
+        module.compile_row_encoder([{"name": f"att_{i:02d}", "type": "INT64"}])
+    assert len(module._cache) == 2, "Cache size limit doesn't work"
+    return
@@ -0,0 +1,71 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import pathlib
+import importlib.util
+from types import ModuleType
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "serializer"
+
+FUNCTIONS = set(['loads', 'dumps'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_functions() -> None:
+    missing = FUNCTIONS.difference(set(module.__dir__()))
+    assert not missing, f"""Function(s) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+obj = [{"name": "att_01", "type": "INT64", "description": "Атрибут"}]
+
+
+def test_roundtrip() -> None:
+    for compact in (True, False):
+        data = module.dumps(obj, compact=compact)
+        assert isinstance(data, bytes), "Output must be bytes"
+        assert module.loads(data) == obj, "Roundtrip doesn't work"
+        assert module.loads(data.decode("utf-8")) == obj, "Roundtrip doesn't work"
+    return
+
+
+def test_compact() -> None:
+    assert b"\n" not in module.dumps(obj, compact=True),\
+        "Compact output must be single line"
+    assert b'\n  {\n    "name"' in module.dumps(obj),\
+        "Output must be indented"
+    return
+
+
+def test_stdlib_backend() -> None:
+    backend = module.BACKEND
+    module.BACKEND = "json"
+    try:
+        assert module.loads(module.dumps(obj, compact=True)) == obj,\
+            "Fallback backend doesn't work"
+        assert module.dumps(obj, compact=True) == \
+            '[{"name":"att_01","type":"INT64","description":"Атрибут"}]'.encode("utf-8")
+    finally:
+        module.BACKEND = backend
+    return
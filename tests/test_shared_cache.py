@@ -0,0 +1,111 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import errno
+import pickle
+import pathlib
+import importlib.util
+import multiprocessing
+from types import ModuleType
+import pytest
+# worker processes import the cache by its package path
+from gbqschema_converter.shared_cache import SharedCache
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "shared_cache"
+
+CLASSES = set(['SharedCache'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_classes() -> None:
+    missing = CLASSES.difference(set(module.__dir__()))
+    assert not missing, f"""Class(es) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+def _key(i: int) -> bytes:
+    return i.to_bytes(16, "little")
+
+
+def test_get_set(tmp_path) -> None:
+    cache = module.SharedCache(str(tmp_path / "cache"), slots=4, ways=2, slot_size=16)
+    assert cache.get(_key(0)) is None, "Cache miss doesn't work"
+    assert cache.set(_key(0), b"value_0") and cache.get(_key(0)) == b"value_0", "Cache doesn't work"
+    assert cache.set(_key(0), b"value_00") and cache.get(_key(0)) == b"value_00", "Cache update doesn't work"
+    assert not cache.set(_key(1), b"x" * 17) and cache.get(_key(1)) is None, "Value size check doesn't work"
+
+    # keys 0, 2, 4 map to the same set of 2 slots
+    cache.set(_key(2), b"value_2")
+    assert cache.get(_key(0)) == b"value_00", "Cache doesn't work"
+    cache.set(_key(4), b"value_4")
+    assert cache.get(_key(2)) is None and cache.get(_key(0)) == b"value_00", "LRU eviction doesn't work"
+
+    with pytest.raises(ValueError):
+        module.SharedCache(str(tmp_path / "cache"), slots=8, ways=2, slot_size=16)
+    cache.close()
+    return
+
+
+def test_allocate(tmp_path, monkeypatch) -> None:
+    def _posix_fallocate(fd: int, offset: int, length: int) -> None:
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(module.os, "posix_fallocate", _posix_fallocate, raising=False)
+    path = tmp_path / "cache"
+    with pytest.raises(OSError) as ex:
+        module.SharedCache(str(path), slots=4, ways=2, slot_size=16)
+    assert ex.value.errno == errno.ENOSPC and "Not enough space" in str(ex.value),\
+        "Space reservation check doesn't work"
+    assert path.stat().st_size == 0, "Space reservation check doesn't work"
+    monkeypatch.undo()
+
+    cache = module.SharedCache(str(path), slots=4, ways=2, slot_size=16)
+    assert cache.set(_key(0), b"value_0") and cache.get(_key(0)) == b"value_0",\
+        "Cache after space reservation failure doesn't work"
+    cache.close()
+    return
+
+
+def _fill(path: str, start: int) -> None:
+    cache = SharedCache(path, slots=64, ways=4, slot_size=1024)
+    for i in range(start, start + 16):
+        cache.set(_key(i), str(i).encode() * 10)
+    cache.close()
+
+
+def test_processes(tmp_path) -> None:
+    path = str(tmp_path / "cache")
+    processes = [multiprocessing.get_context("spawn").Process(target=_fill, args=(path, i * 16))
+                 for i in range(2)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    cache = pickle.loads(pickle.dumps(SharedCache(path, slots=64, ways=4, slot_size=1024)))
+    # 32 keys fill 2 of 4 slots of every set
+    assert all(cache.get(_key(i)) == str(i).encode() * 10 for i in range(32)),\
+        "Cache sharing between processes doesn't work"
+    cache.close()
+    return
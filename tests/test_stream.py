@@ -0,0 +1,111 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import io
+import bz2
+import json
+import pathlib
+import importlib.util
+from types import ModuleType
+from gbqschema_converter.gbqschema_to_jsonschema import json_representation as to_json
+from gbqschema_converter.jsonschema_to_gbqschema import json_representation as to_gbq
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "stream"
+
+FUNCTIONS = set(['gbqschema_to_jsonschema', 'jsonschema_to_gbqschema',
+                 'iter_gbqschema', 'iter_jsonschema'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_functions() -> None:
+    missing = FUNCTIONS.difference(set(module.__dir__()))
+    assert not missing, f"""Function(s) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+def test_scanner() -> None:
+    buf = b' [ {"a": "x]}\\"{["} , [1, [2]] ,"s", 10.5e3 ,true, null ] '
+    values = [json.loads(buf[start:end])
+              for start, end in module.iter_array(buf, 1)]
+    assert values == [{"a": "x]}\"{["}, [1, [2]], "s", 10.5e3, True, None],\
+        "Array scanning doesn't work"
+
+    buf = b'{"a\\"b": {"c": []}, "d": "}"}'
+    members = [(key, json.loads(buf[start:end]))
+               for key, start, end in module.iter_object(buf)]
+    assert members == [('a"b', {"c": []}), ("d", "}")],\
+        "Object scanning doesn't work"
+
+    assert list(module.iter_array(b'[ ]')) == [], "Empty array scanning doesn't work"
+
+    try:
+        list(module.iter_array(b'[{"a": 1}'))
+    except ValueError as ex:
+        assert "Expecting ','" in str(ex), "Malformed input check doesn't work"
+    else:
+        raise AssertionError("Malformed input check doesn't work")
+    return
+
+
+schema_gbq = [
+    {"name": "att_01", "type": "INT64", "mode": "REQUIRED"},
+    {"name": "att_02", "type": "RECORD", "mode": "NULLABLE",
+     "fields": [
+         {"name": "att_11", "type": "FLOAT64", "mode": "REQUIRED"},
+         {"name": "att_12", "type": "STRING", "mode": "NULLABLE"},
+     ]},
+    {"name": "att_03", "type": "DATE", "description": "Att [3]"},
+]
+
+
+def test_gbqschema_to_jsonschema(tmp_path) -> None:
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(schema_gbq, indent=2))
+
+    for compact in (True, False):
+        fout = io.BytesIO()
+        module.gbqschema_to_jsonschema(str(path), fout, compact=compact)
+        assert json.loads(fout.getvalue()) == to_json(schema_gbq),\
+            "Convertion doesn't work"
+
+    path = tmp_path / "schema.json.bz2"
+    path.write_bytes(bz2.compress(json.dumps(schema_gbq).encode()))
+    fout = io.BytesIO()
+    module.gbqschema_to_jsonschema(str(path), fout)
+    assert json.loads(fout.getvalue()) == to_json(schema_gbq), "Compressed file convertion doesn't work"
+    return
+
+
+def test_jsonschema_to_gbqschema(tmp_path) -> None:
+    schema_json = to_json(schema_gbq)
+    schema_json['definitions']['element']['properties']['att_03']['description'] = "Att [3]"
+    path = tmp_path / "schema.json"
+
+    for schema_in in (schema_json, schema_json['definitions']['element']):
+        path.write_text(json.dumps(schema_in))
+        fout = io.BytesIO()
+        module.jsonschema_to_gbqschema(str(path), fout)
+        assert json.loads(fout.getvalue()) == to_gbq(schema_in),\
+            "Convertion doesn't work"
+    return
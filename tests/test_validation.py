@@ -0,0 +1,138 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import pathlib
+import importlib.util
+from types import ModuleType
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "validation"
+
+FUNCTIONS = set(['check_gbqschema', 'check_jsonschema'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_functions() -> None:
+    missing = FUNCTIONS.difference(set(module.__dir__()))
+    assert not missing, f"""Function(s) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+def test_check_gbqschema() -> None:
+    schema_in = [
+        {"name": "att_01", "type": "INT64", "mode": "REQUIRED"},
+        {"name": "att_02", "type": "RECORD", "fields": [
+            {"name": "att_11", "type": "FFA"},
+            {"type": "STRING", "mode": "NULLABLE1"},
+            {"name": "att_a/b", "type": "RECORD"},
+        ]},
+        {"name": "ATT_01", "type": "STRING", "description": 1},
+    ]
+
+    report = module.check_gbqschema(schema_in)
+    assert not report.valid, "Validation doesn't work"
+    assert [path for path, _ in report.errors] == [
+        "/2/description",
+        "/1/fields/0/type",
+        "/1/fields/1",
+        "/1/fields/1/mode",
+        "/1/fields/2",
+        "/2/name",
+    ], "Errors collection doesn't work"
+    assert "duplicated column name 'ATT_01'" in report.errors[-1].message,\
+        "Errors collection doesn't work"
+
+    report = module.check_gbqschema(schema_in[:1] + [{"name": "att_02", "type": "STRING", "mode": "REPEATED"}])
+    assert report.valid and report.errors == [], "Validation doesn't work"
+
+    assert module.check_gbqschema({}).errors == [module.ValidationError("", "must be array")],\
+        "Validation doesn't work"
+    return
+
+
+def test_check_jsonschema() -> None:
+    schema_in = {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "array",
+        "items": {"$ref": "#/definitions/element"},
+        "definitions": {
+            "element": {
+                "type": "object",
+                "properties": {
+                    "att_01": {"description": "no type"},
+                    "att_02": {"type": "objects"},
+                    "att_03": {"type": "object", "properties": {
+                        "att_11": {"type": "integer"},
+                        "att~12": {},
+                    }},
+                    "att_04": {"type": "string", "format": "date"},
+                    "att_05": {"type": "array", "items": {"type": "array", "items": {"type": "integer"}}},
+                    "att_06": {"type": "array", "items": {"type": "object", "properties": {
+                        "att_21": {"type": "array"},
+                    }}},
+                    "att_07": {"type": ["integer", "string", "null"]},
+                    "att_08": {"anyOf": [{"type": "null"}, {"type": "object", "properties": {
+                        "att_31": {"oneOf": [{"type": "integer"}, {"type": "string"}]},
+                        "att_32": {"type": ["string", "null"]},
+                    }}]},
+                },
+            },
+        },
+    }
+
+    report = module.check_jsonschema(schema_in)
+    assert report.errors == [
+        module.ValidationError("", "invalid json schema: Unknown type: 'objects'"),
+        module.ValidationError("/definitions/element/properties/att_01", "must contain 'type' property"),
+        module.ValidationError("/definitions/element/properties/att_02/type",
+                               "must be one of ['integer', 'number', 'boolean', 'string', 'date', 'object']"),
+        module.ValidationError("/definitions/element/properties/att_03/properties/att~012",
+                               "must contain 'type' property"),
+        module.ValidationError("/definitions/element/properties/att_05/items/type",
+                               "must be one of ['integer', 'number', 'boolean', 'string', 'date', 'object']"),
+        module.ValidationError("/definitions/element/properties/att_06/items/properties/att_21/items",
+                               "must be object"),
+        module.ValidationError("/definitions/element/properties/att_07/type",
+                               "must contain single not null type"),
+        module.ValidationError("/definitions/element/properties/att_08/anyOf/1/properties/att_31/oneOf",
+                               "must contain single not null branch and null branch"),
+    ], "Errors collection doesn't work"
+
+    schema_in = {"type": "array1", "properties": {"att_01": {"type": "integer"}}}
+    report = module.check_jsonschema(schema_in)
+    assert len(report.errors) == 1 and "Unknown type" in report.errors[0].message,\
+        "Validation doesn't work"
+
+    schema_in = {"type": "object", "properties": {"att_01": {"type": "string", "minLength": "x"}, "att_02": {}}}
+    report = module.check_jsonschema(schema_in)
+    assert [error.path for error in report.errors] == ["", "/properties/att_02"] and\
+        report.errors[0].message.startswith("invalid json schema"), "Definition error must be reported"
+
+    schema_in = {"type": "object", "properties": {"att_01": {"type": "string", "pattern": "(["}}}
+    report = module.check_jsonschema(schema_in)
+    assert len(report.errors) == 1 and report.errors[0].message.startswith("invalid json schema"),\
+        "Invalid pattern must be reported"
+
+    schema_in = {"type": "object", "properties": {"att_01": {"type": "integer"}}}
+    assert module.check_jsonschema(schema_in).valid, "Validation doesn't work"
+    return
@@ -0,0 +1,116 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import gc
+import pickle
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import pathlib
+import importlib.util
+from types import ModuleType
+import fastjsonschema
+from gbqschema_converter import jsonschema_to_gbqschema, row_encoder
+from gbqschema_converter.warmup import preload
+from gbqschema_converter.converter import Converter
+from gbqschema_converter._schema import CompiledValidator
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "warmup"
+
+FUNCTIONS = set(['preload'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_functions() -> None:
+    missing = FUNCTIONS.difference(set(module.__dir__()))
+    assert not missing, f"""Function(s) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+schema_json = {
+    "type": "object",
+    "properties": {
+        "att_01": {"type": "integer"},
+        "att_02": {"type": "string", "format": "date"},
+    },
+    "required": ["att_01"],
+}
+
+schema_gbq = [
+    {"name": "att_01", "type": "INT64", "mode": "REQUIRED"},
+    {"name": "att_02", "type": "BYTES", "mode": "NULLABLE"},
+]
+
+
+def test_preload() -> None:
+    module.preload([schema_json, schema_gbq], freeze=False)
+
+    validator = jsonschema_to_gbqschema.compile_validator(schema_json)
+    assert validator is jsonschema_to_gbqschema.compile_validator(dict(schema_json)),\
+        "Validator is not cached"
+    assert row_encoder.compile_row_encoder(schema_gbq) is row_encoder.compile_row_encoder(list(schema_gbq)),\
+        "Row encoder is not cached"
+
+    if hasattr(gc, 'freeze'):
+        module.preload()
+        assert gc.get_freeze_count() > 0, "GC freeze doesn't work"
+        gc.unfreeze()
+    return
+
+
+def test_pickle() -> None:
+    validator = pickle.loads(pickle.dumps(jsonschema_to_gbqschema.compile_validator(schema_json)))
+    assert isinstance(validator, CompiledValidator), "Validator pickling doesn't work"
+    assert validator({"att_01": 1}) == {"att_01": 1}, "Validator pickling doesn't work"
+    try:
+        validator({"att_02": "2020-04-08"})
+    except Exception as ex:
+        assert "must contain ['att_01'] properties" in str(ex), "Validator pickling doesn't work"
+    else:
+        raise AssertionError("Validator pickling doesn't work")
+
+    encoder = pickle.loads(pickle.dumps(row_encoder.compile_row_encoder(schema_gbq)))
+    assert encoder({"att_01": "1", "att_02": b"a"}) == {"att_01": 1, "att_02": "YQ=="},\
+        "Row encoder pickling doesn't work"
+
+    converter = Converter("jsonschema_to_gbqschema", include="att_01")
+    assert pickle.loads(pickle.dumps(converter))(schema_json) == converter(schema_json),\
+        "Converter pickling doesn't work"
+    return
+
+
+def _convert(schema: dict) -> list:
+    def _compile_to_code(*args, **kwargs):
+        raise AssertionError("Json schema is recompiled")
+
+    fastjsonschema.compile_to_code = _compile_to_code
+    return jsonschema_to_gbqschema.json_representation(schema)
+
+
+def test_spawn() -> None:
+    validators = [jsonschema_to_gbqschema.compile_validator(schema_json)]
+    with ProcessPoolExecutor(1, multiprocessing.get_context("spawn"),
+                             initializer=preload, initargs=(validators, False)) as pool:
+        assert pool.submit(_convert, schema_json).result() == jsonschema_to_gbqschema.json_representation(schema_json),\
+            "Validators reuse in spawned process doesn't work"
+    return
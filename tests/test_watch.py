@@ -0,0 +1,116 @@
+# Dmitry Kisler © 2020
+# www.dkisler.com
+
+import time
+import queue
+import pathlib
+import threading
+import importlib.util
+from types import ModuleType
+import pytest
+
+
+DIR = pathlib.Path(__file__).parent
+PACKAGE = "gbqschema_converter"
+MODULE = "watch"
+
+FUNCTIONS = set(['watch'])
+
+
+def load_module(module_name: str) -> ModuleType:
+    """Function to load the module.
+
+    Args:
+        module_name: module name
+
+    Returns:
+        module object
+    """
+    file_path = f"{DIR}/../{PACKAGE}/{module_name}.py"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+module = load_module(MODULE)
+
+
+def test_module_miss_functions() -> None:
+    missing = FUNCTIONS.difference(set(module.__dir__()))
+    assert not missing, f"""Function(s) '{"', '".join(missing)}' is(are) missing."""
+    return
+
+
+def _get(events: queue.Queue, timeout: float = 5) -> tuple:
+    return events.get(timeout=timeout)
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watch(tmp_path, use_inotify: bool) -> None:
+    path_01 = tmp_path / "schema_01.json"
+    path_02 = tmp_path / "schema_02.json"
+    path_01.write_bytes(b"[1]")
+    (tmp_path / "notes.txt").write_bytes(b"skipped")
+
+    events = queue.Queue()
+    stop = threading.Event()
+    thread = threading.Thread(target=module.watch,
+                              args=([str(tmp_path)], lambda path, data: events.put((path, data))),
+                              kwargs={"use_inotify": use_inotify, "poll_interval": 0.05, "stop": stop},
+                              daemon=True)
+    thread.start()
+    try:
+        assert _get(events) == (str(path_01), b"[1]"), "Initial conversion doesn't work"
+
+        time.sleep(0.1)
+        path_01.write_bytes(b"[1]")
+        path_02.write_bytes(b"[2]")
+        assert _get(events) == (str(path_02), b"[2]"), "Watch doesn't work"
+
+        time.sleep(0.1)
+        path_01.write_bytes(b"[3]")
+        assert _get(events) == (str(path_01), b"[3]"), "Watch doesn't work"
+        assert events.empty(), "Content hash check doesn't work"
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+    assert not thread.is_alive(), "Watch cannot be stopped"
+    return
+
+
+def test_watch_file(tmp_path) -> None:
+    path = tmp_path / "schema.json"
+    path.write_bytes(b"[1]")
+    (tmp_path / "other.json").write_bytes(b"[2]")
+
+    events = queue.Queue()
+    stop = threading.Event()
+    thread = threading.Thread(target=module.watch,
+                              args=([str(path)], lambda path, data: events.put((path, data))),
+                              kwargs={"stop": stop},
+                              daemon=True)
+    thread.start()
+    try:
+        assert _get(events) == (str(path), b"[1]"), "Initial conversion doesn't work"
+        time.sleep(0.1)
+        (tmp_path / "other.json").write_bytes(b"[3]")
+        path.with_suffix(".tmp").write_bytes(b"[4]")
+        path.with_suffix(".tmp").replace(path)
+        assert _get(events) == (str(path), b"[4]"), "Watch doesn't work"
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+    return
+
+
+def test_targets_compressed(tmp_path) -> None:
+    targets = module._Targets([str(tmp_path)])
+    for name in ("schema.json", "schema.json.gz", "schema.json.zst", "schema.json.bz2", "notes.txt.gz"):
+        (tmp_path / name).write_bytes(b"")
+    assert targets.files() == {str(tmp_path / name)
+                               for name in ("schema.json", "schema.json.gz", "schema.json.zst", "schema.json.bz2")},\
+        "Compressed files matching doesn't work"
+    assert module._Targets([str(tmp_path)], "*.txt*").files() == {str(tmp_path / "notes.txt.gz")},\
+        "Pattern doesn't work"
+    return